@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Audio preprocessing benchmark
+Measures upload size and preprocessing time on synthetic browser-style clips
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.audio_preprocessing import NoSpeechError, preprocess_audio
+
+def synth_clip(sample_rate: int, channels: int, lead_s: float, speech_s: float, tail_s: float, seed: int = 0) -> bytes:
+    """Build a 16-bit WAV with quiet padding around a speech-like signal"""
+    rng = np.random.default_rng(seed)
+    total = int((lead_s + speech_s + tail_s) * sample_rate)
+    signal = rng.normal(0, 0.002, total)
+
+    # Harmonic "voice" with a syllable-rate amplitude envelope
+    start = int(lead_s * sample_rate)
+    t = np.arange(int(speech_s * sample_rate)) / sample_rate
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * 4 * t)) ** 2 / 4
+    voice = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate((140, 280, 420, 560)))
+    signal[start:start + len(t)] += 0.3 * envelope * voice
+
+    pcm = (np.clip(signal, -1, 1) * 32767).astype("<i2")
+    pcm = np.repeat(pcm[:, None], channels, axis=1)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+CLIPS = {
+    "48k_stereo_5s": (48000, 2, 1.0, 3.0, 1.0),
+    "44k1_stereo_12s": (44100, 2, 1.5, 9.0, 1.5),
+    "48k_mono_30s": (48000, 1, 2.0, 26.0, 2.0),
+    "16k_mono_3s": (16000, 1, 0.2, 2.6, 0.2),
+    "48k_stereo_silence": (48000, 2, 3.0, 0.0, 0.0),
+}
+
+def run(iterations: int):
+    results = []
+    for name, params in CLIPS.items():
+        clip = synth_clip(*params)
+        timings = []
+        processed_size = None
+        rejected = False
+
+        for _ in range(iterations):
+            start = time.perf_counter()
+            try:
+                processed_size = len(preprocess_audio(clip))
+            except NoSpeechError:
+                rejected = True
+            timings.append((time.perf_counter() - start) * 1000)
+
+        results.append({
+            "clip": name,
+            "input_bytes": len(clip),
+            "output_bytes": 0 if rejected else processed_size,
+            "reduction_pct": 100.0 if rejected else round(100 * (1 - processed_size / len(clip)), 1),
+            "rejected_no_speech": rejected,
+            "preprocess_ms_median": round(float(np.median(timings)), 2),
+        })
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'clip':<22}{'input':>12}{'output':>12}{'saved':>9}{'ms':>9}")
+        for r in results:
+            output = "rejected" if r["rejected_no_speech"] else r["output_bytes"]
+            print(f"{r['clip']:<22}{r['input_bytes']:>12}{output:>12}{r['reduction_pct']:>8}%{r['preprocess_ms_median']:>9}")
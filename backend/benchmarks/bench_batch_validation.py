@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Batch validation benchmark
+Compares TaskValidator.validate_tasks against a validate_task loop
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.task_validation import TaskValidator
+
+WORDS = (
+    "please remember to finish the quarterly report for the client and send it to my boss "
+    "before the deadline on friday also book a table for dinner with friends urgent asap "
+    "call the doctor about my appointment tomorrow review the api and database design quick "
+    "pay the electricity bill this week clean the house next week gym workout follow-up"
+).split()
+
+def generate_batch(size: int, seed: int = 42):
+    """Tasks shaped like extractor output, with a mix of valid and invalid fields"""
+    rng = random.Random(seed)
+    batch = []
+    for _ in range(size):
+        transcript = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 60)))
+        task = {
+            "title": rng.choice(["Review quarterly report", "Call the doctor", "do something", "Pay bill", "", "x" * 120]),
+            "description": rng.choice([None, "", "Details from the voice note", "x" * 1200]),
+            "priority": rng.choice(["low", "medium", "high", "urgent"]),
+            "category": rng.choice(["work", "personal", "health", "finance", "social"]),
+            "due_date": rng.choice([None, "2030-06-01", "2020-01-01", "not a date", "2030-06-01T09:00:00Z"]),
+            "due_time": rng.choice([None, "09:30", "25:00", "14:00"]),
+            "estimated_duration": rng.choice([None, 0, 15, 60, 600]),
+            "tags": rng.choice([[], ["work"], ["api", ""], ["x"] * 11]),
+            "confidence_score": rng.choice([0.3, 0.6, 0.9]),
+        }
+        batch.append((task, transcript))
+    return batch
+
+def summarize(result):
+    return result.is_valid, result.issues, result.suggestions, result.confidence_adjustments
+
+def run(size: int, repeats: int):
+    validator = TaskValidator()
+    batch = generate_batch(size)
+    loop_times, batch_times = [], []
+
+    for _ in range(repeats):
+        loop_input, batch_input = copy.deepcopy(batch), copy.deepcopy(batch)
+
+        start = time.perf_counter()
+        loop_results = [validator.validate_task(task, transcript) for task, transcript in loop_input]
+        loop_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        batch_results = validator.validate_tasks(batch_input)
+        batch_times.append(time.perf_counter() - start)
+
+    identical = all(
+        summarize(a) == summarize(b) and task_a == task_b
+        for a, b, (task_a, _), (task_b, _) in zip(loop_results, batch_results, loop_input, batch_input)
+    )
+
+    return {
+        "tasks": size,
+        "identical_results": identical,
+        "loop_tasks_per_s": round(size / min(loop_times)),
+        "batch_tasks_per_s": round(size / min(batch_times)),
+        "speedup": round(min(loop_times) / min(batch_times), 2),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--log-info", action="store_true", help="Enable INFO logging as in production")
+    args = parser.parse_args()
+
+    if args.log_info:
+        logging.basicConfig(level=logging.INFO, stream=open(os.devnull, "w"))
+
+    print(json.dumps(run(args.size, args.repeats), indent=2))
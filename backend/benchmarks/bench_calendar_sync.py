@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Calendar sync benchmark
+Syncs a generated calendar from the local fake Calendar API, then times
+incremental syncs after edits and window queries against the local store
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fake_google_calendar import FakeCalendar, create_app, serve_in_thread
+from utils.calendar_sync import CalendarConnection, CalendarSync, GoogleCalendarClient, StoredEvent
+
+START = datetime(2024, 1, 15, 8, 0)
+
+def google_event(event_id: str, start: datetime, minutes: int, all_day: bool = False):
+    if all_day:
+        return {
+            "id": event_id,
+            "summary": f"Holiday {event_id}",
+            "start": {"date": start.date().isoformat()},
+            "end": {"date": (start.date() + timedelta(days=minutes // 1440 or 1)).isoformat()}
+        }
+    return {
+        "id": event_id,
+        "summary": f"Meeting {event_id}",
+        "start": {"dateTime": start.isoformat() + "Z"},
+        "end": {"dateTime": (start + timedelta(minutes=minutes)).isoformat() + "Z"},
+        "attendees": [{"email": "user@example.com"}]
+    }
+
+def random_event(rng: random.Random, event_id: str, days: int):
+    start = START + timedelta(days=rng.randrange(days), minutes=rng.randrange(0, 10 * 60, 15))
+    if rng.random() < 0.02:
+        return google_event(event_id, start, 1440 * rng.randint(1, 5), all_day=True)
+    return google_event(event_id, start, rng.choice([15, 30, 45, 60, 90]))
+
+async def run(events: int, days: int, edits: int, queries: int, seed: int = 7):
+    rng = random.Random(seed)
+    app = create_app()
+    server, base_url = serve_in_thread(app)
+    session = httpx.Client()
+    url = f"{base_url}/calendars/primary/events"
+    try:
+        # Seed in-process; going through HTTP would only time the fake server
+        fake = app.state.calendars["primary"] = FakeCalendar()
+        for i in range(events):
+            fake.put(random_event(rng, f"e{i}", days))
+
+        sync = CalendarSync(GoogleCalendarClient(base_url))
+        sync.connect(CalendarConnection("bench", "token"))
+
+        started = time.perf_counter()
+        full = await sync.sync("bench")
+        full_ms = (time.perf_counter() - started) * 1000
+        full_pages = sync.stats()["pages"]
+
+        # Edits through the API: moves, inserts and deletions
+        for i in range(edits):
+            choice = rng.random()
+            event_id = f"e{rng.randrange(events)}"
+            if choice < 0.5:
+                session.put(f"{url}/{event_id}", json=random_event(rng, event_id, days))
+            elif choice < 0.8:
+                session.post(url, json=random_event(rng, f"new{i}", days))
+            else:
+                session.delete(f"{url}/{event_id}")
+
+        started = time.perf_counter()
+        incremental = await sync.sync("bench")
+        incremental_ms = (time.perf_counter() - started) * 1000
+
+        session.post(f"{base_url}/_control/calendars/primary/expire-tokens")
+        started = time.perf_counter()
+        resync = await sync.sync("bench")
+        resync_ms = (time.perf_counter() - started) * 1000
+
+        store = sync.store("bench")
+        expected = {
+            event.id: event
+            for event in (StoredEvent.from_google(item) for item in fake.listing(None))
+            if event is not None
+        }
+        consistent = {event_id: event._replace(updated=None) for event_id, event in store.events.items()} == {
+            event_id: event._replace(updated=None) for event_id, event in expected.items()
+        }
+
+        windows = []
+        for _ in range(queries):
+            window_start = START + timedelta(days=rng.randrange(days), hours=rng.randrange(24))
+            windows.append((window_start, window_start + timedelta(hours=rng.choice([1, 8, 24, 168]))))
+        correct = all(
+            store.between(a, b) == sorted(
+                (event for event in store.events.values() if event.start < b and event.end > a),
+                key=lambda event: (event.start, event.id)
+            )
+            for a, b in windows[:200]
+        )
+        per_query = []
+        for a, b in windows:
+            started = time.perf_counter()
+            store.between(a, b)
+            per_query.append((time.perf_counter() - started) * 1e6)
+        per_query.sort()
+
+        return {
+            "events": events,
+            "horizon_days": days,
+            "full_sync_ms": round(full_ms, 1),
+            "full_sync_pages": full_pages,
+            "full_sync_events": full.events,
+            "edits": edits,
+            "incremental_sync_ms": round(incremental_ms, 1),
+            "incremental_upserted": len(incremental.upserted),
+            "incremental_removed": len(incremental.removed),
+            "expired_token_resync_ms": round(resync_ms, 1),
+            "expired_token_resync_full": resync.full,
+            "store_matches_server": consistent,
+            "window_queries_match_scan": correct,
+            "window_query_us_p50": round(statistics.median(per_query), 1),
+            "window_query_us_p99": round(per_query[int(len(per_query) * 0.99) - 1], 1),
+        }
+    finally:
+        session.close()
+        server.should_exit = True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--edits", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.events, args.days, args.edits, args.queries)), indent=2))
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+SmartTaskEnhancer benchmark
+Compares the single-scan enhancer against the original per-signal searches
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.task_validation import SmartTaskEnhancer
+
+FILLER = (
+    "the a to and for with about my our this that need should want please remember get make "
+    "check send write update review finish start quickly report email team client project plan "
+    "notes draft ideas budget slides call book pick up groceries meeting"
+).split()
+
+SIGNALS = [
+    "office", "home", "gym", "store", "bank", "doctor", "restaurant", "online", "zoom", "phone",
+    "daily", "every day", "each week", "monthly", "weekdays", "monday to friday", "weekends",
+    "30 minutes", "2 hours", "half hour", "quarter hour", "all day"
+]
+
+# The enhancer's transcript scans before they were combined: a re.search per
+# duration pattern, then linear keyword loops for location and recurrence
+BASELINE_DURATION_PATTERNS = {
+    r'(\d+)\s*min': lambda m: int(m.group(1)),
+    r'(\d+)\s*hour': lambda m: int(m.group(1)) * 60,
+    r'half\s*hour': lambda m: 30,
+    r'quarter\s*hour': lambda m: 15,
+    r'all\s*day': lambda m: 480,
+}
+
+BASELINE_LOCATIONS = {
+    'office': 'Office', 'home': 'Home', 'gym': 'Gym', 'store': 'Store', 'bank': 'Bank',
+    'doctor': "Doctor's Office", 'restaurant': 'Restaurant', 'online': 'Online',
+    'zoom': 'Video Call', 'phone': 'Phone Call'
+}
+
+BASELINE_RECURRING = {
+    'daily': ['daily', 'every day', 'each day'],
+    'weekly': ['weekly', 'every week', 'each week'],
+    'monthly': ['monthly', 'every month', 'each month'],
+    'weekdays': ['weekdays', 'monday to friday', 'work days'],
+    'weekends': ['weekends', 'saturday and sunday']
+}
+
+def baseline_scan(transcript: str):
+    duration = None
+    for pattern, extractor in BASELINE_DURATION_PATTERNS.items():
+        match = re.search(r'\b' + pattern, transcript, re.IGNORECASE)
+        if match:
+            duration = extractor(match)
+            break
+
+    transcript_lower = transcript.lower()
+    location = next((name for keyword, name in BASELINE_LOCATIONS.items() if keyword in transcript_lower), None)
+    recurring = next(
+        (pattern for pattern, keywords in BASELINE_RECURRING.items() if any(k in transcript_lower for k in keywords)),
+        None
+    )
+    return duration, location, recurring
+
+def generate_transcripts(count: int, signal_rate: float, seed: int = 7):
+    """Filler text with duration, location and recurrence phrases mixed in"""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(SIGNALS) if rng.random() < signal_rate else rng.choice(FILLER) for _ in range(rng.randint(5, 60)))
+        for _ in range(count)
+    ]
+
+def best_time(fn, transcripts, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for transcript in transcripts:
+            fn(transcript)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run(count: int, repeats: int, signal_rate: float):
+    enhancer = SmartTaskEnhancer()
+    transcripts = generate_transcripts(count, signal_rate)
+
+    identical = all(
+        baseline_scan(transcript) == tuple(enhancer.scan(transcript))[:3]
+        for transcript in transcripts
+    )
+    baseline = best_time(baseline_scan, transcripts, repeats)
+    combined = best_time(enhancer.scan, transcripts, repeats)
+
+    return {
+        "transcripts": count,
+        "signal_rate": signal_rate,
+        "identical_results": identical,
+        "baseline_us_per_call": round(baseline / count * 1e6, 2),
+        "single_scan_us_per_call": round(combined / count * 1e6, 2),
+        "speedup": round(baseline / combined, 2),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--signal-rate", type=float, default=0.08, help="Share of words that are signal phrases")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.count, args.repeats, args.signal_rate), indent=2))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+TaskScheduler benchmark
+Times greedy placement plus local search on generated tasks and calendars
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.scheduler import TaskScheduler
+
+START = datetime(2024, 1, 15, 8, 0)
+
+def generate(count: int, days: int, events_per_day: int, due_rate: float, seed: int = 7):
+    """Tasks with mixed priorities, durations and deadlines, and a busy calendar"""
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(count):
+        due = None
+        if rng.random() < due_rate:
+            due = (START + timedelta(days=rng.randint(0, days), hours=rng.randint(1, 9))).isoformat()
+        tasks.append({
+            "id": f"task-{i}",
+            "title": f"Task {i}",
+            "priority": rng.choice(["high", "medium", "low"]),
+            "due_date": due,
+            "estimated_duration": rng.choice([15, 30, 45, 60, 90, 120, None])
+        })
+
+    events = []
+    for day in range(days):
+        for _ in range(events_per_day):
+            start = START + timedelta(days=day, minutes=rng.randint(0, 9 * 60))
+            events.append({"start": start.isoformat(), "end": (start + timedelta(minutes=rng.choice([30, 60, 90]))).isoformat()})
+    return tasks, events
+
+def run(count: int, days: int, events_per_day: int, due_rate: float, repeats: int):
+    tasks, events = generate(count, days, events_per_day, due_rate)
+    end = START + timedelta(days=days)
+
+    def best_time(scheduler):
+        timings, schedule = [], None
+        for _ in range(repeats):
+            started = time.perf_counter()
+            schedule = scheduler.schedule(tasks, events, start=START, end=end)
+            timings.append(time.perf_counter() - started)
+        return min(timings), schedule
+
+    greedy_time, greedy = best_time(TaskScheduler(max_passes=0))
+    full_time, full = best_time(TaskScheduler())
+    deterministic = full.to_dict() == TaskScheduler().schedule(tasks, events, start=START, end=end).to_dict()
+
+    return {
+        "tasks": count,
+        "horizon_days": days,
+        "events": len(events),
+        "deterministic": deterministic,
+        "greedy_ms": round(greedy_time * 1000, 2),
+        "greedy_plus_local_search_ms": round(full_time * 1000, 2),
+        "greedy_weighted_lateness": greedy.weighted_lateness,
+        "optimized_weighted_lateness": full.weighted_lateness,
+        "greedy_unscheduled": len(greedy.unscheduled),
+        "optimized_unscheduled": len(full.unscheduled),
+        "local_search_moves": full.improvements,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=120, help="Scheduling horizon")
+    parser.add_argument("--events-per-day", type=int, default=4)
+    parser.add_argument("--due-rate", type=float, default=0.6, help="Share of tasks with a deadline")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.count, args.days, args.events_per_day, args.due_rate, args.repeats), indent=2))
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Google Calendar events API
+Serves events.list with paging and sync tokens, plus insert/update/delete,
+so calendar sync can be exercised without a Google account
+"""
+
+import argparse
+import asyncio
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+
+class FakeCalendar:
+    """One calendar: current resources plus the change sequence they were last touched at"""
+
+    def __init__(self):
+        self.events: Dict[str, Dict[str, Any]] = {}
+        self.changed_at: Dict[str, int] = {}
+        self.sequence = 0
+        # Sync tokens older than this get 410 Gone
+        self.oldest_token = 0
+
+    def put(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        self.sequence += 1
+        event = {**event, 'status': event.get('status', 'confirmed'), 'updated': f"{time.time():.6f}"}
+        self.events[event['id']] = event
+        self.changed_at[event['id']] = self.sequence
+        return event
+
+    def cancel(self, event_id: str) -> bool:
+        event = self.events.get(event_id)
+        if event is None or event['status'] == 'cancelled':
+            return False
+        self.put({'id': event_id, 'status': 'cancelled'})
+        return True
+
+    def listing(self, since: Optional[int]) -> List[Dict[str, Any]]:
+        if since is None:
+            return [event for event_id, event in sorted(self.events.items()) if event['status'] != 'cancelled']
+        return [event for event_id, event in sorted(self.events.items()) if self.changed_at[event_id] > since]
+
+def create_app(latency_ms: float = 0.0, access_token: Optional[str] = None) -> FastAPI:
+    app = FastAPI(title="Fake Google Calendar")
+    calendars: Dict[str, FakeCalendar] = {}
+    app.state.calendars = calendars
+
+    def calendar(calendar_id: str) -> FakeCalendar:
+        return calendars.setdefault(calendar_id, FakeCalendar())
+
+    async def pause(request: Request):
+        if access_token and request.headers.get("authorization") != f"Bearer {access_token}":
+            raise HTTPException(status_code=401, detail="Invalid credentials")
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+    @app.get("/calendars/{calendar_id}/events")
+    async def list_events(
+        calendar_id: str,
+        request: Request,
+        syncToken: Optional[str] = None,
+        pageToken: Optional[str] = None,
+        maxResults: int = 250
+    ):
+        await pause(request)
+        cal = calendar(calendar_id)
+        if pageToken:
+            # Pages of one listing share the sequence it started at
+            since, snapshot, offset = _decode_page_token(pageToken)
+        else:
+            since = int(syncToken[1:]) if syncToken else None
+            if since is not None and since < cal.oldest_token:
+                raise HTTPException(status_code=410, detail="Sync token is no longer valid, a full sync is required")
+            snapshot, offset = cal.sequence, 0
+
+        items = [event for event in cal.listing(since) if cal.changed_at[event['id']] <= snapshot]
+        page = items[offset:offset + maxResults]
+        body: Dict[str, Any] = {'kind': 'calendar#events', 'items': page}
+        if offset + maxResults < len(items):
+            body['nextPageToken'] = _encode_page_token(since, snapshot, offset + maxResults)
+        else:
+            body['nextSyncToken'] = f"s{snapshot}"
+        return body
+
+    @app.post("/calendars/{calendar_id}/events")
+    async def insert_event(calendar_id: str, request: Request):
+        await pause(request)
+        event = await request.json()
+        event.setdefault('id', uuid.uuid4().hex)
+        return calendar(calendar_id).put(event)
+
+    @app.put("/calendars/{calendar_id}/events/{event_id}")
+    async def update_event(calendar_id: str, event_id: str, request: Request):
+        await pause(request)
+        return calendar(calendar_id).put({**await request.json(), 'id': event_id})
+
+    @app.delete("/calendars/{calendar_id}/events/{event_id}", status_code=204)
+    async def delete_event(calendar_id: str, event_id: str, request: Request):
+        await pause(request)
+        if not calendar(calendar_id).cancel(event_id):
+            raise HTTPException(status_code=404, detail="Not Found")
+
+    @app.post("/_control/calendars/{calendar_id}/expire-tokens")
+    async def expire_tokens(calendar_id: str):
+        cal = calendar(calendar_id)
+        cal.oldest_token = cal.sequence + 1
+        return {"oldest_token": cal.oldest_token}
+
+    return app
+
+def _encode_page_token(since: Optional[int], snapshot: int, offset: int) -> str:
+    return f"{'' if since is None else since}.{snapshot}.{offset}"
+
+def _decode_page_token(token: str) -> Tuple[Optional[int], int, int]:
+    since, snapshot, offset = token.split('.')
+    return (int(since) if since else None), int(snapshot), int(offset)
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def serve_in_thread(app: FastAPI, port: Optional[int] = None) -> Tuple[uvicorn.Server, str]:
+    """Run app on a background thread; returns the server (set should_exit to stop) and its base URL"""
+    port = port or free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8085)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added to every request")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.latency_ms), host="127.0.0.1", port=args.port)
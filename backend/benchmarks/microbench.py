@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Validation and enhancement microbenchmarks with a regression gate
+Times the per-request task utilities on short, long and adversarial
+transcripts, measures per-call memory high-water marks, and compares both
+against a stored baseline. Exits non-zero when a case regresses beyond the
+thresholds.
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from routers.ai import calculate_confidence_score, enhance_extracted_task
+from utils.task_validation import SmartTaskEnhancer, TaskValidator
+from utils.temporal import _resolve_cached, parse_due_date, parse_due_time, resolve_temporal, resolve_text
+
+DEFAULT_BASELINE = Path(__file__).parent / "microbench_baseline.json"
+
+# Fixed so relative dates resolve the same way on every run
+REFERENCE_DAY = date(2030, 1, 15)
+
+WORDS = (
+    "please remember to finish the quarterly report for the client and send it to my boss "
+    "before the deadline also book a table for dinner with friends urgent asap call the "
+    "doctor about my appointment review the api and database design quick pay the bill "
+    "clean the house gym workout follow-up at the office on zoom for 30 minutes every week"
+).split()
+
+TEMPORAL = [
+    "tomorrow", "next friday", "in 3 days", "at 3pm", "end of the month", "this weekend",
+    "2030-06-01", "monday at 9:30", "tonight", "in two weeks", "noon", "day after tomorrow"
+]
+
+def short_transcripts(rng: random.Random, count: int) -> List[str]:
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))) + " " + rng.choice(TEMPORAL)
+        for _ in range(count)
+    ]
+
+def long_transcripts(rng: random.Random, count: int) -> List[str]:
+    return [
+        " ".join(rng.choice(WORDS) if rng.random() > 0.03 else rng.choice(TEMPORAL) for _ in range(rng.randint(150, 400)))
+        for _ in range(count)
+    ]
+
+def adversarial_transcripts(rng: random.Random, count: int) -> List[str]:
+    """Inputs that stress the regexes and scanners rather than resemble speech"""
+    makers = [
+        lambda: "a" * rng.randint(2000, 8000),
+        lambda: ":".join(str(rng.randint(0, 99)) for _ in range(rng.randint(200, 800))),
+        lambda: " ".join(["next"] * rng.randint(200, 600)) + " friday",
+        lambda: " ".join(["in"] * rng.randint(200, 600)) + " 3 days",
+        lambda: " ".join(rng.choice(TEMPORAL) for _ in range(rng.randint(100, 300))),
+        lambda: "".join(rng.choice("0123456789-T:Z+ ") for _ in range(rng.randint(500, 3000))),
+        lambda: " ".join(rng.choice(["urgent", "asap", "!!!", "💥", "完成", "réunion"]) for _ in range(rng.randint(100, 500))),
+        lambda: " " * rng.randint(100, 2000) + "x",
+    ]
+    return [makers[i % len(makers)]() for i in range(count)]
+
+CORPORA = {
+    "short": short_transcripts,
+    "long": long_transcripts,
+    "adversarial": adversarial_transcripts,
+}
+
+def extracted_task(rng: random.Random, transcript: str) -> Dict[str, Any]:
+    """A task shaped like the LLM extractor's output for the transcript"""
+    return {
+        "title": transcript[:rng.choice([20, 60, 100])].strip() or "Untitled",
+        "description": rng.choice([None, "", transcript[:300]]),
+        "priority": rng.choice(["low", "medium", "high", "urgent"]),
+        "category": rng.choice(["work", "personal", "health", "finance"]),
+        "due_date": rng.choice([None, "tomorrow", "2030-06-01", "next friday", "not a date"]),
+        "due_time": rng.choice([None, "3pm", "09:30", "25:00"]),
+        "estimated_duration": rng.choice([None, 15, 60]),
+        "tags": rng.choice([[], ["work"], ["call", "health"]]),
+        "confidence_score": rng.choice([0.4, 0.7, 0.9]),
+    }
+
+def build_corpus(size: int, seed: int) -> Dict[str, List[Tuple[Dict[str, Any], str]]]:
+    rng = random.Random(seed)
+    return {
+        name: [(extracted_task(rng, transcript), transcript) for transcript in make(rng, size)]
+        for name, make in CORPORA.items()
+    }
+
+def clear_caches():
+    # Every pass starts cold, as a new transcript would
+    _resolve_cached.cache_clear()
+    parse_due_date.cache_clear()
+    parse_due_time.cache_clear()
+
+def cases() -> Dict[str, Callable[[Dict[str, Any], str], Any]]:
+    validator = TaskValidator()
+    enhancer = SmartTaskEnhancer()
+    return {
+        "validate_task": lambda task, transcript: validator.validate_task(task, transcript),
+        "enhance_task": lambda task, transcript: enhancer.enhance_task(task, transcript),
+        "enhance_extracted_task": lambda task, transcript: enhance_extracted_task(task, transcript),
+        # Date normalization now lives in utils.temporal: whole transcripts go
+        # through resolve_text, extracted due dates through resolve_temporal
+        "resolve_text": lambda task, transcript: resolve_text(transcript.lower(), REFERENCE_DAY),
+        "resolve_temporal": lambda task, transcript: resolve_temporal(task["due_date"] or "", REFERENCE_DAY),
+        "parse_due_date": lambda task, transcript: parse_due_date(task["due_date"] or ""),
+        "calculate_confidence_score": lambda task, transcript: calculate_confidence_score(task, transcript),
+    }
+
+def time_case(run: Callable, items: List[Tuple[Dict[str, Any], str]], repeats: int) -> float:
+    """Best-of-repeats seconds for one pass over items; inputs are copied outside the timer"""
+    best = float("inf")
+    for _ in range(repeats):
+        inputs = copy.deepcopy(items)
+        clear_caches()
+        started = time.perf_counter()
+        for task, transcript in inputs:
+            run(task, transcript)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def peak_bytes_per_call(run: Callable, items: List[Tuple[Dict[str, Any], str]], sample: int) -> float:
+    """Mean transient memory high-water mark of a call, over the first sample items"""
+    inputs = copy.deepcopy(items[:sample])
+    clear_caches()
+    total = 0
+    tracemalloc.start()
+    try:
+        for task, transcript in inputs:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            run(task, transcript)
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return total / len(inputs)
+
+def machine() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": str(os.cpu_count())
+    }
+
+def run(size: int, repeats: int, sample: int, seed: int = 11) -> Dict[str, Any]:
+    corpus = build_corpus(size, seed)
+    results = {}
+    for case, call in cases().items():
+        for name, items in corpus.items():
+            seconds = time_case(call, items, repeats)
+            results[f"{case}/{name}"] = {
+                "ops_per_s": round(len(items) / seconds),
+                "us_per_op": round(seconds / len(items) * 1e6, 3),
+                "peak_bytes_per_op": round(peak_bytes_per_call(call, items, sample))
+            }
+    return {"machine": machine(), "size": size, "repeats": repeats, "seed": seed, "results": results}
+
+def find_regressions(baseline: Dict[str, Any], current: Dict[str, Any], max_slowdown: float, max_memory_growth: float) -> Tuple[List[str], bool]:
+    """Cases that lost more than max_slowdown throughput or grew memory by more than max_memory_growth
+
+    Throughput is only compared when the baseline was recorded on the same
+    kind of machine; memory is compared everywhere.
+    """
+    same_machine = baseline.get("machine") == current["machine"]
+    regressions = []
+    for key, now in current["results"].items():
+        before = baseline.get("results", {}).get(key)
+        if before is None:
+            continue
+        if same_machine and now["ops_per_s"] < before["ops_per_s"] * (1 - max_slowdown):
+            regressions.append(f"{key}: {before['ops_per_s']} -> {now['ops_per_s']} ops/s")
+        # A small absolute allowance keeps near-zero cases from flapping
+        if now["peak_bytes_per_op"] > before["peak_bytes_per_op"] * (1 + max_memory_growth) + 256:
+            regressions.append(f"{key}: {before['peak_bytes_per_op']} -> {now['peak_bytes_per_op']} peak bytes/op")
+    return regressions, same_machine
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=300, help="Transcripts per corpus")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--memory-sample", type=int, default=100, help="Calls per case traced for memory")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--max-slowdown", type=float, default=0.15, help="Allowed throughput loss, as a fraction")
+    parser.add_argument("--max-memory-growth", type=float, default=0.25, help="Allowed peak memory growth, as a fraction")
+    args = parser.parse_args()
+
+    result = run(args.size, args.repeats, args.memory_sample)
+    baseline_path = Path(args.baseline)
+
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(json.dumps(result, indent=2))
+        sys.exit(0)
+
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        regressions, same_machine = find_regressions(baseline, result, args.max_slowdown, args.max_memory_growth)
+        result["baseline"] = {
+            "path": str(baseline_path),
+            "throughput_compared": same_machine,
+            "regressions": regressions
+        }
+        print(json.dumps(result, indent=2))
+        sys.exit(1 if regressions else 0)
+
+    print(json.dumps(result, indent=2))
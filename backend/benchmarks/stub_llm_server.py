@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Stub Groq/OpenAI server for load tests
+Answers chat completions (Groq's /openai/v1 path and OpenAI's /v1 path) and
+Whisper transcriptions with canned responses after a configurable delay.
+Point the backend at it with GROQ_BASE_URL=<url> and OPENAI_BASE_URL=<url>/v1.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+TASK_JSON = {
+    "title": "Call the dentist to reschedule the appointment",
+    "description": "Move next week's check-up",
+    "priority": "medium",
+    "category": "health",
+    "estimated_duration": 15,
+    "due_date": "tomorrow",
+    "due_time": "3pm",
+    "tags": ["health", "call"],
+    "location": "",
+    "confidence_score": 0.85,
+    "suggestions": [],
+    "warnings": []
+}
+
+CHAT_REPLY = (
+    "Here's a plan for today: start with the quarterly report while your focus is fresh, "
+    "take the dentist call after lunch, and batch your email replies at 4pm. "
+    "Would you like me to block that time on your calendar?"
+)
+
+TRANSCRIPT = "Remind me to call the dentist tomorrow at 3pm to reschedule my appointment"
+
+def create_app(latency_ms: float = 0.0, jitter_ms: float = 0.0) -> FastAPI:
+    app = FastAPI(title="Stub LLM")
+    app.state.requests = 0
+
+    async def pause():
+        app.state.requests += 1
+        delay = latency_ms + (random.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    async def chat_completion(request: Request):
+        await pause()
+        body = await request.json()
+        wants_json = (body.get("response_format") or {}).get("type") == "json_object"
+        content = json.dumps(TASK_JSON) if wants_json else CHAT_REPLY
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 200, "completion_tokens": 80, "total_tokens": 280}
+        }
+
+    async def transcription(request: Request):
+        await pause()
+        # Read the upload so the client sees a realistic request cycle
+        await request.body()
+        return {"text": TRANSCRIPT}
+
+    app.add_api_route("/openai/v1/chat/completions", chat_completion, methods=["POST"])
+    app.add_api_route("/v1/chat/completions", chat_completion, methods=["POST"])
+    app.add_api_route("/v1/audio/transcriptions", transcription, methods=["POST"])
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "requests": app.state.requests}
+
+    return app
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8086)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay before every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter on the delay")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.latency_ms, args.jitter_ms), host="127.0.0.1", port=args.port, log_level="warning")
@@ -1,5 +1,6 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import os
 from dotenv import load_dotenv
@@ -28,6 +29,11 @@ security = HTTPBearer()
 
 # Import routers
 from routers import ai, integrations, tasks, calendar
+from utils.metrics import metrics
+from utils.profiling import install_profiling
+
+# Opt-in request profiling (PROFILE_TOKEN / PROFILE_SAMPLE_RATE); not installed otherwise
+install_profiling(app)
 
 app.include_router(ai.router, prefix="/api/ai", tags=["AI"])
 app.include_router(integrations.router, prefix="/api/integrations", tags=["Integrations"])
@@ -42,5 +48,10 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "jipange-backend"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Per-stage latency histograms in Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,8 +1,7 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 import os
-from groq import Groq
 from datetime import datetime, timedelta
 import json
 import re
@@ -10,15 +9,72 @@ from enum import Enum
 import logging
 import asyncpg
 import asyncio
+import base64
+import threading
 from contextlib import asynccontextmanager
+from utils.audio_preprocessing import NoSpeechError
+from utils.chat_rules import ChatRuleEngine
+from utils.lexicon import load_lexicon
+from utils.metrics import metrics
+from utils.parallel import ParallelTaskProcessor
+from utils.task_validation import SmartTaskEnhancer, TaskValidator, ValidationSeverity
+from utils.temporal import resolve_temporal
+from utils.transcript_analysis import TranscriptAnalysis
+from utils.transcription import TranscriptCache, TranscriptionService
+from utils.voice_stream import VoiceStreamSession
 
 router = APIRouter()
 
-# Initialize Groq client
-groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+# Groq client; the SDK is imported and the client built on first use, so
+# startup stays fast and each worker process creates its own
+_groq_client = None
+_groq_client_lock = threading.Lock()
+
+def get_groq_client():
+    global _groq_client
+    if _groq_client is None:
+        with _groq_client_lock:
+            if _groq_client is None:
+                from groq import Groq
+                _groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+                logging.info("Initialized Groq client")
+    return _groq_client
+
+# Whisper client is created once and shared; repeat uploads hit the cache
+transcription_service = TranscriptionService(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    cache=TranscriptCache(
+        max_entries=int(os.getenv("TRANSCRIPT_CACHE_MAX_ENTRIES", "1024")),
+        max_bytes=int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+    )
+)
+
+# Keyword lexicon bundles (LEXICON_BUNDLES, default "en"), compiled once and
+# shared by validation, enhancement and chat
+lexicon = load_lexicon()
+
+# Shared validation and enhancement; both keep their compiled matchers
+task_validator = TaskValidator(lexicon)
+task_enhancer = SmartTaskEnhancer(lexicon)
+
+# Large validation/enhancement batches are sharded across worker processes
+task_processor = ParallelTaskProcessor(
+    max_workers=int(os.getenv("TASK_WORKERS", "0")) or None,
+    min_batch_size=int(os.getenv("TASK_PARALLEL_MIN_BATCH", "2000")),
+    validator=task_validator,
+    enhancer=task_enhancer
+)
 
 # Database connection
 DATABASE_URL = os.getenv("DATABASE_URL")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_CLOSE_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_CLOSE_TIMEOUT_SECONDS", "10"))
+
+# Connection pool, created per worker on first use
+_db_pool: Optional[asyncpg.Pool] = None
+_db_pool_lock: Optional[asyncio.Lock] = None
+_database_ready = False
 
 # Enhanced data models
 class TaskPriority(str, Enum):
@@ -105,17 +161,57 @@ class VoiceRequest(BaseModel):
     user_id: str
     context: Optional[Dict[str, Any]] = None
 
+class BatchTaskItem(BaseModel):
+    task: Dict[str, Any]
+    transcript: str = ""
+
+class BatchValidationRequest(BaseModel):
+    items: List[BatchTaskItem]
+    enhance: bool = False
+    context: Optional[Dict[str, Any]] = None
+
 # Database functions
+@metrics.timed("db.connect")
 async def get_db_connection():
-    """Get database connection"""
+    """Get a pooled database connection; hand it back with release_db_connection"""
+    global _db_pool, _db_pool_lock
     try:
-        return await asyncpg.connect(DATABASE_URL)
+        if _db_pool is None:
+            # Made here rather than at import so it belongs to the serving loop
+            _db_pool_lock = _db_pool_lock or asyncio.Lock()
+            async with _db_pool_lock:
+                if _db_pool is None:
+                    _db_pool = await asyncpg.create_pool(DATABASE_URL, min_size=DB_POOL_MIN_SIZE, max_size=DB_POOL_MAX_SIZE)
+        return await _db_pool.acquire()
     except Exception as e:
         logging.error(f"Database connection failed: {e}")
         return None
 
+async def release_db_connection(conn):
+    try:
+        await _db_pool.release(conn)
+    except Exception as e:
+        logging.error(f"Releasing database connection failed: {e}")
+
+async def close_db_pool():
+    """Wait for connections in use to be released, then close the pool"""
+    global _db_pool
+    if _db_pool is None:
+        return
+    try:
+        await asyncio.wait_for(_db_pool.close(), timeout=DB_POOL_CLOSE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logging.error("Database pool did not close in time, terminating connections")
+        _db_pool.terminate()
+    finally:
+        _db_pool = None
+
+@metrics.timed("db.init")
 async def init_database():
-    """Initialize database tables"""
+    """Initialize database tables, once per worker"""
+    global _database_ready
+    if _database_ready:
+        return
     conn = await get_db_connection()
     if not conn:
         return
@@ -158,13 +254,15 @@ async def init_database():
             )
         ''')
         
+        _database_ready = True
         logging.info("Database tables initialized successfully")
         
     except Exception as e:
         logging.error(f"Database initialization failed: {e}")
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
+@metrics.timed("db.save_message")
 async def save_conversation_message(conversation_id: str, role: str, content: str, metadata: Dict = None):
     """Save a message to the conversation history"""
     conn = await get_db_connection()
@@ -187,8 +285,9 @@ async def save_conversation_message(conversation_id: str, role: str, content: st
     except Exception as e:
         logging.error(f"Failed to save message: {e}")
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
+@metrics.timed("db.conversation_history")
 async def get_conversation_history(conversation_id: str, limit: int = 10) -> List[ConversationMessage]:
     """Get conversation history"""
     conn = await get_db_connection()
@@ -219,8 +318,9 @@ async def get_conversation_history(conversation_id: str, limit: int = 10) -> Lis
         logging.error(f"Failed to get conversation history: {e}")
         return []
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
+@metrics.timed("db.conversation")
 async def create_or_get_conversation(user_id: str, conversation_id: str = None) -> str:
     """Create a new conversation or get existing one"""
     conn = await get_db_connection()
@@ -251,8 +351,9 @@ async def create_or_get_conversation(user_id: str, conversation_id: str = None)
         logging.error(f"Failed to create conversation: {e}")
         return f"conv_{user_id}_{int(datetime.now().timestamp())}"
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
+@metrics.timed("db.get_user_context")
 async def get_user_context(user_id: str) -> Dict[str, Any]:
     """Get user context for personalization"""
     conn = await get_db_connection()
@@ -277,8 +378,9 @@ async def get_user_context(user_id: str) -> Dict[str, Any]:
         logging.error(f"Failed to get user context: {e}")
         return {}
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
+@metrics.timed("db.update_user_context")
 async def update_user_context(user_id: str, context_type: str, context_data: Dict):
     """Update user context"""
     conn = await get_db_connection()
@@ -298,7 +400,7 @@ async def update_user_context(user_id: str, context_type: str, context_data: Dic
     except Exception as e:
         logging.error(f"Failed to update user context: {e}")
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 # Enhanced AI system prompts
 JIA_SYSTEM_PROMPT = """You are Jia, an advanced AI productivity assistant for the Jipange platform. You are helpful, intelligent, and personable.
@@ -335,6 +437,7 @@ RESPONSE FORMAT:
 Remember: You have access to the user's conversation history, tasks, and context. Use this information to provide personalized responses."""
 
 @router.post("/ask", response_model=ChatResponse)
+@metrics.timed("ai.ask")
 async def ask_ai(request: ChatRequest):
     """
     Enhanced AI chat with Groq integration and conversation memory
@@ -383,19 +486,25 @@ CONVERSATION HISTORY:
         })
         
         # Call Groq API
-        response = groq_client.chat.completions.create(
-            model="llama-3.1-70b-versatile",  # Using Groq's fast model
-            messages=messages,
-            max_tokens=500,
-            temperature=0.7,
-            top_p=0.9
-        )
+        with metrics.span("llm.chat"):
+            # Off the event loop, so one slow completion doesn't stall the worker
+            response = await asyncio.to_thread(
+                get_groq_client().chat.completions.create,
+                model="llama-3.1-70b-versatile",  # Using Groq's fast model
+                messages=messages,
+                max_tokens=500,
+                temperature=0.7,
+                top_p=0.9
+            )
         
         ai_response = response.choices[0].message.content
         
+        # Analyse the message once for suggestions and context updates
+        message_analysis = TranscriptAnalysis(request.message)
+        
         # Generate suggestions and actions
         suggestions, actions = await generate_suggestions_and_actions(
-            request.message, 
+            message_analysis, 
             ai_response, 
             user_context
         )
@@ -405,7 +514,7 @@ CONVERSATION HISTORY:
         await save_conversation_message(conversation_id, "assistant", ai_response)
         
         # Update user context based on conversation
-        await update_user_context_from_conversation(request.user_id, request.message, ai_response)
+        await update_user_context_from_conversation(request.user_id, message_analysis, ai_response)
         
         return ChatResponse(
             response=ai_response,
@@ -443,107 +552,31 @@ def format_conversation_history(history: List[ConversationMessage]) -> str:
     
     return "\n".join(formatted)
 
+# Chat suggestion, action and user-context rules from the lexicon, matched in one pass per message
+chat_rules = ChatRuleEngine(lexicon['chat_rules'])
+
 async def generate_suggestions_and_actions(
-    user_message: str, 
+    user_message: Union[str, TranscriptAnalysis], 
     ai_response: str, 
     user_context: Dict[str, Any]
 ) -> tuple[List[str], List[Dict[str, str]]]:
     """Generate contextual suggestions and actions"""
     
-    suggestions = []
-    actions = []
-    
-    message_lower = user_message.lower()
-    
-    # Task-related suggestions
-    if any(word in message_lower for word in ['task', 'todo', 'work', 'project']):
-        suggestions.extend([
-            "Would you like me to help prioritize your tasks?",
-            "I can suggest optimal time blocks for your work",
-            "Want to set up reminders for important deadlines?"
-        ])
-        actions.extend([
-            {"type": "create_task", "label": "Create New Task"},
-            {"type": "view_tasks", "label": "View All Tasks"},
-            {"type": "prioritize", "label": "Prioritize Tasks"}
-        ])
-    
-    # Schedule-related suggestions
-    if any(word in message_lower for word in ['schedule', 'calendar', 'meeting', 'time']):
-        suggestions.extend([
-            "I can analyze your calendar for optimization opportunities",
-            "Would you like me to suggest focus time blocks?",
-            "I can help you prepare for upcoming meetings"
-        ])
-        actions.extend([
-            {"type": "view_calendar", "label": "View Calendar"},
-            {"type": "schedule_focus", "label": "Schedule Focus Time"},
-            {"type": "optimize_schedule", "label": "Optimize Schedule"}
-        ])
-    
-    # Productivity suggestions
-    if any(word in message_lower for word in ['productivity', 'efficient', 'better', 'improve']):
-        suggestions.extend([
-            "I can analyze your work patterns for insights",
-            "Would you like personalized productivity recommendations?",
-            "I can suggest workflow improvements"
-        ])
-        actions.extend([
-            {"type": "productivity_report", "label": "View Productivity Report"},
-            {"type": "workflow_tips", "label": "Get Workflow Tips"},
-            {"type": "set_goals", "label": "Set Productivity Goals"}
-        ])
-    
-    # Tomorrow/planning suggestions
-    if any(word in message_lower for word in ['tomorrow', 'next', 'plan', 'prepare']):
-        suggestions.extend([
-            "I can create an optimized schedule for tomorrow",
-            "Would you like me to review your upcoming deadlines?",
-            "I can suggest preparation tasks for tomorrow's meetings"
-        ])
-        actions.extend([
-            {"type": "plan_tomorrow", "label": "Plan Tomorrow"},
-            {"type": "review_deadlines", "label": "Review Deadlines"},
-            {"type": "prep_meetings", "label": "Prepare for Meetings"}
-        ])
-    
-    return suggestions[:3], actions[:3]  # Limit to 3 each
-
-async def update_user_context_from_conversation(user_id: str, user_message: str, ai_response: str):
+    return chat_rules.suggest(user_message, max_suggestions=3, max_actions=3)
+
+async def update_user_context_from_conversation(user_id: str, user_message: Union[str, TranscriptAnalysis], ai_response: str):
     """Update user context based on conversation patterns"""
     
     # Extract preferences and patterns
-    context_updates = {}
-    
-    message_lower = user_message.lower()
-    
-    # Work patterns
-    if any(word in message_lower for word in ['morning', 'afternoon', 'evening']):
-        time_preference = None
-        if 'morning' in message_lower:
-            time_preference = 'morning'
-        elif 'afternoon' in message_lower:
-            time_preference = 'afternoon'
-        elif 'evening' in message_lower:
-            time_preference = 'evening'
-        
-        if time_preference:
-            context_updates['time_preferences'] = {
-                'preferred_work_time': time_preference,
-                'last_updated': datetime.now().isoformat()
-            }
-    
-    # Task preferences
-    if any(word in message_lower for word in ['urgent', 'important', 'priority']):
-        context_updates['task_preferences'] = {
-            'priority_focused': True,
-            'last_updated': datetime.now().isoformat()
-        }
+    analysis = TranscriptAnalysis.of(user_message)
+    context_updates = chat_rules.context_updates(analysis)
+    for context_data in context_updates.values():
+        context_data['last_updated'] = datetime.now().isoformat()
     
     # Communication style
-    if len(user_message.split()) > 20:
+    if analysis.word_count > 20:
         style = 'detailed'
-    elif len(user_message.split()) < 5:
+    elif analysis.word_count < 5:
         style = 'brief'
     else:
         style = 'moderate'
@@ -610,6 +643,7 @@ Would you like me to analyze your current schedule and suggest improvements?"""
 What would you like to work on today? You can ask me about your tasks, schedule, or any productivity challenges you're facing."""
 
 @router.post("/voice-to-task")
+@metrics.timed("ai.voice_to_task")
 async def voice_to_task(request: VoiceRequest):
     """
     Enhanced voice-to-task conversion with Groq integration
@@ -641,19 +675,143 @@ async def voice_to_task(request: VoiceRequest):
             "warnings": extracted_task.get("warnings", [])
         }
         
+    except HTTPException:
+        raise
+    except NoSpeechError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"Voice processing failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Voice processing failed: {str(e)}")
 
+@router.get("/chat-rules/stats")
+async def chat_rule_stats():
+    """
+    How often each chat rule has fired since startup
+    """
+    return {"lexicon": lexicon.version, "hit_counts": chat_rules.stats()}
+
+@router.post("/validate-batch")
+async def validate_batch(request: BatchValidationRequest):
+    """
+    Validate (and optionally enhance) many extracted tasks at once
+    """
+    start_time = datetime.now()
+    batch = [(item.task, item.transcript) for item in request.items]
+
+    try:
+        if request.enhance:
+            with metrics.span("enhancement.batch"):
+                await task_processor.enhance_async(batch, request.context)
+        with metrics.span("validation.batch"):
+            results = await task_processor.validate_async(batch)
+    except Exception as e:
+        logging.error(f"Batch validation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch validation failed: {str(e)}")
+
+    processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
+
+    return {
+        "results": [
+            {
+                "task": task_data,
+                "is_valid": result.is_valid,
+                "issues": result.issues,
+                "suggestions": result.suggestions
+            }
+            for (task_data, _), result in zip(batch, results)
+        ],
+        "parallel": task_processor.should_parallelize(len(batch)),
+        "processing_time_ms": processing_time
+    }
+
+@router.websocket("/voice-stream")
+async def voice_stream(websocket: WebSocket):
+    """
+    Streaming voice-to-task conversion.
+
+    Protocol: the client sends {"type": "start", "user_id": ..., "context": ...},
+    then audio segments as binary frames or {"type": "audio", "audio_data": base64},
+    then {"type": "end"} when the user stops speaking. The server replies with
+    "transcript" and "partial_task" messages as segments are processed and a
+    "final" message shaped like the /voice-to-task response.
+    """
+    await websocket.accept()
+    start_time = datetime.now()
+    session = None
+
+    try:
+        start = await websocket.receive_json()
+        if start.get("type") != "start" or not start.get("user_id"):
+            await websocket.send_json({"type": "error", "detail": "First message must be a start message with a user_id"})
+            await websocket.close(code=1008)
+            return
+
+        user_id = start["user_id"]
+        context = start.get("context")
+        user_context = await get_user_context(user_id)
+
+        session = VoiceStreamSession(
+            transcribe=transcribe_audio_bytes,
+            extract=lambda transcript: extract_task_with_groq(transcript, user_id, context, user_context),
+            send=websocket.send_json
+        )
+
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                session.cancel()
+                return
+
+            if message.get("bytes") is not None:
+                session.add_segment(message["bytes"])
+                continue
+
+            payload = json.loads(message.get("text") or "{}")
+            if payload.get("type") == "audio":
+                session.add_segment(base64.b64decode(payload.get("audio_data", "")))
+            elif payload.get("type") == "end":
+                break
+
+        speech_end_time = datetime.now()
+        transcript, extracted_task = await session.finish()
+        end_time = datetime.now()
+
+        await websocket.send_json({
+            "type": "final",
+            "transcript": transcript,
+            "extracted_task": extracted_task,
+            "confidence_score": extracted_task.get("confidence_score", 0.7),
+            "processing_time_ms": int((end_time - start_time).total_seconds() * 1000),
+            "latency_after_speech_ms": int((end_time - speech_end_time).total_seconds() * 1000),
+            "suggestions": extracted_task.get("suggestions", []),
+            "warnings": extracted_task.get("warnings", [])
+        })
+        await websocket.close()
+
+    except WebSocketDisconnect:
+        if session:
+            session.cancel()
+    except Exception as e:
+        logging.error(f"Voice stream failed: {str(e)}")
+        if session:
+            session.cancel()
+        try:
+            await websocket.send_json({"type": "error", "detail": f"Voice processing failed: {str(e)}"})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+
 async def extract_task_with_groq(
     transcript: str, 
     user_id: str, 
-    context: Optional[Dict[str, Any]] = None
+    context: Optional[Dict[str, Any]] = None,
+    user_context: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """Extract task using Groq instead of OpenAI"""
     
     current_time = datetime.now().isoformat()
-    user_context = await get_user_context(user_id)
+    if user_context is None:
+        user_context = await get_user_context(user_id)
     
     system_prompt = """You are an expert task extraction AI. Convert natural language voice input into structured task data.
 
@@ -661,7 +819,7 @@ EXTRACTION RULES:
 1. Create clear, actionable task titles starting with verbs
 2. Determine priority: urgent (ASAP, critical), high (important, soon), medium (should, need), low (sometime, maybe)
 3. Classify category: work, personal, health, learning, finance, social, household, creative
-4. Parse time references: "today", "tomorrow", "next week", specific dates/times
+4. Copy time references as spoken ("tomorrow", "next friday", "in 3 days", "3pm") into due_date and due_time; they are resolved to calendar dates afterwards
 5. Estimate duration: quick (15min), call (30min), meeting (60min), project (120min+)
 6. Extract location if mentioned
 7. Generate relevant tags
@@ -674,8 +832,8 @@ OUTPUT FORMAT: Return ONLY valid JSON with these fields:
   "priority": "low|medium|high|urgent",
   "category": "work|personal|health|learning|finance|social|household|creative",
   "estimated_duration": number_in_minutes,
-  "due_date": "YYYY-MM-DD",
-  "due_time": "HH:MM",
+  "due_date": "YYYY-MM-DD or the spoken date",
+  "due_time": "HH:MM or the spoken time",
   "tags": ["tag1", "tag2"],
   "location": "string",
   "confidence_score": 0.0-1.0,
@@ -692,22 +850,25 @@ PAGE_CONTEXT: {context.get('page_context', 'None') if context else 'None'}
 Extract task information and return as JSON."""
 
     try:
-        response = groq_client.chat.completions.create(
-            model="llama-3.1-70b-versatile",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            max_tokens=800,
-            temperature=0.1,
-            response_format={"type": "json_object"}
-        )
+        # Run the blocking SDK call off the event loop so streams can overlap
+        with metrics.span("llm.extract_task"):
+            response = await asyncio.to_thread(
+                get_groq_client().chat.completions.create,
+                model="llama-3.1-70b-versatile",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                max_tokens=800,
+                temperature=0.1,
+                response_format={"type": "json_object"}
+            )
         
         extracted_json = response.choices[0].message.content
         task_data = json.loads(extracted_json)
         
         # Validate and enhance
-        task_data = enhance_extracted_task(task_data, transcript, context)
+        task_data = enhance_extracted_task(task_data, TranscriptAnalysis(transcript), context)
         
         return task_data
         
@@ -719,52 +880,87 @@ Extract task information and return as JSON."""
 async def transcribe_audio(audio_data: str) -> str:
     """Audio transcription - keeping existing implementation"""
     try:
-        import base64
-        import tempfile
-        import os
-        from openai import OpenAI
-        
-        # Use OpenAI for Whisper (specialized for audio)
-        openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
         audio_bytes = base64.b64decode(audio_data)
-        
-        if len(audio_bytes) < 1000:
-            raise ValueError("Audio data too small")
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-            temp_audio.write(audio_bytes)
-            temp_audio_path = temp_audio.name
-        
-        try:
-            with open(temp_audio_path, "rb") as audio_file:
-                transcript_response = openai_client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language="en",
-                    prompt="This is a task or reminder request. Please transcribe accurately.",
-                    temperature=0.0
-                )
-            
-            return transcript_response.text.strip()
-            
-        finally:
-            os.unlink(temp_audio_path)
-            
     except Exception as e:
         logging.error(f"Audio transcription failed: {str(e)}")
         raise ValueError(f"Audio transcription failed: {str(e)}")
 
-def enhance_extracted_task(task_data: Dict[str, Any], transcript: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return await transcribe_audio_bytes(audio_bytes)
+
+@metrics.timed("transcription")
+async def transcribe_audio_bytes(audio_bytes: bytes) -> str:
+    """Transcribe raw audio bytes with Whisper without blocking the event loop"""
+    if len(audio_bytes) < 1000:
+        raise ValueError("Audio transcription failed: Audio data too small")
+
+    try:
+        return await transcription_service.transcribe(audio_bytes)
+    except NoSpeechError:
+        raise
+    except Exception as e:
+        logging.error(f"Audio transcription failed: {str(e)}")
+        raise ValueError(f"Audio transcription failed: {str(e)}")
+
+def _clean_extracted_task(task_data: Dict[str, Any]) -> List[str]:
+    """Coerce LLM output to the field types enhancement and validation expect
+
+    Model output is JSON but not always the shape the prompt asks for, e.g.
+    "tags": null, a numeric title or "estimated_duration": "30 minutes".
+    Values are converted where the intent is clear and dropped otherwise;
+    the returned warnings name what was dropped.
+    """
+    warnings = []
+    for field in ("title", "description"):
+        value = task_data.get(field)
+        if value is not None and not isinstance(value, str):
+            task_data[field] = str(value)
+    for field in ("priority", "category", "due_date", "due_time"):
+        value = task_data.get(field)
+        if value is not None and not isinstance(value, str):
+            task_data[field] = None
+            warnings.append(f"Ignored unrecognized {field.replace('_', ' ')} from the AI: {value!r}")
+
+    tags = task_data.get("tags")
+    if isinstance(tags, str):
+        tags = [tags]
+    task_data["tags"] = [str(tag) for tag in tags if tag] if isinstance(tags, list) else []
+
+    duration = task_data.get("estimated_duration")
+    if isinstance(duration, str):
+        text = duration.strip().lower()
+        duration = int(float(text)) if re.fullmatch(r"\d+(\.\d+)?", text) else task_enhancer.scan(text).duration
+        if duration is None:
+            warnings.append(f"Ignored unrecognized estimated duration from the AI: {task_data['estimated_duration']!r}")
+    elif isinstance(duration, bool) or not isinstance(duration, (int, float, type(None))):
+        warnings.append(f"Ignored unrecognized estimated duration from the AI: {duration!r}")
+        duration = None
+    task_data["estimated_duration"] = duration
+    return warnings
+
+def enhance_extracted_task(task_data: Dict[str, Any], transcript: Union[str, TranscriptAnalysis], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Enhance extracted task with smart defaults"""
+    analysis = TranscriptAnalysis.of(transcript)
+    transcript = analysis.text
+    cleanup_warnings = _clean_extracted_task(task_data)
     
     # Ensure required fields
     if not task_data.get("title"):
         task_data["title"] = transcript[:100] if len(transcript) > 100 else transcript
     
-    # Smart date processing
+    # Resolve spoken dates and times locally; fall back to the first date the transcript mentions
     if task_data.get("due_date"):
-        task_data["due_date"] = normalize_date(task_data["due_date"])
+        resolved = resolve_temporal(task_data["due_date"]) if isinstance(task_data["due_date"], str) else None
+    else:
+        resolved = analysis.temporal
+    if resolved:
+        task_data["due_date"] = resolved.date.isoformat()
+        if resolved.time and not task_data.get("due_time"):
+            task_data["due_time"] = resolved.time.strftime("%H:%M")
+
+    if isinstance(task_data.get("due_time"), str):
+        spoken_time = resolve_temporal(task_data["due_time"])
+        if spoken_time and spoken_time.time:
+            task_data["due_time"] = spoken_time.time.strftime("%H:%M")
     
     # Add context tags
     if context and context.get("page_context"):
@@ -772,26 +968,31 @@ def enhance_extracted_task(task_data: Dict[str, Any], transcript: str, context:
         existing_tags = task_data.get("tags", [])
         task_data["tags"] = list(set(existing_tags + page_tags))[:10]
     
+    # Smart duration, reminder, location and recurrence defaults
+    with metrics.span("enhancement.enhance_task"):
+        task_data = task_enhancer.enhance_task(task_data, analysis, context)
+    
     # Ensure confidence score
     if not task_data.get("confidence_score"):
         task_data["confidence_score"] = calculate_confidence_score(task_data, transcript)
     
+    # Validate against the transcript and surface the findings
+    with metrics.span("validation.validate_task"):
+        validation = task_validator.validate_task(task_data, analysis)
+    task_data["suggestions"] = _merge_unique(task_data.get("suggestions", []), validation.suggestions)
+    task_data["warnings"] = _merge_unique(
+        task_data.get("warnings", []),
+        cleanup_warnings + [issue["message"] for issue in validation.issues if issue["severity"] != ValidationSeverity.INFO.value]
+    )
+    
     return task_data
 
-def normalize_date(date_str: str) -> str:
-    """Normalize date string to ISO format"""
-    try:
-        if 'today' in date_str.lower():
-            return datetime.now().date().isoformat()
-        elif 'tomorrow' in date_str.lower():
-            return (datetime.now() + timedelta(days=1)).date().isoformat()
-        elif 'next week' in date_str.lower():
-            return (datetime.now() + timedelta(weeks=1)).date().isoformat()
-        else:
-            parsed_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            return parsed_date.date().isoformat()
-    except:
-        return date_str
+def _merge_unique(existing: List[str], additions: List[str]) -> List[str]:
+    merged = list(existing or [])
+    for item in additions:
+        if item not in merged:
+            merged.append(item)
+    return merged
 
 def extract_tags_from_context(context: str) -> List[str]:
     """Extract relevant tags from page context"""
@@ -839,3 +1040,8 @@ def create_fallback_task(transcript: str) -> Dict[str, Any]:
 @router.on_event("startup")
 async def startup_event():
     await init_database()
+
+@router.on_event("shutdown")
+async def shutdown_event():
+    task_processor.shutdown()
+    await close_db_pool()
@@ -0,0 +1,218 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+import logging
+import os
+
+from routers.tasks import expand_task, expand_user_tasks, task_listeners
+from utils.freebusy import TASK_EVENT_PREFIX, FreeBusyIndex
+from utils.scheduler import PlanChange, SchedulePlan, TaskScheduler
+from utils.temporal import parse_datetime, parse_due_time, to_naive
+
+router = APIRouter()
+
+def _today() -> datetime:
+    return datetime.combine(datetime.now().date(), datetime.min.time())
+
+# Busy bitmaps for every user from today onwards, fed by calendar events and scheduled tasks
+freebusy = FreeBusyIndex(
+    _today(),
+    days=int(os.getenv("FREEBUSY_DAYS", "14")),
+    resolution_minutes=int(os.getenv("FREEBUSY_RESOLUTION_MINUTES", "15"))
+)
+
+# Each user's latest plan from their own tasks, repaired in place as tasks and events change
+plans: Dict[str, SchedulePlan] = {}
+
+def _apply_plan_change(user_id: str, change: PlanChange):
+    """Mirror a plan repair into the free/busy index"""
+    freebusy.advance(_today())
+    for block in change.blocks:
+        freebusy.upsert_event(user_id, f"{TASK_EVENT_PREFIX}{block.task_id}", block.start, block.end)
+    for task_id in change.removed:
+        freebusy.remove_event(user_id, f"{TASK_EVENT_PREFIX}{task_id}")
+
+def repair_plan_for_task(user_id: str, task_id: str, task_data: Optional[Dict[str, Any]]):
+    """Re-place only the changed task's blocks in the user's plan"""
+    plan = plans.get(user_id)
+    if plan is None:
+        return
+    instances = expand_task(task_data, plan.origin, plan.horizon_end) if task_data else []
+    _apply_plan_change(user_id, plan.set_task_instances(task_id, instances))
+
+def repair_plan_for_event(user_id: str, event_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """Re-place only the blocks on the days a moved, added or removed event touches"""
+    plan = plans.get(user_id)
+    if plan is None:
+        return
+    change = plan.upsert_event(event_id, start, end) if start is not None else plan.remove_event(event_id)
+    _apply_plan_change(user_id, change)
+
+def apply_busy_event(user_id: str, event_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> bool:
+    """Record an added, moved or (without times) removed calendar event and repair the plan around it
+
+    Returns False when removing an event that wasn't known.
+    """
+    freebusy.advance(_today())
+    if start is not None:
+        freebusy.upsert_event(user_id, event_id, start, end)
+    elif not freebusy.remove_event(user_id, event_id):
+        return False
+    repair_plan_for_event(user_id, event_id, start, end)
+    return True
+
+task_listeners.append(repair_plan_for_task)
+
+class CalendarEvent(BaseModel):
+    id: Optional[str] = None
+    title: Optional[str] = None
+    start: str
+    end: str
+
+class SchedulableTask(BaseModel):
+    id: Optional[str] = None
+    title: str
+    priority: str = "medium"  # urgent, high, medium, low
+    due_date: Optional[str] = None
+    estimated_duration: Optional[int] = None  # in minutes
+
+class ScheduleRequest(BaseModel):
+    user_id: Optional[str] = None
+    # Scheduled instead of the user's open tasks when given
+    tasks: Optional[List[SchedulableTask]] = None
+    # Defaults to the user's events known to the free/busy index
+    events: List[CalendarEvent] = []
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    work_start: str = "09:00"
+    work_end: str = "17:00"
+    workdays: List[int] = [0, 1, 2, 3, 4]  # Monday is 0
+    buffer_minutes: int = 0
+
+class BusyEventsUpdate(BaseModel):
+    events: List[CalendarEvent]
+
+class AvailabilityRequest(BaseModel):
+    user_ids: List[str]
+    duration_minutes: int = 30
+    count: int = 5
+    after: Optional[datetime] = None
+    before: Optional[datetime] = None
+    working_hours_only: bool = True
+
+@router.post("/schedule")
+async def schedule_tasks(request: ScheduleRequest):
+    """Place tasks into free time around calendar events"""
+    try:
+        work_start, work_end = parse_due_time(request.work_start), parse_due_time(request.work_end)
+        if work_start is None or work_end is None or work_end <= work_start:
+            raise HTTPException(status_code=400, detail="Working hours must be HH:MM with work_end after work_start")
+        if request.tasks is None and not request.user_id:
+            raise HTTPException(status_code=400, detail="Provide tasks or a user_id")
+
+        start = to_naive(request.start) if request.start else datetime.now()
+        end = to_naive(request.end) if request.end else start + timedelta(days=7)
+
+        if request.tasks is not None:
+            tasks = [task.dict() for task in request.tasks]
+        else:
+            # Recurring tasks contribute only their occurrences inside the horizon
+            tasks = expand_user_tasks(request.user_id, start, end)
+
+        scheduler = TaskScheduler(
+            work_start=work_start,
+            work_end=work_end,
+            workdays=request.workdays,
+            buffer_minutes=max(request.buffer_minutes, 0)
+        )
+        events = [event.dict() for event in request.events]
+        if not events and request.user_id:
+            events = freebusy.calendar_events(request.user_id)
+
+        plan = scheduler.plan(
+            tasks,
+            events,
+            start=start,
+            end=end
+        )
+        schedule = plan.schedule()
+        if request.tasks is None:
+            # The user's own plan: their time is now taken, and later changes repair it
+            plans[request.user_id] = plan
+            freebusy.advance(_today())
+            freebusy.set_task_blocks(request.user_id, schedule.blocks)
+
+        return {
+            **schedule.to_dict(),
+            "user_id": request.user_id,
+            "generated_at": datetime.now().isoformat()
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Scheduling failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Scheduling failed: {str(e)}")
+
+@router.get("/plan/{user_id}")
+async def get_plan(user_id: str):
+    """The user's current plan, including repairs since it was scheduled"""
+    plan = plans.get(user_id)
+    if plan is None:
+        raise HTTPException(status_code=404, detail="No plan for this user; schedule their tasks first")
+    return {
+        **plan.schedule().to_dict(),
+        "user_id": user_id,
+        "horizon": {"start": plan.origin.isoformat(), "end": plan.horizon_end.isoformat()}
+    }
+
+@router.put("/busy/{user_id}")
+async def update_busy_events(user_id: str, update: BusyEventsUpdate):
+    """Add or move calendar events in a user's free/busy bitmap"""
+    try:
+        for event in update.events:
+            start, end = parse_datetime(event.start), parse_datetime(event.end)
+            if start is None or end is None or end <= start:
+                raise HTTPException(status_code=400, detail=f"Invalid event times: {event.start} - {event.end}")
+            event_id = event.id or f"{event.start}/{event.end}"
+            apply_busy_event(user_id, event_id, start, end)
+
+        return {"user_id": user_id, "events": len(update.events)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Busy update failed: {str(e)}")
+
+@router.delete("/busy/{user_id}/{event_id}")
+async def delete_busy_event(user_id: str, event_id: str):
+    """Remove a calendar event from a user's free/busy bitmap"""
+    if not apply_busy_event(user_id, event_id):
+        raise HTTPException(status_code=404, detail="Event not found")
+    return {"message": "Event removed successfully"}
+
+@router.post("/availability")
+async def find_common_availability(request: AvailabilityRequest):
+    """First common free slots of a given length for a group of users"""
+    try:
+        if request.duration_minutes <= 0 or request.count <= 0:
+            raise HTTPException(status_code=400, detail="duration_minutes and count must be positive")
+
+        freebusy.advance(_today())
+        slots = freebusy.common_free_slots(
+            request.user_ids,
+            request.duration_minutes,
+            count=request.count,
+            after=request.after or datetime.now(),
+            before=request.before,
+            working_hours_only=request.working_hours_only
+        )
+
+        return {
+            "slots": [{"start": start.isoformat(), "end": end.isoformat()} for start, end in slots],
+            "user_ids": request.user_ids,
+            "resolution_minutes": freebusy.resolution
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Availability query failed: {str(e)}")
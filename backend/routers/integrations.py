@@ -1,12 +1,20 @@
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import os
-import requests
-from datetime import datetime
+import logging
+from datetime import datetime, timedelta
 import hmac
 import hashlib
 
+from routers.ai import task_processor
+from routers.calendar import apply_busy_event
+from utils.calendar_sync import CalendarConnection, CalendarSync, GoogleCalendarClient, SyncResult
+from utils.event_pipeline import EventPipeline
+from utils.http_client import http_client
+from utils.job_queue import JobQueue
+from utils.temporal import to_naive
+
 router = APIRouter()
 
 class GoogleCalendarWebhook(BaseModel):
@@ -14,6 +22,13 @@ class GoogleCalendarWebhook(BaseModel):
     resource_uri: str
     channel_id: str
 
+class GoogleCalendarConnect(BaseModel):
+    user_id: str
+    access_token: str
+    calendar_id: str = "primary"
+    # Watch channel whose notifications belong to this user
+    channel_id: Optional[str] = None
+
 class SlackEvent(BaseModel):
     event: Dict[str, Any]
     team_id: str
@@ -32,6 +47,9 @@ async def google_calendar_webhook(request: Request):
         channel_id = headers.get("x-goog-channel-id")
         resource_state = headers.get("x-goog-resource-state")
         
+        if not channel_id:
+            raise HTTPException(status_code=400, detail="Missing x-goog-channel-id header")
+        
         if resource_state == "sync":
             return {"status": "sync_acknowledged"}
         
@@ -44,53 +62,71 @@ async def google_calendar_webhook(request: Request):
             # 3. Trigger AI rescheduling if needed
             # 4. Send notifications to affected users
             
-            print(f"Calendar change detected for channel: {channel_id}")
-            
-            # Simulate processing
-            await process_calendar_changes(channel_id)
+            # Acknowledge now; a burst for one channel becomes a single sync
+            calendar_sync_queue.submit(channel_id, {
+                "resource_state": resource_state,
+                "resource_id": headers.get("x-goog-resource-id"),
+                "message_number": headers.get("x-goog-message-number")
+            })
+            return {"status": "queued"}
             
-        return {"status": "processed"}
+        return {"status": "ignored"}
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Webhook processing failed: {str(e)}")
 
+@router.get("/google/webhook/stats")
+async def google_webhook_stats():
+    """Counters for the calendar sync queue and event stores"""
+    return {**calendar_sync_queue.stats(), "sync": calendar_sync.stats()}
+
+@router.post("/google/connect")
+async def connect_google_calendar(connection: GoogleCalendarConnect):
+    """
+    Link a user's Google Calendar and run the initial full sync
+    """
+    try:
+        calendar_sync.connect(CalendarConnection(**connection.dict()))
+        return (await sync_user_calendar(connection.user_id)).to_dict()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Calendar connect failed: {str(e)}")
+
 @router.get("/google/calendar/{user_id}")
-async def get_google_calendar(user_id: str):
+async def get_google_calendar(user_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None):
     """
-    Fetch user's Google Calendar events
+    User's Google Calendar events in [start, end), served from the local store
     """
     try:
-        # This would implement OAuth2 flow and API calls
-        # For now, return mock data
-        
-        mock_events = [
-            {
-                "id": "event_1",
-                "title": "Team Standup",
-                "start": "2024-01-15T09:00:00Z",
-                "end": "2024-01-15T09:30:00Z",
-                "attendees": ["user@example.com"],
-                "location": "Conference Room A"
-            },
-            {
-                "id": "event_2", 
-                "title": "Client Meeting",
-                "start": "2024-01-15T14:00:00Z",
-                "end": "2024-01-15T15:00:00Z",
-                "attendees": ["user@example.com", "client@example.com"],
-                "location": "Zoom"
-            }
-        ]
+        store = calendar_sync.store(user_id)
+        if store is None:
+            raise HTTPException(status_code=404, detail="Google Calendar not connected for this user")
+        if store.synced_at is None:
+            # The initial sync failed; try again before answering
+            await sync_user_calendar(user_id)
+
+        window_start = to_naive(start) if start else datetime.combine(datetime.now().date(), datetime.min.time())
+        window_end = to_naive(end) if end else window_start + timedelta(days=7)
         
         return {
-            "events": mock_events,
+            "events": [event.to_dict() for event in store.between(window_start, window_end)],
             "user_id": user_id,
-            "synced_at": datetime.now().isoformat()
+            "start": window_start.isoformat(),
+            "end": window_end.isoformat(),
+            "synced_at": store.synced_at.isoformat() if store.synced_at else None
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Calendar fetch failed: {str(e)}")
 
+@router.get("/slack/events/stats")
+async def slack_event_stats():
+    """Queue lag and dedupe counters for Slack event ingestion"""
+    return slack_pipeline.stats()
+
 @router.post("/slack/events")
 async def slack_events(request: Request):
     """
@@ -103,39 +139,117 @@ async def slack_events(request: Request):
         if body.get("type") == "url_verification":
             return {"challenge": body.get("challenge")}
         
-        # Process Slack events
+        # Queue Slack events and acknowledge before Slack's retry timeout;
+        # retries carry the same event_id and are dropped here
         if body.get("type") == "event_callback":
             event = body.get("event", {})
-            event_type = event.get("type")
-            
-            if event_type == "message":
-                # Process Slack message for task creation
-                await process_slack_message(event)
-            elif event_type == "reaction_added":
-                # Handle task status updates via reactions
-                await process_slack_reaction(event)
+            if event.get("type") in ("message", "reaction_added"):
+                slack_pipeline.submit(event, event_id=body.get("event_id"))
         
         return {"status": "ok"}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Slack event processing failed: {str(e)}")
 
+async def sync_user_calendar(user_id: str) -> SyncResult:
+    """Pull the user's calendar changes and feed them to free/busy and their plan"""
+    result = await calendar_sync.sync(user_id)
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    for event in result.upserted:
+        if event.end > today:
+            apply_busy_event(user_id, event.id, event.start, event.end)
+        else:
+            # Moved into the past: no longer blocks anything
+            apply_busy_event(user_id, event.id)
+    for event_id in result.removed:
+        apply_busy_event(user_id, event_id)
+    return result
+
 async def process_calendar_changes(channel_id: str):
     """Process Google Calendar changes"""
-    # Implement calendar change processing logic
-    print(f"Processing calendar changes for channel: {channel_id}")
+    user_id = calendar_sync.user_for_channel(channel_id)
+    if user_id is None:
+        logging.error(f"Calendar notification for unknown channel: {channel_id}")
+        return
+    result = await sync_user_calendar(user_id)
+    logging.info(f"Calendar sync for {user_id}: {len(result.upserted)} changed, {len(result.removed)} removed")
+
+async def sync_calendar_channel(channel_id: str, notifications: List[Dict[str, Any]]):
+    """Run one sync for every notification coalesced on a channel"""
+    logging.info(f"Calendar change detected for channel: {channel_id} ({len(notifications)} notifications)")
+    await process_calendar_changes(channel_id)
+
+async def process_slack_batch(events: List[Dict[str, Any]]):
+    """Messages go to task extraction together; reactions are handled one by one"""
+    await process_slack_messages([event for event in events if event.get("type") == "message"])
+    for event in events:
+        if event.get("type") == "reaction_added":
+            await process_slack_reaction(event)
+
+slack_pipeline = EventPipeline(
+    process_slack_batch,
+    name="slack-events",
+    workers=int(os.getenv("SLACK_EVENT_WORKERS", "2")),
+    max_batch=int(os.getenv("SLACK_EVENT_BATCH_SIZE", "32")),
+    max_wait_seconds=float(os.getenv("SLACK_EVENT_BATCH_WAIT_SECONDS", "0.05"))
+)
+
+# Outbound calls share one connection pool; each integration gets its own share of it
+http_client.limit(GoogleCalendarClient.INTEGRATION, int(os.getenv("GOOGLE_CALENDAR_MAX_CONCURRENCY", "8")))
+http_client.limit("slack", int(os.getenv("SLACK_API_MAX_CONCURRENCY", "4")))
+
+calendar_sync = CalendarSync(GoogleCalendarClient(
+    os.getenv("GOOGLE_CALENDAR_API_URL", "https://www.googleapis.com/calendar/v3")
+))
+
+calendar_sync_queue = JobQueue(
+    sync_calendar_channel,
+    name="calendar-sync",
+    debounce_seconds=float(os.getenv("GOOGLE_WEBHOOK_DEBOUNCE_SECONDS", "2")),
+    max_delay_seconds=float(os.getenv("GOOGLE_WEBHOOK_MAX_DELAY_SECONDS", "10")),
+    workers=int(os.getenv("GOOGLE_SYNC_WORKERS", "4"))
+)
+
+@router.on_event("startup")
+async def startup_event():
+    calendar_sync_queue.start()
+    slack_pipeline.start()
+
+@router.on_event("shutdown")
+async def shutdown_event():
+    await slack_pipeline.stop()
+    await calendar_sync_queue.stop()
+    await http_client.close()
+
+async def process_slack_messages(events: List[Dict[str, Any]]):
+    """Extract task candidates from a batch of Slack messages"""
+    # Edits, joins and bot posts arrive as subtypes; only people's messages become tasks
+    messages = [
+        event for event in events
+        if event.get("text", "").strip() and not event.get("subtype") and not event.get("bot_id")
+    ]
+    if not messages:
+        return
+
+    batch = [
+        ({"title": event["text"][:100], "tags": ["slack"], "source": "slack"}, event["text"])
+        for event in messages
+    ]
+    await task_processor.enhance_async(batch, {"page_context": "slack.com"})
+    results = await task_processor.validate_async(batch)
+
+    for event, (task_data, _), result in zip(messages, batch, results):
+        if result.is_valid:
+            # Message text stays out of the logs
+            logging.info(f"Task candidate from Slack user {event.get('user', '')} in {event.get('channel', '')} (confidence {task_data.get('confidence_score')})")
 
 async def process_slack_message(event: Dict[str, Any]):
     """Process Slack message for task extraction"""
-    text = event.get("text", "")
-    user = event.get("user", "")
-    
-    # Use AI to extract tasks from Slack messages
-    print(f"Processing Slack message from {user}: {text}")
+    await process_slack_messages([event])
 
 async def process_slack_reaction(event: Dict[str, Any]):
     """Process Slack reactions for task status updates"""
     reaction = event.get("reaction", "")
     user = event.get("user", "")
     
-    print(f"Processing Slack reaction {reaction} from {user}")
+    logging.info(f"Processing Slack reaction {reaction} from {user}")
@@ -1,9 +1,17 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from collections import defaultdict
+from datetime import datetime, timedelta
+import logging
+import os
 import uuid
 
+from utils.recurrence import RecurrenceIndex, rule_from_task
+from utils.metrics import metrics
+from utils.reminders import Reminder, ReminderScheduler, log_reminders
+from utils.temporal import to_naive
+
 router = APIRouter()
 
 class Task(BaseModel):
@@ -15,6 +23,8 @@ class Task(BaseModel):
     due_date: Optional[str] = None
     estimated_duration: Optional[int] = None  # in minutes
     tags: List[str] = []
+    recurring: Optional[str] = None  # daily, weekly, monthly, weekdays, weekends
+    reminder_minutes: Optional[int] = None  # before the due time
     user_id: str
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
@@ -27,11 +37,105 @@ class TaskUpdate(BaseModel):
     due_date: Optional[str] = None
     estimated_duration: Optional[int] = None
     tags: Optional[List[str]] = None
+    recurring: Optional[str] = None
+    reminder_minutes: Optional[int] = None
+
+class OccurrenceChange(BaseModel):
+    occurrence: datetime
+    skip: bool = False
+    # New start for this occurrence only
+    start: Optional[datetime] = None
 
 # In-memory storage (replace with database)
 tasks_db = {}
 
+# Per-user recurrence rules and next occurrences; one rule per task, never expanded rows
+recurrence_indexes: Dict[str, RecurrenceIndex] = defaultdict(RecurrenceIndex)
+
+def index_task(task_data: Dict[str, Any]):
+    """Keep the user's recurrence index in step with a stored task"""
+    index = recurrence_indexes[task_data["user_id"]]
+    rule = rule_from_task(task_data) if task_data.get("status") != "completed" else None
+    if rule is None:
+        index.remove(task_data["id"])
+    else:
+        index.set_rule(task_data["id"], rule)
+
+# Where fired reminders go; swap for a push/email/Slack sender
+reminder_sink = log_reminders
+
+async def deliver_reminders(batch: List[Reminder]):
+    """Send a tick's reminders, then arm recurring tasks for their next occurrence"""
+    # tasks_db does not survive a restart, but persisted reminders do
+    batch = [reminder for reminder in batch if reminder.task_id in tasks_db]
+    if not batch:
+        return
+    await reminder_sink(batch)
+    for reminder in batch:
+        task_data = tasks_db.get(reminder.task_id)
+        if task_data and task_data.get("recurring"):
+            schedule_task_reminder(task_data, after=reminder.due_at + timedelta(microseconds=1))
+
+# Set REMINDER_STORE_PATH (e.g. data/reminders.json) to keep pending reminders across restarts
+reminders = ReminderScheduler(
+    sink=deliver_reminders,
+    store_path=os.getenv("REMINDER_STORE_PATH") or None
+)
+
+def schedule_task_reminder(task_data: Dict[str, Any], after: Optional[datetime] = None):
+    """Arm (or disarm) a task's reminder for its next occurrence"""
+    task_id = task_data["id"]
+    minutes = task_data.get("reminder_minutes")
+    index = recurrence_indexes[task_data["user_id"]]
+    occurrence = index.next_occurrence(task_id, after or datetime.now()) if minutes and task_id in index else None
+    if occurrence is None:
+        reminders.cancel(task_id)
+        return
+
+    reminders.schedule(Reminder(
+        task_id=task_id,
+        user_id=task_data["user_id"],
+        title=task_data["title"],
+        fire_at=occurrence.start - timedelta(minutes=minutes),
+        due_at=occurrence.start
+    ))
+
+def expand_task(task_data: Dict[str, Any], start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """A task as schedulable instances: itself, or its occurrences in [start, end) if it recurs"""
+    if task_data.get("status") == "completed":
+        return []
+    index = recurrence_indexes[task_data["user_id"]]
+    if not task_data.get("recurring") or task_data["id"] not in index:
+        return [task_data]
+    return [
+        {
+            **task_data,
+            "id": f"{task_data['id']}@{occurrence.original.isoformat()}",
+            "due_date": occurrence.start.isoformat()
+        }
+        for occurrence in index.occurrences(task_data["id"], start, end)
+    ]
+
+def expand_user_tasks(user_id: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """Open tasks of a user, with recurring ones expanded into their occurrences in [start, end)"""
+    return [
+        instance
+        for task_data in tasks_db.values() if task_data.get("user_id") == user_id
+        for instance in expand_task(task_data, start, end)
+    ]
+
+# Called as listener(user_id, task_id, task_data) after every change; task_data is None once deleted
+task_listeners: List[Callable[[str, str, Optional[Dict[str, Any]]], None]] = []
+
+def notify_task_changed(user_id: str, task_id: str, task_data: Optional[Dict[str, Any]]):
+    for listener in task_listeners:
+        try:
+            listener(user_id, task_id, task_data)
+        except Exception as e:
+            logging.error(f"Task change listener failed for {task_id}: {e}")
+
 @router.post("/", response_model=Task)
+@metrics.timed("tasks.create")
 async def create_task(task: Task):
     """Create a new task"""
     try:
@@ -40,12 +144,16 @@ async def create_task(task: Task):
         task.updated_at = task.created_at
         
         tasks_db[task.id] = task.dict()
+        index_task(tasks_db[task.id])
+        schedule_task_reminder(tasks_db[task.id])
+        notify_task_changed(task.user_id, task.id, tasks_db[task.id])
         
         return task
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Task creation failed: {str(e)}")
 
 @router.get("/{user_id}", response_model=List[Task])
+@metrics.timed("tasks.list")
 async def get_user_tasks(user_id: str):
     """Get all tasks for a user"""
     try:
@@ -59,6 +167,7 @@ async def get_user_tasks(user_id: str):
         raise HTTPException(status_code=500, detail=f"Task retrieval failed: {str(e)}")
 
 @router.put("/{task_id}", response_model=Task)
+@metrics.timed("tasks.update")
 async def update_task(task_id: str, task_update: TaskUpdate):
     """Update an existing task"""
     try:
@@ -73,6 +182,9 @@ async def update_task(task_id: str, task_update: TaskUpdate):
         
         task_data["updated_at"] = datetime.now().isoformat()
         tasks_db[task_id] = task_data
+        index_task(task_data)
+        schedule_task_reminder(task_data)
+        notify_task_changed(task_data["user_id"], task_id, task_data)
         
         return Task(**task_data)
     except HTTPException:
@@ -81,15 +193,100 @@ async def update_task(task_id: str, task_update: TaskUpdate):
         raise HTTPException(status_code=500, detail=f"Task update failed: {str(e)}")
 
 @router.delete("/{task_id}")
+@metrics.timed("tasks.delete")
 async def delete_task(task_id: str):
     """Delete a task"""
     try:
         if task_id not in tasks_db:
             raise HTTPException(status_code=404, detail="Task not found")
         
-        del tasks_db[task_id]
+        task_data = tasks_db.pop(task_id)
+        recurrence_indexes[task_data["user_id"]].remove(task_id)
+        reminders.cancel(task_id)
+        notify_task_changed(task_data["user_id"], task_id, None)
         return {"message": "Task deleted successfully"}
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Task deletion failed: {str(e)}")
+
+@router.get("/{user_id}/occurrences")
+async def get_task_occurrences(user_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """Occurrences of a user's dated and recurring tasks in a window (default the next 7 days)"""
+    try:
+        start = to_naive(start) if start else datetime.now()
+        end = to_naive(end) if end else start + timedelta(days=7)
+        index = recurrence_indexes[user_id]
+        task_ids = [task_id for task_id, task_data in tasks_db.items() if task_data.get("user_id") == user_id]
+
+        return [
+            {
+                "task_id": occurrence.task_id,
+                "title": tasks_db[occurrence.task_id]["title"],
+                "start": occurrence.start.isoformat(),
+                "original_start": occurrence.original.isoformat(),
+                "moved": occurrence.moved
+            }
+            for occurrence in index.expand(task_ids, start, end)
+        ]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Occurrence retrieval failed: {str(e)}")
+
+@router.get("/{user_id}/due-soon")
+async def get_due_soon(user_id: str, hours: int = 24):
+    """Next occurrence of each of a user's tasks falling due within the given hours"""
+    try:
+        due = recurrence_indexes[user_id].due_soon(datetime.now(), timedelta(hours=hours))
+        return [
+            {
+                "task_id": occurrence.task_id,
+                "title": tasks_db[occurrence.task_id]["title"],
+                "due": occurrence.start.isoformat(),
+                "recurring": tasks_db[occurrence.task_id].get("recurring")
+            }
+            for occurrence in due
+        ]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Due task retrieval failed: {str(e)}")
+
+@router.post("/{task_id}/occurrences")
+async def change_occurrence(task_id: str, change: OccurrenceChange):
+    """Skip or move a single occurrence of a recurring task"""
+    try:
+        if task_id not in tasks_db:
+            raise HTTPException(status_code=404, detail="Task not found")
+        index = recurrence_indexes[tasks_db[task_id]["user_id"]]
+        if not tasks_db[task_id].get("recurring") or task_id not in index:
+            raise HTTPException(status_code=400, detail="Task is not recurring")
+
+        # Rules are kept to the minute
+        occurrence = to_naive(change.occurrence).replace(second=0, microsecond=0)
+        try:
+            if change.skip:
+                index.skip(task_id, occurrence)
+            elif change.start is not None:
+                index.move(task_id, occurrence, to_naive(change.start))
+            else:
+                raise HTTPException(status_code=400, detail="Set skip or a new start")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        schedule_task_reminder(tasks_db[task_id])
+        notify_task_changed(tasks_db[task_id]["user_id"], task_id, tasks_db[task_id])
+        next_occurrence = index.next_occurrence(task_id, datetime.now())
+        return {
+            "task_id": task_id,
+            "next_occurrence": next_occurrence.start.isoformat() if next_occurrence else None
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Occurrence update failed: {str(e)}")
+
+@router.on_event("startup")
+async def startup_event():
+    reminders.start()
+
+@router.on_event("shutdown")
+async def shutdown_event():
+    await reminders.stop()
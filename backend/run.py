@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 """
 Jipange Backend Runner
-Run this script to start the FastAPI backend server
+Run this script to start the FastAPI backend server; pass --production for
+the multi-worker server (uvloop, httptools, no reloader)
 """
 
+import argparse
+import importlib.util
 import os
 import sys
 from pathlib import Path
@@ -15,20 +18,55 @@ sys.path.insert(0, str(backend_dir))
 # Set environment variables for development
 os.environ.setdefault('PYTHONPATH', str(backend_dir))
 
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def production_options(workers: int) -> dict:
+    """uvicorn settings for serving: worker processes, fast loop and parser, graceful drain"""
+    return {
+        "workers": workers,
+        # Both ship with uvicorn[standard]; fall back rather than fail without them
+        "loop": "uvloop" if _installed("uvloop") else "asyncio",
+        "http": "httptools" if _installed("httptools") else "h11",
+        # On SIGTERM stop accepting, give in-flight requests this long, then
+        # run the shutdown handlers that drain queues and close pools
+        "timeout_graceful_shutdown": int(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", "30")),
+        "timeout_keep_alive": int(os.getenv("KEEP_ALIVE_SECONDS", "5")),
+        "proxy_headers": True,
+        "access_log": os.getenv("ACCESS_LOG", "0").lower() in ("1", "true", "yes"),
+        "log_level": os.getenv("LOG_LEVEL", "info")
+    }
+
 if __name__ == "__main__":
     import uvicorn
-    from main import app
-    
+
+    parser = argparse.ArgumentParser(description="Start the Jipange AI backend")
+    parser.add_argument("--production", action="store_true", default=os.getenv("SERVER_MODE") == "production",
+                        help="Serve with worker processes instead of the auto-reloader (or SERVER_MODE=production)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")),
+                        help="Worker processes in production mode (or WEB_CONCURRENCY)")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    args = parser.parse_args()
+
+    if args.production:
+        options = production_options(args.workers)
+        print(f"🚀 Starting Jipange AI Backend (production, {args.workers} worker(s), {options['loop']}/{options['http']})")
+        print(f"📡 Listening on http://{args.host}:{args.port}")
+        # An import string, so every worker process loads the app itself
+        uvicorn.run("main:app", host=args.host, port=args.port, **options)
+        sys.exit(0)
+
     print("🚀 Starting Jipange AI Backend...")
-    print("📡 Server will be available at: http://localhost:8000")
-    print("📚 API Documentation: http://localhost:8000/docs")
-    print("🔧 Health Check: http://localhost:8000/health")
+    print(f"📡 Server will be available at: http://localhost:{args.port}")
+    print(f"📚 API Documentation: http://localhost:{args.port}/docs")
+    print(f"🔧 Health Check: http://localhost:{args.port}/health")
     print("\n" + "="*50)
-    
+
     uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=8000,
+        "main:app",
+        host=args.host,
+        port=args.port,
         reload=True,
         log_level="info"
     )
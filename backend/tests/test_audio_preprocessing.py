@@ -0,0 +1,46 @@
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from utils.audio_preprocessing import NoSpeechError, audio_filename, decode_wav, preprocess_audio
+
+def wav_bytes(samples: np.ndarray, sample_rate: int, channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes((samples * 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+def tone(seconds: float, sample_rate: int) -> np.ndarray:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+def test_stereo_48k_is_downmixed_and_resampled():
+    stereo = np.repeat(tone(1.0, 48000), 2)
+    output = preprocess_audio(wav_bytes(stereo, 48000, channels=2))
+    with wave.open(io.BytesIO(output), "rb") as wav:
+        assert wav.getnchannels() == 1
+        assert wav.getframerate() == 16000
+
+def test_silence_raises_no_speech():
+    with pytest.raises(NoSpeechError):
+        preprocess_audio(wav_bytes(np.zeros(16000, dtype=np.float32), 16000))
+
+def test_truncated_wav_drops_partial_frame():
+    audio = wav_bytes(np.repeat(tone(0.5, 16000), 2), 16000, channels=2)
+    # Cut the data mid-frame, as an interrupted upload would
+    samples, sample_rate = decode_wav(audio[:-3])
+    assert sample_rate == 16000
+    assert len(samples) == 16000 // 2 - 1
+
+def test_non_wav_input_passes_through_with_its_extension():
+    webm = b"\x1aE\xdf\xa3" + b"\x00" * 2000
+    assert preprocess_audio(webm) == webm
+    assert audio_filename(webm) == "audio.webm"
+    assert audio_filename(b"\x00\x00\x00\x20ftypM4A ") == "audio.m4a"
+    assert audio_filename(b"OggS\x00") == "audio.ogg"
+    assert audio_filename(wav_bytes(tone(0.1, 16000), 16000)) == "audio.wav"
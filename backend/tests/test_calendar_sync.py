@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime
+
+import httpx
+import pytest
+
+from benchmarks.fake_google_calendar import create_app, serve_in_thread
+from utils.calendar_sync import CalendarConnection, CalendarSync, GoogleCalendarClient
+from utils.http_client import HTTPClient
+
+# '#' would start a URL fragment if the id were not quoted
+CALENDAR_ID = "team@example.com#ops"
+
+@pytest.fixture
+def fake_calendar():
+    server, base_url = serve_in_thread(create_app())
+    yield base_url
+    server.should_exit = True
+
+def event(event_id: str, day: int, summary: str = "Meeting"):
+    return {
+        'id': event_id,
+        'summary': summary,
+        'start': {'dateTime': f"2030-01-{day:02d}T09:00:00"},
+        'end': {'dateTime': f"2030-01-{day:02d}T10:00:00"}
+    }
+
+def events_url(base_url: str) -> str:
+    return f"{base_url}/calendars/team%40example.com%23ops/events"
+
+def test_incremental_sync_resumes_from_sync_token(fake_calendar):
+    for day in (1, 2, 3):
+        httpx.post(events_url(fake_calendar), json=event(f"e{day}", day))
+
+    async def scenario():
+        client = HTTPClient()
+        sync = CalendarSync(GoogleCalendarClient(fake_calendar, client=client, page_size=2))
+        sync.connect(CalendarConnection("u1", "token", CALENDAR_ID))
+        try:
+            first = await sync.sync("u1")
+            await asyncio.to_thread(httpx.put, f"{events_url(fake_calendar)}/e2", json=event("e2", 2, "Moved"))
+            await asyncio.to_thread(httpx.delete, f"{events_url(fake_calendar)}/e3")
+            second = await sync.sync("u1")
+            return first, second, sync.store("u1"), sync.stats()
+        finally:
+            await client.close()
+
+    first, second, store, stats = asyncio.run(scenario())
+    assert first.full and len(first.upserted) == 3 and first.events == 3
+    assert not second.full
+    assert [event.id for event in second.upserted] == ["e2"]
+    assert second.removed == ["e3"]
+    assert store.events["e2"].title == "Moved"
+    assert stats['full_syncs'] == 1 and stats['incremental_syncs'] == 1
+
+def test_expired_sync_token_triggers_full_resync(fake_calendar):
+    for day in (1, 2):
+        httpx.post(events_url(fake_calendar), json=event(f"e{day}", day))
+
+    async def scenario():
+        client = HTTPClient()
+        sync = CalendarSync(GoogleCalendarClient(fake_calendar, client=client))
+        sync.connect(CalendarConnection("u1", "token", CALENDAR_ID))
+        try:
+            await sync.sync("u1")
+            # Plant an event the server never had; a full sync must drop it
+            store = sync.store("u1")
+            stale = store.events["e1"]._replace(id="ghost")
+            store.upsert(stale)
+            await asyncio.to_thread(httpx.post, f"{fake_calendar}/_control/calendars/{CALENDAR_ID.replace('#', '%23')}/expire-tokens")
+            result = await sync.sync("u1")
+            return result, store, sync.stats()
+        finally:
+            await client.close()
+
+    result, store, stats = asyncio.run(scenario())
+    assert result.full
+    assert result.removed == ["ghost"]
+    assert sorted(store.events) == ["e1", "e2"]
+    assert stats['expired_tokens'] == 1 and stats['full_syncs'] == 2
+
+def test_store_window_query(fake_calendar):
+    for day in (1, 2, 3):
+        httpx.post(events_url(fake_calendar), json=event(f"e{day}", day))
+
+    async def scenario():
+        client = HTTPClient()
+        sync = CalendarSync(GoogleCalendarClient(fake_calendar, client=client))
+        sync.connect(CalendarConnection("u1", "token", CALENDAR_ID))
+        try:
+            await sync.sync("u1")
+            return sync.store("u1")
+        finally:
+            await client.close()
+
+    store = asyncio.run(scenario())
+    window = store.between(datetime(2030, 1, 2, 9, 30), datetime(2030, 1, 3, 9, 0))
+    assert [event.id for event in window] == ["e2"]
@@ -0,0 +1,35 @@
+from utils.chat_rules import ChatRuleEngine
+from utils.lexicon import load_lexicon
+
+RULES = [
+    {"name": "low", "priority": 1, "keywords": ["plan"], "suggestions": ["l1", "l2"], "actions": [{"type": "plan"}]},
+    {"name": "high", "priority": 10, "keywords": ["task", "todo"], "suggestions": ["h1", "h2"], "actions": [{"type": "create_task"}]},
+    {"name": "mid", "priority": 5, "keywords": ["calendar"], "suggestions": ["m1"]},
+    {"name": "morning", "keywords": ["morning"], "context": {"type": "time_preferences", "data": {"preferred_work_time": "morning"}}},
+    {"name": "evening", "keywords": ["evening"], "context": {"type": "time_preferences", "data": {"preferred_work_time": "evening"}}},
+]
+
+def test_rules_apply_in_priority_order_up_to_the_limits():
+    engine = ChatRuleEngine(RULES)
+    suggestions, actions = engine.suggest("plan my tasks around the calendar")
+    assert suggestions == ["h1", "h2", "m1"]
+    assert actions == [{"type": "create_task"}, {"type": "plan"}]
+
+def test_evaluation_stops_once_limits_are_met():
+    engine = ChatRuleEngine(RULES)
+    engine.suggest("plan my tasks around the calendar", max_suggestions=2, max_actions=1)
+    assert engine.stats() == {"high": 1, "mid": 0, "low": 0, "morning": 0, "evening": 0}
+
+def test_keywords_match_inside_words():
+    assert [rule.name for rule in ChatRuleEngine(RULES).matching_rules("my todos")] == ["high"]
+
+def test_context_updates_take_the_first_matching_rule_per_type():
+    engine = ChatRuleEngine(RULES)
+    updates = engine.context_updates("i work best in the morning, not the evening")
+    assert updates == {"time_preferences": {"preferred_work_time": "morning"}}
+    assert engine.stats()["morning"] == 1
+
+def test_bundled_rules_compile():
+    engine = ChatRuleEngine(load_lexicon("en")["chat_rules"])
+    suggestions, actions = engine.suggest("help me plan tomorrow's tasks")
+    assert 0 < len(suggestions) <= 3 and 0 < len(actions) <= 3
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+import routers.ai as ai
+
+class FakePool:
+    def __init__(self, close_seconds: float = 0.0):
+        self.close_seconds = close_seconds
+        self.acquired = 0
+        self.released = []
+        self.closed = False
+        self.terminated = False
+
+    async def acquire(self):
+        self.acquired += 1
+        return f"conn-{self.acquired}"
+
+    async def release(self, conn):
+        self.released.append(conn)
+
+    async def close(self):
+        await asyncio.sleep(self.close_seconds)
+        self.closed = True
+
+    def terminate(self):
+        self.terminated = True
+
+@pytest.fixture
+def pools(monkeypatch):
+    created = []
+
+    async def create_pool(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        created.append(FakePool(close_seconds=kwargs.get("close_seconds", 0.0)))
+        return created[-1]
+
+    monkeypatch.setattr(ai, "_db_pool", None)
+    monkeypatch.setattr(ai, "_db_pool_lock", None)
+    monkeypatch.setattr(ai.asyncpg, "create_pool", create_pool)
+    return created
+
+def test_concurrent_callers_share_one_pool(pools):
+    async def scenario():
+        conns = await asyncio.gather(*(ai.get_db_connection() for _ in range(5)))
+        for conn in conns:
+            await ai.release_db_connection(conn)
+        return conns
+
+    conns = asyncio.run(scenario())
+    assert len(pools) == 1
+    assert sorted(conns) == sorted(pools[0].released)
+
+def test_close_db_pool_closes_and_forgets_the_pool(pools):
+    async def scenario():
+        await ai.get_db_connection()
+        await ai.close_db_pool()
+        await ai.close_db_pool()
+
+    asyncio.run(scenario())
+    assert pools[0].closed and not pools[0].terminated
+    assert ai._db_pool is None
+
+def test_close_db_pool_terminates_after_the_timeout(pools, monkeypatch):
+    monkeypatch.setattr(ai, "DB_POOL_CLOSE_TIMEOUT_SECONDS", 0.01)
+
+    async def scenario():
+        await ai.get_db_connection()
+        pools[0].close_seconds = 1.0
+        await ai.close_db_pool()
+
+    asyncio.run(scenario())
+    assert pools[0].terminated
+    assert ai._db_pool is None
+
+def test_connection_failure_returns_none(monkeypatch):
+    async def create_pool(*args, **kwargs):
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(ai, "_db_pool", None)
+    monkeypatch.setattr(ai, "_db_pool_lock", None)
+    monkeypatch.setattr(ai.asyncpg, "create_pool", create_pool)
+    assert asyncio.run(ai.get_db_connection()) is None
+    assert ai._db_pool is None
@@ -0,0 +1,30 @@
+import pytest
+
+from routers.ai import enhance_extracted_task
+
+TRANSCRIPT = "call the dentist tomorrow, it should take 30 minutes"
+
+def extracted(**fields):
+    return {"title": "Call the dentist", "priority": "high", "category": "health", "confidence_score": 0.8, **fields}
+
+@pytest.mark.parametrize("tags, expected", [(None, []), ("health", ["health"]), (["health", None], ["health"])])
+def test_tags_that_are_not_a_list_are_cleaned(tags, expected):
+    task = enhance_extracted_task(extracted(tags=tags), TRANSCRIPT)
+    assert task["tags"] == expected
+    assert task["title"] == "Call the dentist"
+
+def test_non_string_title_is_kept_as_text():
+    task = enhance_extracted_task(extracted(title=12345), TRANSCRIPT)
+    assert task["title"] == "12345"
+    assert task["priority"] == "high"
+
+def test_spoken_duration_is_converted_to_minutes():
+    task = enhance_extracted_task(extracted(estimated_duration="30 minutes"), TRANSCRIPT)
+    assert task["estimated_duration"] == 30
+    assert task["priority"] == "high"
+
+def test_unreadable_duration_is_dropped_with_a_warning():
+    task = enhance_extracted_task(extracted(estimated_duration="a while"), "call the dentist tomorrow")
+    assert task["estimated_duration"] is None
+    assert any("a while" in warning for warning in task["warnings"])
+    assert task["title"] == "Call the dentist"
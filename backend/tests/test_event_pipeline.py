@@ -0,0 +1,90 @@
+import asyncio
+
+from utils.event_pipeline import EventPipeline, TTLSet
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_ttl_set_forgets_keys_after_ttl():
+    clock = FakeClock()
+    seen = TTLSet(ttl_seconds=10, clock=clock)
+    assert seen.add("a")
+    assert not seen.add("a")
+    clock.now = 11
+    assert "a" not in seen
+    assert seen.add("a")
+
+def test_ttl_set_evicts_oldest_beyond_max_size():
+    seen = TTLSet(ttl_seconds=60, max_size=2)
+    for key in ("a", "b", "c"):
+        seen.add(key)
+    assert "a" not in seen
+    assert "b" in seen and "c" in seen
+
+def test_duplicates_are_dropped():
+    async def scenario():
+        batches = []
+
+        async def handler(events):
+            batches.append(events)
+
+        pipeline = EventPipeline(handler, max_wait_seconds=0.01)
+        assert pipeline.submit({"n": 1}, event_id="e1")
+        assert not pipeline.submit({"n": 1}, event_id="e1")
+        await pipeline.stop()
+        return batches, pipeline.stats()
+
+    batches, stats = asyncio.run(scenario())
+    assert batches == [[{"n": 1}]]
+    assert stats["duplicates"] == 1
+    assert stats["processed"] == 1
+
+def test_event_dropped_on_full_queue_is_accepted_on_retry():
+    async def scenario():
+        handled = []
+
+        async def handler(events):
+            handled.extend(events)
+
+        pipeline = EventPipeline(handler, max_queue=1, max_wait_seconds=0.01)
+        assert pipeline.submit("first", event_id="e1")
+        # The workers have not run yet, so the queue is still full
+        assert not pipeline.submit("second", event_id="e2")
+        assert "e2" not in pipeline.seen
+        await asyncio.sleep(0.05)
+        assert pipeline.submit("second", event_id="e2")
+        await pipeline.stop()
+        return handled, pipeline.stats()
+
+    handled, stats = asyncio.run(scenario())
+    assert handled == ["first", "second"]
+    assert stats["dropped"] == 1
+
+def test_failed_batch_ids_are_forgotten():
+    async def scenario():
+        calls = []
+
+        async def handler(events):
+            calls.append(list(events))
+            if len(calls) == 1:
+                raise RuntimeError("sink down")
+
+        pipeline = EventPipeline(handler, max_wait_seconds=0.01)
+        pipeline.submit("a", event_id="e1")
+        pipeline.submit("b", event_id="e2")
+        await asyncio.sleep(0.05)
+        assert "e1" not in pipeline.seen and "e2" not in pipeline.seen
+        # The sender's retries get through and are handled
+        assert pipeline.submit("a", event_id="e1")
+        assert pipeline.submit("b", event_id="e2")
+        await pipeline.stop()
+        return calls, pipeline.stats()
+
+    calls, stats = asyncio.run(scenario())
+    assert calls == [["a", "b"], ["a", "b"]]
+    assert stats["failed"] == 2
+    assert stats["processed"] == 2
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+from utils.freebusy import FreeBusyIndex
+
+# A Monday, so the first days of the window are working days
+START = datetime(2030, 1, 7, 0, 0)
+
+def make_index() -> FreeBusyIndex:
+    return FreeBusyIndex(START, days=7, resolution_minutes=15)
+
+def test_slots_skip_busy_time_of_any_user():
+    index = make_index()
+    index.upsert_event("ana", "standup", START.replace(hour=9), START.replace(hour=10))
+    index.upsert_event("ben", "review", START.replace(hour=10), START.replace(hour=11))
+    slots = index.common_free_slots(["ana", "ben"], 60, count=1)
+    assert slots == [(START.replace(hour=11), START.replace(hour=12))]
+
+def test_removed_event_frees_its_time():
+    index = make_index()
+    index.upsert_event("ana", "a", START.replace(hour=9), START.replace(hour=10))
+    index.upsert_event("ana", "b", START.replace(hour=9, minute=30), START.replace(hour=10))
+    index.remove_event("ana", "a")
+    assert index.is_free(["ana"], START.replace(hour=9), START.replace(hour=9, minute=30))
+    assert not index.is_free(["ana"], START.replace(hour=9, minute=30), START.replace(hour=10))
+
+def test_slots_respect_after_and_before():
+    index = make_index()
+    after = START.replace(hour=13)
+    before = START.replace(hour=15)
+    slots = index.common_free_slots(["ana"], 60, count=5, after=after, before=before)
+    assert slots == [(after, after + timedelta(hours=1)), (after + timedelta(hours=1), before)]
+
+def test_before_earlier_than_window_returns_nothing():
+    index = make_index()
+    assert index.common_free_slots(["ana"], 30, before=START - timedelta(days=1)) == []
+    assert index.common_free_slots(["ana"], 30, before=START - timedelta(minutes=30)) == []
+
+def test_after_past_window_returns_nothing():
+    index = make_index()
+    assert index.common_free_slots(["ana"], 30, after=START + timedelta(days=30)) == []
+
+def test_empty_range_returns_nothing():
+    index = make_index()
+    moment = START.replace(hour=10)
+    assert index.common_free_slots(["ana"], 30, after=moment, before=moment) == []
+    assert index.common_free_slots(["ana"], 30, after=moment, before=moment - timedelta(hours=1)) == []
+
+def test_events_outside_window_are_ignored():
+    index = make_index()
+    index.upsert_event("ana", "old", START - timedelta(days=2), START - timedelta(days=1))
+    assert not index.busy_mask(["ana"]).any()
+
+def test_after_between_steps_rounds_up():
+    index = make_index()
+    slots = index.common_free_slots(["ana"], 30, count=1, after=START.replace(hour=10, minute=7))
+    assert slots == [(START.replace(hour=10, minute=15), START.replace(hour=10, minute=45))]
+
+def test_before_between_steps_rounds_down():
+    index = make_index()
+    after = START.replace(hour=10)
+    slots = index.common_free_slots(["ana"], 30, count=5, after=after, before=START.replace(hour=10, minute=59))
+    assert slots == [(after, after + timedelta(minutes=30))]
@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+
+from utils.http_client import HTTPClient, RetryPolicy
+
+# No waiting between attempts
+FAST_RETRY = RetryPolicy(attempts=3, base_delay=0.0, max_delay=0.0)
+
+def test_get_is_retried_on_503():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(503 if len(calls) < 3 else 200)
+
+    async def scenario():
+        client = HTTPClient(retry=FAST_RETRY, transport=httpx.MockTransport(handler))
+        response = await client.get("https://api.example.com/items", integration="example")
+        await client.close()
+        return response, client.stats()
+
+    response, stats = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert calls == ["GET"] * 3
+    assert stats['integrations']['example']['retries'] == 2
+
+def test_post_is_not_retried_on_503():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(503)
+
+    async def scenario():
+        client = HTTPClient(retry=FAST_RETRY, transport=httpx.MockTransport(handler))
+        response = await client.post("https://api.example.com/items", json={})
+        await client.close()
+        return response
+
+    assert asyncio.run(scenario()).status_code == 503
+    assert calls == ["POST"]
+
+def test_integration_concurrency_limit():
+    in_flight = {'now': 0, 'max': 0}
+
+    async def handler(request):
+        in_flight['now'] += 1
+        in_flight['max'] = max(in_flight['max'], in_flight['now'])
+        await asyncio.sleep(0.01)
+        in_flight['now'] -= 1
+        return httpx.Response(200)
+
+    async def scenario():
+        client = HTTPClient(transport=httpx.MockTransport(handler))
+        client.limit("slow", 2)
+        await asyncio.gather(*(client.get("https://slow.example.com/", integration="slow") for _ in range(6)))
+        await client.close()
+
+    asyncio.run(scenario())
+    assert in_flight['max'] == 2
+
+def test_client_from_previous_loop_is_closed():
+    client = HTTPClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+
+    async def fetch():
+        await client.get("https://api.example.com/")
+        return client._client
+
+    first = asyncio.run(fetch())
+    second = asyncio.run(fetch())
+    assert second is not first
+    assert first.is_closed
+    assert not second.is_closed
+    asyncio.run(client.close())
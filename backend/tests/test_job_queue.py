@@ -0,0 +1,74 @@
+import asyncio
+
+from utils.job_queue import JobQueue
+
+def test_burst_for_one_key_becomes_one_call():
+    async def scenario():
+        calls = []
+
+        async def handler(key, payloads):
+            calls.append((key, payloads))
+
+        queue = JobQueue(handler, debounce_seconds=0.02, max_delay_seconds=1.0)
+        for n in range(50):
+            queue.submit("channel-a", n)
+        queue.submit("channel-b", "only")
+        await asyncio.sleep(0.1)
+        await queue.stop()
+        return calls, queue.stats()
+
+    calls, stats = asyncio.run(scenario())
+    assert sorted(calls) == [("channel-a", list(range(50))), ("channel-b", ["only"])]
+    assert stats["submitted"] == 51 and stats["coalesced"] == 49 and stats["processed"] == 2
+
+def test_max_delay_caps_the_debounce():
+    async def scenario():
+        runs = []
+
+        async def handler(key, payloads):
+            runs.append(len(payloads))
+
+        queue = JobQueue(handler, debounce_seconds=0.05, max_delay_seconds=0.1)
+        # Submissions keep arriving inside the debounce window
+        for n in range(12):
+            queue.submit("busy", n)
+            await asyncio.sleep(0.02)
+        await queue.stop()
+        return runs
+
+    runs = asyncio.run(scenario())
+    assert len(runs) >= 2 and sum(runs) == 12
+
+def test_failed_jobs_are_retried_with_later_submissions():
+    async def scenario():
+        attempts = []
+
+        async def handler(key, payloads):
+            attempts.append(list(payloads))
+            if len(attempts) == 1:
+                queue.submit(key, "late")
+                raise RuntimeError("sync failed")
+
+        queue = JobQueue(handler, debounce_seconds=0.01, retry_base_seconds=0.01)
+        queue.submit("channel", "first")
+        await asyncio.sleep(0.1)
+        await queue.stop()
+        return attempts, queue.stats()
+
+    attempts, stats = asyncio.run(scenario())
+    assert attempts == [["first"], ["first", "late"]]
+    assert stats["retried"] == 1 and stats["processed"] == 1
+
+def test_stop_runs_pending_jobs_first():
+    async def scenario():
+        handled = []
+
+        async def handler(key, payloads):
+            handled.append(key)
+
+        queue = JobQueue(handler, debounce_seconds=60)
+        queue.submit("slow-debounce")
+        await queue.stop()
+        return handled
+
+    assert asyncio.run(scenario()) == ["slow-debounce"]
@@ -0,0 +1,17 @@
+from utils.keyword_matcher import KeywordMatcher
+
+def test_only_whole_words_match():
+    matcher = KeywordMatcher(["call", "gym", "next week"])
+    assert matcher.find("recall the gymnastics schedule") == set()
+    assert matcher.find("call the gym next week") == {"call", "gym", "next week"}
+    assert matcher.find("gym, then call.") == {"call", "gym"}
+
+def test_whole_word_found_after_a_partial_hit():
+    assert KeywordMatcher(["call"]).find("recall, then call") == {"call"}
+
+def test_punctuation_keywords_match_anywhere():
+    assert KeywordMatcher(["!!!", "follow-up"]).find("done!!! follow-ups") == {"!!!"}
+
+def test_substring_matching_when_asked():
+    matcher = KeywordMatcher(["min", "task"], whole_words=False)
+    assert matcher.find("30 minutes on tasks") == {"min", "task"}
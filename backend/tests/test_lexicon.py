@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+import utils.lexicon as lexicon_module
+from utils.lexicon import LexiconError, load_lexicon
+
+def test_bundled_english_lexicon_loads_once():
+    lexicon = load_lexicon("en")
+    assert lexicon.names == ("en",)
+    assert "call" in lexicon["common_verbs"]
+    assert lexicon["urgency_indicators"]["urgent"] == 0.9
+    assert load_lexicon("en") is lexicon
+    assert lexicon.matcher("common_verbs") is lexicon.matcher("common_verbs")
+
+def test_sections_are_read_only():
+    lexicon = load_lexicon("en")
+    with pytest.raises(TypeError):
+        lexicon["urgency_indicators"]["urgent"] = 0.1
+
+def test_later_bundles_extend_earlier_ones(tmp_path, monkeypatch):
+    english = json.loads((lexicon_module.LEXICON_DIR / "en.json").read_text(encoding="utf-8"))
+    (tmp_path / "en.json").write_text(json.dumps(english), encoding="utf-8")
+    (tmp_path / "medical.json").write_text(json.dumps({
+        "name": "medical", "version": 1,
+        "lexicons": {"common_verbs": ["refill"], "urgency_indicators": {"stat": 1.0}}
+    }), encoding="utf-8")
+    monkeypatch.setattr(lexicon_module, "LEXICON_DIR", tmp_path)
+
+    lexicon = load_lexicon("en", "medical")
+    assert lexicon.version == f"en@{english['version']}+medical@1"
+    assert "refill" in lexicon["common_verbs"] and "call" in lexicon["common_verbs"]
+    assert lexicon["urgency_indicators"]["stat"] == 1.0
+
+def test_explicit_unknown_bundle_raises():
+    with pytest.raises(LexiconError):
+        load_lexicon("xx-unknown")
+
+@pytest.mark.parametrize("configured", ["en-GB", "xx", "xx, en"])
+def test_configured_unknown_locale_falls_back_to_english(configured, monkeypatch):
+    monkeypatch.setenv("LEXICON_BUNDLES", configured)
+    assert load_lexicon().names == ("en",)
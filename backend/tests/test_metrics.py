@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from utils.metrics import Metrics
+
+def test_render_is_cumulative_prometheus_text():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics.observe("extract", 0.05)
+    metrics.observe("extract", 0.5)
+    metrics.observe("extract", 5.0)
+    lines = metrics.render().splitlines()
+    assert "# TYPE jipange_stage_duration_seconds histogram" in lines
+    assert 'jipange_stage_duration_seconds_bucket{stage="extract",le="0.1"} 1' in lines
+    assert 'jipange_stage_duration_seconds_bucket{stage="extract",le="1"} 2' in lines
+    assert 'jipange_stage_duration_seconds_bucket{stage="extract",le="+Inf"} 3' in lines
+    assert 'jipange_stage_duration_seconds_sum{stage="extract"} 5.550000' in lines
+    assert 'jipange_stage_duration_seconds_count{stage="extract"} 3' in lines
+
+def test_stage_names_are_escaped():
+    metrics = Metrics()
+    metrics.observe('say "hi"', 0.01)
+    assert 'stage="say \\"hi\\""' in metrics.render()
+
+def test_errors_are_counted_per_stage():
+    metrics = Metrics()
+
+    @metrics.timed("transcription")
+    async def transcribe(fail: bool):
+        if fail:
+            raise ValueError("bad audio")
+        return "ok"
+
+    assert asyncio.run(transcribe(False)) == "ok"
+    with pytest.raises(ValueError):
+        asyncio.run(transcribe(True))
+    with pytest.raises(KeyError):
+        with metrics.span("lookup"):
+            raise KeyError("missing")
+
+    lines = metrics.render().splitlines()
+    assert 'jipange_stage_duration_seconds_count{stage="transcription"} 2' in lines
+    assert 'jipange_stage_errors_total{stage="transcription"} 1' in lines
+    assert 'jipange_stage_errors_total{stage="lookup"} 1' in lines
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+
+    @metrics.timed("validation")
+    def validate(value):
+        return value * 2
+
+    assert validate(21) == 42
+    with metrics.span("enhancement"):
+        pass
+    metrics.observe("extract", 1.0)
+    assert metrics.span("a") is metrics.span("b")
+    assert "stage=" not in metrics.render()
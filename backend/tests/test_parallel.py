@@ -0,0 +1,37 @@
+import asyncio
+
+from utils.parallel import ParallelTaskProcessor
+
+def make_batch(size: int):
+    transcripts = ["urgent: call the client about the report", "book a doctor appointment tomorrow", "quick gym workout"]
+    return [
+        ({"title": f"Task {i} for today", "priority": "medium", "category": "work", "confidence_score": 0.5}, transcripts[i % 3])
+        for i in range(size)
+    ]
+
+def test_small_batches_run_inline():
+    processor = ParallelTaskProcessor(max_workers=2, min_batch_size=100)
+    results = processor.validate(make_batch(5))
+    assert len(results) == 5
+    assert processor._pool is None
+
+def test_large_batches_match_inline_results():
+    inline = ParallelTaskProcessor(max_workers=1)
+    parallel = ParallelTaskProcessor(max_workers=2, min_batch_size=10, chunks_per_worker=2)
+    expected_batch, batch = make_batch(40), make_batch(40)
+    try:
+        expected = inline.validate(expected_batch)
+        results = parallel.validate(batch)
+        assert parallel._pool is not None
+        assert [(r.is_valid, r.issues, r.suggestions) for r in results] == [(r.is_valid, r.issues, r.suggestions) for r in expected]
+        # Confidence scores are written back to the caller's tasks
+        assert [task["confidence_score"] for task, _ in batch] == [task["confidence_score"] for task, _ in expected_batch]
+
+        context = {"page_context": "zoom.us"}
+        expected_enhanced = inline.enhance(expected_batch, context)
+        enhanced = asyncio.run(parallel.enhance_async(batch, context))
+        assert enhanced == expected_enhanced
+        assert enhanced[0] is batch[0][0]
+    finally:
+        parallel.shutdown()
+    assert parallel._pool is None
@@ -0,0 +1,50 @@
+import asyncio
+import time
+from collections import Counter
+
+from utils.profiling import PROFILE_HEADER, ProfilingMiddleware, TaskSampler
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+def http_scope(headers=()):
+    return {"type": "http", "method": "GET", "path": "/api/ai/ask", "headers": list(headers)}
+
+def test_requested_by_matching_token_only():
+    middleware = ProfilingMiddleware(ok_app, token="secret")
+    assert middleware._requested(http_scope([(PROFILE_HEADER, b"secret")]))
+    assert not middleware._requested(http_scope([(PROFILE_HEADER, b"guess")]))
+    assert not middleware._requested(http_scope())
+
+def test_requested_by_sample_rate():
+    assert ProfilingMiddleware(ok_app, sample_rate=1.0)._requested(http_scope())
+    assert not ProfilingMiddleware(ok_app, sample_rate=0.0)._requested(http_scope())
+
+def test_collapsed_output_is_folded_stacks_by_count():
+    sampler = TaskSampler.__new__(TaskSampler)
+    sampler.stacks = Counter({("handler (ai.py:1)", "[await]"): 3, ("handler (ai.py:1)", "parse (ai.py:9)"): 1})
+    assert sampler.collapsed() == "handler (ai.py:1);[await] 3\nhandler (ai.py:1);parse (ai.py:9) 1\n"
+
+def test_profiled_request_writes_a_profile(tmp_path):
+    async def slow_app(scope, receive, send):
+        await asyncio.sleep(0.03)
+        time.sleep(0.03)
+        await ok_app(scope, receive, send)
+
+    async def scenario():
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        middleware = ProfilingMiddleware(slow_app, output_dir=str(tmp_path), token="secret", interval_seconds=0.001)
+        await middleware(http_scope([(PROFILE_HEADER, b"secret")]), None, send)
+        return sent, middleware.stats()
+
+    sent, stats = asyncio.run(scenario())
+    profile_id = dict(sent[0]["headers"])[PROFILE_HEADER].decode()
+    collapsed = (tmp_path / f"{profile_id}.collapsed").read_text(encoding="utf-8")
+    assert "[await]" in collapsed
+    assert "slow_app" in collapsed
+    assert stats["profiled"] == 1 and stats["active"] == 0
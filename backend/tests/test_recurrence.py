@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+from itertools import islice
+
+import pytest
+
+from utils.recurrence import RecurrenceIndex, RecurrenceRule, rule_from_task
+
+# A Monday
+START = datetime(2030, 1, 7, 9, 0)
+
+def starts(occurrences):
+    return [occurrence.start for occurrence in occurrences]
+
+def test_weekly_rule_expands_only_inside_the_window():
+    rule = RecurrenceRule(START, "weekly")
+    window = list(rule.occurrences(START + timedelta(days=20), START + timedelta(days=36)))
+    assert window == [START + timedelta(days=21), START + timedelta(days=28), START + timedelta(days=35)]
+
+def test_monthly_rule_clamps_to_short_months():
+    rule = RecurrenceRule(datetime(2030, 1, 31, 8, 0), "monthly")
+    assert list(rule.occurrences(datetime(2030, 1, 1), datetime(2030, 4, 1))) == [
+        datetime(2030, 1, 31, 8, 0), datetime(2030, 2, 28, 8, 0), datetime(2030, 3, 31, 8, 0)
+    ]
+
+def test_weekdays_rule_skips_weekends_and_stops_at_until():
+    rule = RecurrenceRule(START, "weekdays", until=START + timedelta(days=7))
+    assert [moment.weekday() for moment in rule.occurrences(START, START + timedelta(days=30))] == [0, 1, 2, 3, 4, 0]
+
+def test_unbounded_series_is_generated_lazily():
+    rule = RecurrenceRule(START, "daily")
+    assert len(list(islice(rule.occurrences(START, datetime.max), 3))) == 3
+
+def test_skip_and_move_apply_to_single_occurrences():
+    index = RecurrenceIndex()
+    index.set_rule("standup", RecurrenceRule(START, "daily"))
+    index.skip("standup", START + timedelta(days=1))
+    index.move("standup", START + timedelta(days=2), START + timedelta(days=2, hours=3))
+    occurrences = list(index.occurrences("standup", START, START + timedelta(days=4)))
+    assert starts(occurrences) == [START, START + timedelta(days=2, hours=3), START + timedelta(days=3)]
+    assert occurrences[1].moved and occurrences[1].original == START + timedelta(days=2)
+    with pytest.raises(ValueError):
+        index.skip("standup", START + timedelta(hours=1))
+
+def test_expand_merges_tasks_in_start_order():
+    index = RecurrenceIndex()
+    index.set_rule("a", RecurrenceRule(START, "daily"))
+    index.set_rule("b", RecurrenceRule(START + timedelta(hours=1), "weekly"))
+    occurrences = list(index.expand(["a", "b", "missing"], START, START + timedelta(days=2)))
+    assert [(o.task_id, o.start) for o in occurrences] == [
+        ("a", START), ("b", START + timedelta(hours=1)), ("a", START + timedelta(days=1))
+    ]
+
+def test_due_soon_uses_each_tasks_next_occurrence():
+    index = RecurrenceIndex()
+    index.set_rule("daily", RecurrenceRule(START, "daily"))
+    index.set_rule("weekly", RecurrenceRule(START + timedelta(days=3), "weekly"))
+    index.set_rule("once", RecurrenceRule(START - timedelta(days=1)))
+    now = START + timedelta(days=2, hours=1)
+    assert [(o.task_id, o.start) for o in index.due_soon(now, timedelta(days=1))] == [
+        ("daily", START + timedelta(days=3)), ("weekly", START + timedelta(days=3))
+    ]
+    index.remove("daily")
+    assert [o.task_id for o in index.due_soon(now, timedelta(days=1))] == ["weekly"]
+    assert index.next_occurrence("once") is None
+
+def test_rule_from_task():
+    assert rule_from_task({"recurring": "weekly", "due_date": "2030-01-07T09:00:00"}) == RecurrenceRule(START, "weekly")
+    assert rule_from_task({"recurring": "yearly", "due_date": "2030-01-07T09:00:00"}).frequency is None
+    assert rule_from_task({"title": "no dates"}) is None
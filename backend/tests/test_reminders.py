@@ -0,0 +1,102 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+from utils.reminders import MemoryReminderSink, Reminder, ReminderScheduler
+
+NOW = datetime(2030, 1, 15, 9, 0)
+
+class FakeClock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+def reminder(task_id: str, minutes: int) -> Reminder:
+    fire_at = NOW + timedelta(minutes=minutes)
+    return Reminder(task_id, "user", f"Task {task_id}", fire_at, fire_at + timedelta(minutes=10))
+
+def test_pop_due_returns_reminders_in_fire_order():
+    scheduler = ReminderScheduler()
+    for task_id, minutes in (("c", 30), ("a", 10), ("b", 20)):
+        scheduler.schedule(reminder(task_id, minutes))
+    assert [r.task_id for r in scheduler.pop_due(NOW + timedelta(minutes=25))] == ["a", "b"]
+    assert scheduler.next_fire_at() == NOW + timedelta(minutes=30)
+
+def test_rescheduling_and_cancelling_replace_the_pending_reminder():
+    scheduler = ReminderScheduler()
+    scheduler.schedule(reminder("a", 10))
+    scheduler.schedule(reminder("a", 40))
+    scheduler.schedule(reminder("b", 20))
+    assert scheduler.cancel("b")
+    assert not scheduler.cancel("b")
+    assert scheduler.pop_due(NOW + timedelta(minutes=30)) == []
+    assert [r.task_id for r in scheduler.pop_due(NOW + timedelta(minutes=40))] == ["a"]
+    assert len(scheduler) == 0
+
+def test_due_reminders_are_delivered_as_one_batch():
+    clock = FakeClock(NOW)
+    sink = MemoryReminderSink()
+    scheduler = ReminderScheduler(sink=sink, clock=clock)
+    scheduler.schedule(reminder("a", 1))
+    scheduler.schedule(reminder("b", 2))
+    scheduler.schedule(reminder("c", 60))
+    clock.now = NOW + timedelta(minutes=5)
+    assert asyncio.run(scheduler.dispatch_due()) == 2
+    assert [[r.task_id for r in batch] for batch in sink.batches] == [["a", "b"]]
+    assert "c" in scheduler
+
+def test_failed_delivery_is_retried_until_max_attempts():
+    clock = FakeClock(NOW)
+
+    async def failing_sink(batch):
+        raise RuntimeError("push service down")
+
+    scheduler = ReminderScheduler(sink=failing_sink, clock=clock, max_attempts=2, retry_delay=timedelta(seconds=30))
+    scheduler.schedule(reminder("a", 0))
+    assert asyncio.run(scheduler.dispatch_due()) == 0
+    retry = scheduler.get("a")
+    assert retry.attempts == 1 and retry.fire_at == NOW + timedelta(seconds=30)
+    clock.now = retry.fire_at
+    asyncio.run(scheduler.dispatch_due())
+    assert "a" not in scheduler
+
+def test_queue_survives_a_restart(tmp_path):
+    store_path = tmp_path / "data" / "reminders.json"
+    scheduler = ReminderScheduler(store_path=str(store_path))
+    scheduler.schedule(reminder("a", 10))
+    scheduler.schedule(reminder("b", 5))
+    asyncio.run(scheduler.save_async())
+    assert [r["task_id"] for r in json.loads(store_path.read_text())["reminders"]] == ["b", "a"]
+
+    restored = ReminderScheduler(store_path=str(store_path))
+    assert restored.load() == 2
+    assert restored.get("a") == reminder("a", 10)
+    assert restored.get("b") == reminder("b", 5)
+
+def test_older_snapshot_never_overwrites_a_newer_one(tmp_path):
+    store_path = tmp_path / "reminders.json"
+    scheduler = ReminderScheduler(store_path=str(store_path))
+    scheduler.schedule(reminder("a", 10))
+    stale = scheduler._snapshot()
+    scheduler.cancel("a")
+    scheduler.save()
+    scheduler._write(*stale)
+    assert json.loads(store_path.read_text())["reminders"] == []
+
+def test_no_store_path_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scheduler = ReminderScheduler()
+    scheduler.schedule(reminder("a", 10))
+    scheduler.save()
+    assert list(tmp_path.iterdir()) == []
+
+def test_reminders_for_unknown_tasks_are_not_delivered(monkeypatch):
+    from routers import tasks
+
+    sink = MemoryReminderSink()
+    monkeypatch.setattr(tasks, "reminder_sink", sink)
+    monkeypatch.setattr(tasks, "tasks_db", {"a": {"id": "a", "user_id": "user", "title": "Task a"}})
+    asyncio.run(tasks.deliver_reminders([reminder("a", 0), reminder("gone", 0)]))
+    assert [r.task_id for r in sink.delivered] == ["a"]
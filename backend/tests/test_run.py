@@ -0,0 +1,21 @@
+import run
+
+def test_production_options_use_fast_loop_and_parser_when_installed(monkeypatch):
+    monkeypatch.setattr(run, "_installed", lambda module: True)
+    options = run.production_options(4)
+    assert options["workers"] == 4
+    assert (options["loop"], options["http"]) == ("uvloop", "httptools")
+
+def test_production_options_fall_back_without_uvloop_and_httptools(monkeypatch):
+    monkeypatch.setattr(run, "_installed", lambda module: False)
+    options = run.production_options(1)
+    assert (options["loop"], options["http"]) == ("asyncio", "h11")
+
+def test_production_options_read_the_environment(monkeypatch):
+    monkeypatch.setenv("GRACEFUL_SHUTDOWN_SECONDS", "5")
+    monkeypatch.setenv("ACCESS_LOG", "true")
+    monkeypatch.delenv("LOG_LEVEL", raising=False)
+    options = run.production_options(2)
+    assert options["timeout_graceful_shutdown"] == 5
+    assert options["access_log"] is True
+    assert options["log_level"] == "info"
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+from utils.scheduler import TaskScheduler
+
+# A Monday at the start of working hours
+START = datetime(2030, 1, 7, 9, 0)
+
+def test_urgent_tasks_go_before_high_ones():
+    scheduler = TaskScheduler()
+    tasks = [
+        {"id": "high", "title": "High", "priority": "high", "estimated_duration": 60},
+        {"id": "urgent", "title": "Urgent", "priority": "urgent", "estimated_duration": 60},
+        {"id": "low", "title": "Low", "priority": "low", "estimated_duration": 60},
+    ]
+    schedule = scheduler.schedule(tasks, start=START)
+    assert [block.task_id for block in sorted(schedule.blocks, key=lambda block: block.start)] == ["urgent", "high", "low"]
+
+def test_tasks_avoid_busy_events():
+    scheduler = TaskScheduler()
+    events = [{"id": "meeting", "start": "2030-01-07T09:00:00", "end": "2030-01-07T12:00:00"}]
+    schedule = scheduler.schedule([{"id": "t", "title": "T", "estimated_duration": 30}], events, start=START)
+    assert schedule.blocks[0].start == datetime(2030, 1, 7, 12, 0)
+
+def hour(day: int, h: int, m: int = 0) -> datetime:
+    return datetime(2030, 1, 7 + day, h, m)
+
+def blocks_by_id(plan):
+    return {block.task_id: (block.start, block.end) for block in plan.schedule().blocks}
+
+def assert_valid(plan):
+    blocks = sorted(plan.schedule().blocks, key=lambda block: block.start)
+    for block, following in zip(blocks, blocks[1:]):
+        assert block.end <= following.start
+    for block in blocks:
+        assert block.start.hour >= 9 and (block.end.hour, block.end.minute) <= (17, 0)
+
+def test_task_update_only_moves_the_blocks_it_affects():
+    scheduler = TaskScheduler()
+    tasks = [{"id": f"t{i}", "title": f"T{i}", "estimated_duration": 60, "due_date": f"2030-01-{8 + i:02d}"} for i in range(10)]
+    plan = scheduler.plan(tasks, start=START)
+    before = blocks_by_id(plan)
+
+    # Eight hours fill Monday; t8 and t9 share Tuesday's slot
+    change = plan.set_task_instances("t9", [{**tasks[9], "estimated_duration": 120}])
+    after = blocks_by_id(plan)
+    assert [block.task_id for block in change.blocks] == ["t9"]
+    assert {task_id for task_id in after if after[task_id] != before[task_id]} == {"t9"}
+    assert after["t9"] == (hour(1, 10), hour(1, 12))
+    assert_valid(plan)
+
+def test_dropping_a_task_frees_time_for_unscheduled_ones():
+    scheduler = TaskScheduler()
+    end = hour(0, 17)
+    tasks = [
+        {"id": "big", "title": "Big", "priority": "low", "estimated_duration": 420},
+        {"id": "waiting", "title": "Waiting", "priority": "high", "estimated_duration": 120},
+    ]
+    plan = scheduler.plan(tasks[:1], start=START, end=end)
+    change = plan.set_task_instances("waiting", [tasks[1]])
+    assert change.removed == ["waiting"]
+    change = plan.set_task_instances("big", [])
+    assert change.removed == ["big"]
+    assert [block.task_id for block in change.blocks] == ["waiting"]
+    assert plan.schedule().unscheduled == []
+
+def test_event_change_repairs_only_the_days_it_touches():
+    scheduler = TaskScheduler()
+    tasks = [{"id": f"t{i}", "title": f"T{i}", "estimated_duration": 240} for i in range(4)]
+    plan = scheduler.plan(tasks, start=START)
+    before = blocks_by_id(plan)
+    assert before["t0"][0] == hour(0, 9) and before["t2"][0] == hour(1, 9)
+
+    change = plan.upsert_event("standup", hour(0, 9), hour(0, 10))
+    after = blocks_by_id(plan)
+    assert after["t0"][0] == hour(0, 10)
+    assert after["t2"] == before["t2"] and after["t3"] == before["t3"]
+    assert {block.task_id for block in change.blocks} == {task_id for task_id in after if after[task_id] != before[task_id]}
+    assert_valid(plan)
+
+    plan.remove_event("standup")
+    assert blocks_by_id(plan)["t0"][0] == hour(0, 9)
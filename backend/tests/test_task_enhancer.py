@@ -0,0 +1,36 @@
+from datetime import date, timedelta
+
+import pytest
+
+from utils.task_validation import SmartTaskEnhancer
+
+@pytest.mark.parametrize("transcript, minutes", [
+    ("review the slides for 45 minutes", 45),
+    ("gym session, about 2 hours", 120),
+    ("plan the offsite, it takes half hour", 30),
+    ("nothing about time here", None),
+])
+def test_scan_finds_durations(transcript, minutes):
+    assert SmartTaskEnhancer().scan(transcript).duration == minutes
+
+def test_reminder_lead_time_is_not_a_duration():
+    signals = SmartTaskEnhancer().scan("dentist at 3, remind me 30 minutes before")
+    assert signals.reminder_minutes == 30
+    assert signals.duration is None
+
+def test_scan_finds_location_and_recurrence():
+    signals = SmartTaskEnhancer().scan("team sync on zoom every week")
+    assert signals.location == "Video Call"
+    assert signals.recurring == "weekly"
+
+def test_enhance_keeps_values_the_task_already_has():
+    enhancer = SmartTaskEnhancer()
+    task = {"title": "Standup", "estimated_duration": 15, "recurring": "daily"}
+    enhanced = enhancer.enhance_task(task, "standup for 45 minutes every week")
+    assert enhanced["estimated_duration"] == 15
+    assert enhanced["recurring"] == "daily"
+
+def test_enhance_suggests_a_reminder_for_due_tasks():
+    due = (date.today() + timedelta(days=10)).isoformat()
+    enhanced = SmartTaskEnhancer().enhance_task({"title": "Renew passport", "due_date": due}, "renew my passport")
+    assert enhanced["reminder_minutes"] == 1440
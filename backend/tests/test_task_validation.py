@@ -0,0 +1,59 @@
+import pytest
+
+from utils.task_validation import TaskValidator
+
+TRANSCRIPT = "call the plumber for 30 minutes"
+
+def task(duration):
+    return {"title": "Call the plumber", "priority": "medium", "category": "personal", "estimated_duration": duration}
+
+def duration_issues(result):
+    return [issue for issue in result.issues if issue["field"] == "estimated_duration"]
+
+@pytest.mark.parametrize("duration", [30, 30.0, "30", "0", "600"])
+def test_scalar_and_batch_agree_on_durations(duration):
+    validator = TaskValidator()
+    single = validator.validate_task(task(duration), TRANSCRIPT)
+    [batched] = validator.validate_tasks([(task(duration), TRANSCRIPT)])
+    assert duration_issues(single) == duration_issues(batched)
+    assert single.is_valid == batched.is_valid
+
+def test_non_numeric_duration_is_an_issue_on_that_task_only():
+    validator = TaskValidator()
+    single = validator.validate_task(task("half an hour"), TRANSCRIPT)
+    bad, good = validator.validate_tasks([(task("half an hour"), TRANSCRIPT), (task(30), TRANSCRIPT)])
+    assert [issue["message"] for issue in duration_issues(single)] == ["Duration must be a number of minutes"]
+    assert duration_issues(bad) == duration_issues(single)
+    assert not bad.is_valid and not single.is_valid
+    assert good.is_valid and duration_issues(good) == []
+
+def test_urgent_language_suggests_raising_priority():
+    result = TaskValidator().validate_task(
+        {"title": "Fix the login bug", "priority": "low", "category": "work"}, "this is urgent, fix the login bug asap"
+    )
+    assert "Consider increasing priority - your language suggests this is urgent" in result.suggestions
+
+def test_category_keywords_suggest_a_better_category():
+    result = TaskValidator().validate_task(
+        {"title": "Book doctor appointment", "priority": "medium", "category": "work"}, "book a doctor appointment"
+    )
+    assert "Consider changing category to 'health' based on the content" in result.suggestions
+
+def test_keywords_inside_other_words_are_not_hits():
+    # "gymnastics" is not "gym", so nothing points to the health category
+    result = TaskValidator().validate_task(
+        {"title": "Watch gymnastics", "priority": "low", "category": "personal"}, "watch the gymnastics finals"
+    )
+    assert not any("category" in suggestion for suggestion in result.suggestions)
+
+def test_batch_matches_single_task_validation():
+    validator = TaskValidator()
+    batch = [
+        ({"title": "Fix the login bug", "priority": "low", "category": "work"}, "this is urgent, fix the login bug asap"),
+        ({"title": "stuff", "priority": "high", "category": "work"}, "do stuff with my family tomorrow"),
+        ({"title": "Email the client", "priority": "medium", "category": "work", "tags": ["", "x"]}, "email the client about the report"),
+    ]
+    expected = [validator.validate_task(dict(task), transcript) for task, transcript in batch]
+    results = validator.validate_tasks([(dict(task), transcript) for task, transcript in batch])
+    for single, batched in zip(expected, results):
+        assert (single.is_valid, single.issues, single.suggestions) == (batched.is_valid, batched.issues, batched.suggestions)
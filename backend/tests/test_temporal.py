@@ -0,0 +1,21 @@
+from datetime import date, time
+
+from utils.temporal import resolve_temporal, resolve_text
+
+# A Tuesday
+REFERENCE = date(2030, 1, 15)
+
+def test_relative_expressions():
+    assert resolve_temporal("tomorrow at 3pm", REFERENCE) == (date(2030, 1, 16), time(15, 0))
+    assert resolve_temporal("in 3 days", REFERENCE).date == date(2030, 1, 18)
+    assert resolve_temporal("next friday", REFERENCE).date == date(2030, 1, 25)
+
+def test_out_of_range_offsets_resolve_to_nothing():
+    assert resolve_text("in 99999999 days", REFERENCE) is None
+    assert resolve_text("in 99999999 weeks", REFERENCE) is None
+    assert resolve_text("in 99999999 months", REFERENCE) is None
+    assert resolve_text("next year", date(9999, 6, 1)) is None
+
+def test_out_of_range_offset_does_not_hide_later_expressions():
+    resolved = resolve_text("in 99999999 days or tomorrow at 9:30", REFERENCE)
+    assert resolved == (date(2030, 1, 16), time(9, 30))
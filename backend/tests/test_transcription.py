@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+
+from utils.transcription import TranscriptCache, TranscriptionService
+
+def test_cache_evicts_least_recently_used():
+    cache = TranscriptCache(max_entries=2)
+    cache.put("a", "first")
+    cache.put("b", "second")
+    assert cache.get("a") == "first"
+    cache.put("c", "third")
+    assert cache.get("b") is None
+    assert cache.get("a") == "first" and cache.get("c") == "third"
+    assert len(cache) == 2
+
+def test_cache_evicts_by_total_size():
+    cache = TranscriptCache(max_entries=10, max_bytes=10)
+    cache.put("a", "12345")
+    cache.put("b", "12345")
+    cache.put("c", "123")
+    assert cache.get("a") is None
+    assert cache.get("b") == "12345"
+    # Larger than the whole cache: never stored
+    cache.put("d", "x" * 11)
+    assert cache.get("d") is None
+
+def counting_service(delay: float = 0.0) -> TranscriptionService:
+    service = TranscriptionService()
+    service.calls = 0
+    lock = threading.Lock()
+
+    def transcribe_sync(audio_bytes: bytes) -> str:
+        with lock:
+            service.calls += 1
+        time.sleep(delay)
+        return audio_bytes.decode()
+
+    service._transcribe_sync = transcribe_sync
+    return service
+
+def test_repeated_audio_is_answered_from_cache():
+    service = counting_service()
+
+    async def scenario():
+        first = await service.transcribe(b"pay the rent")
+        second = await service.transcribe(b"pay the rent")
+        return first, second
+
+    assert asyncio.run(scenario()) == ("pay the rent", "pay the rent")
+    assert service.calls == 1
+    assert service.cache.hits == 1
+
+def test_concurrent_identical_requests_share_one_transcription():
+    service = counting_service(delay=0.05)
+
+    async def scenario():
+        return await asyncio.gather(*(service.transcribe(b"water the plants") for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["water the plants"] * 5
+    assert service.calls == 1
+    assert service._inflight == {}
+
+def test_failed_transcription_is_not_cached():
+    service = TranscriptionService()
+    attempts = []
+
+    def transcribe_sync(audio_bytes: bytes) -> str:
+        attempts.append(audio_bytes)
+        if len(attempts) == 1:
+            raise RuntimeError("upstream error")
+        return "retried"
+
+    service._transcribe_sync = transcribe_sync
+
+    async def scenario():
+        try:
+            await service.transcribe(b"clip")
+        except RuntimeError:
+            pass
+        return await service.transcribe(b"clip")
+
+    assert asyncio.run(scenario()) == "retried"
+    assert len(attempts) == 2
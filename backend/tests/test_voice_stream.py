@@ -0,0 +1,49 @@
+import asyncio
+
+from utils.voice_stream import VoiceStreamSession
+
+async def transcribe(audio_bytes: bytes) -> str:
+    return audio_bytes.decode()
+
+def run_session(extract, segments):
+    async def scenario():
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        session = VoiceStreamSession(transcribe, extract, send)
+        for segment in segments:
+            session.add_segment(segment)
+        transcript, task = await session.finish()
+        await asyncio.sleep(0)
+        return transcript, task, sent
+
+    return asyncio.run(scenario())
+
+def test_finish_reuses_speculative_extraction():
+    calls = []
+
+    async def extract(transcript):
+        calls.append(transcript)
+        return {"title": transcript}
+
+    transcript, task, sent = run_session(extract, [b"call the dentist"])
+    assert transcript == "call the dentist"
+    assert task == {"title": "call the dentist"}
+    assert calls == ["call the dentist"]
+    assert sent[0]["type"] == "transcript"
+
+def test_finish_extracts_again_when_speculation_failed():
+    calls = []
+
+    async def extract(transcript):
+        calls.append(transcript)
+        if len(calls) == 1:
+            raise RuntimeError("model unavailable")
+        return {"title": transcript}
+
+    transcript, task, sent = run_session(extract, [b"book flights"])
+    assert task == {"title": "book flights"}
+    assert calls == ["book flights", "book flights"]
+    assert not any(message["type"] == "partial_task" for message in sent)
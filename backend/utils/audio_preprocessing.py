@@ -0,0 +1,162 @@
+"""
+Audio preprocessing to shrink clips before they are sent for transcription
+"""
+
+from typing import Optional, Tuple
+import io
+import logging
+import wave
+
+import numpy as np
+
+TARGET_SAMPLE_RATE = 16000
+FRAME_MS = 30
+PADDING_MS = 200
+MIN_SPEECH_MS = 150
+# Frames must be this far above the estimated noise floor to count as speech
+SPEECH_MARGIN_DB = 12.0
+# Frames quieter than this are never speech, however quiet the noise floor is
+ABSOLUTE_FLOOR_DBFS = -50.0
+
+class NoSpeechError(ValueError):
+    """Raised when a clip contains no detectable speech"""
+
+def preprocess_audio(audio_bytes: bytes) -> bytes:
+    """Downmix, resample and trim a PCM WAV clip for transcription
+
+    Returns mono 16-bit WAV bytes at 16 kHz (or lower if the input was). Input that is not PCM WAV (e.g.
+    webm from MediaRecorder) is returned unchanged so the transcription
+    backend can decode it itself. Raises NoSpeechError for silent clips.
+    """
+    decoded = decode_wav(audio_bytes)
+    if decoded is None:
+        return audio_bytes
+
+    samples, sample_rate = decoded
+    # Never upsample narrowband input; it would only add bytes
+    output_rate = min(sample_rate, TARGET_SAMPLE_RATE)
+    samples = resample(samples, sample_rate, output_rate)
+    samples = trim_silence(samples, output_rate)
+
+    return encode_wav(samples, output_rate)
+
+def decode_wav(audio_bytes: bytes) -> Optional[Tuple[np.ndarray, int]]:
+    """Decode PCM WAV bytes into mono float32 samples in [-1, 1]"""
+    try:
+        with wave.open(io.BytesIO(audio_bytes), "rb") as wav:
+            channels = wav.getnchannels()
+            sample_width = wav.getsampwidth()
+            sample_rate = wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError, ValueError) as e:
+        logging.info(f"Skipping audio preprocessing for non-PCM input: {e}")
+        return None
+
+    # Truncated uploads can end mid-frame; drop the partial frame
+    frame_size = channels * sample_width
+    if frame_size == 0:
+        return None
+    frames = frames[:len(frames) - len(frames) % frame_size]
+
+    if sample_width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+    elif sample_width == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        packed = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        packed = np.where(packed & 0x800000, packed - 0x1000000, packed)
+        samples = packed.astype(np.float32) / 8388608.0
+    elif sample_width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        return None
+
+    # Downmix by averaging channels
+    if channels > 1:
+        samples = samples[:len(samples) - len(samples) % channels]
+        samples = samples.reshape(-1, channels).mean(axis=1)
+
+    return samples, sample_rate
+
+# Leading bytes of the containers browsers and phones record in
+AUDIO_SIGNATURES = (
+    (0, b"RIFF", "wav"),
+    (0, b"\x1aE\xdf\xa3", "webm"),
+    (0, b"OggS", "ogg"),
+    (0, b"fLaC", "flac"),
+    (0, b"ID3", "mp3"),
+    (4, b"ftyp", "m4a"),
+)
+
+def audio_filename(audio_bytes: bytes) -> str:
+    """Upload name whose extension matches the audio's container, defaulting to WAV"""
+    for offset, signature, extension in AUDIO_SIGNATURES:
+        if audio_bytes[offset:offset + len(signature)] == signature:
+            return f"audio.{extension}"
+    # MPEG audio frames without an ID3 tag start with an 11-bit sync word
+    if len(audio_bytes) > 1 and audio_bytes[0] == 0xFF and audio_bytes[1] & 0xE0 == 0xE0:
+        return "audio.mp3"
+    return "audio.wav"
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Resample to the target rate with a box low-pass and linear interpolation"""
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+
+    if source_rate > target_rate:
+        ratio = source_rate / target_rate
+        if ratio.is_integer():
+            # Integer ratios (48k -> 16k) decimate by averaging each group
+            step = int(ratio)
+            usable = len(samples) - len(samples) % step
+            return samples[:usable].reshape(-1, step).mean(axis=1)
+
+        width = int(np.ceil(ratio))
+        samples = np.convolve(samples, np.ones(width, dtype=np.float32) / width, mode="same")
+
+    duration = len(samples) / source_rate
+    target_length = max(1, int(round(duration * target_rate)))
+    source_times = np.arange(len(samples)) / source_rate
+    target_times = np.arange(target_length) / target_rate
+    return np.interp(target_times, source_times, samples).astype(np.float32)
+
+def trim_silence(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Trim leading and trailing silence using frame energy
+
+    Raises NoSpeechError if too few frames rise above the noise floor.
+    """
+    frame_length = sample_rate * FRAME_MS // 1000
+    frame_count = len(samples) // frame_length
+    if frame_count == 0:
+        raise NoSpeechError("No speech detected in audio")
+
+    frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+    energy_db = 10.0 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+
+    # Clips that are speech throughout have no quiet frames to estimate the
+    # noise floor from, so never require more than the margin below the peak
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = min(noise_floor + SPEECH_MARGIN_DB, energy_db.max() - SPEECH_MARGIN_DB)
+    threshold = max(threshold, ABSOLUTE_FLOOR_DBFS)
+    speech_frames = np.flatnonzero(energy_db > threshold)
+
+    if len(speech_frames) * FRAME_MS < MIN_SPEECH_MS:
+        raise NoSpeechError("No speech detected in audio")
+
+    padding = sample_rate * PADDING_MS // 1000
+    start = max(0, speech_frames[0] * frame_length - padding)
+    end = min(len(samples), (speech_frames[-1] + 1) * frame_length + padding)
+    return samples[start:end]
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Encode mono float samples as 16-bit PCM WAV"""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
@@ -0,0 +1,268 @@
+"""
+Local calendar event store kept current with incremental Google Calendar sync
+"""
+
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+import asyncio
+import logging
+
+from utils.http_client import HTTPClient, http_client
+from utils.temporal import parse_datetime
+
+# Events at most this long are indexed by start time; longer ones are scanned
+LONG_EVENT = timedelta(days=1)
+
+class StoredEvent(NamedTuple):
+    id: str
+    title: str
+    start: datetime
+    end: datetime
+    attendees: Tuple[str, ...] = ()
+    location: Optional[str] = None
+    updated: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'title': self.title,
+            'start': self.start.isoformat(),
+            'end': self.end.isoformat(),
+            'attendees': list(self.attendees),
+            'location': self.location,
+            'updated': self.updated
+        }
+
+    @classmethod
+    def from_google(cls, item: Mapping[str, Any]) -> Optional["StoredEvent"]:
+        """Event from a Calendar API resource; None if it is cancelled or has no usable times"""
+        if item.get('status') == 'cancelled':
+            return None
+        start, end = item.get('start') or {}, item.get('end') or {}
+        # All-day events carry a date, timed ones a dateTime
+        start = parse_datetime(start.get('dateTime') or start.get('date'))
+        end = parse_datetime(end.get('dateTime') or end.get('date'))
+        if start is None or end is None or end <= start:
+            return None
+        return cls(
+            id=item['id'],
+            title=item.get('summary') or "",
+            start=start,
+            end=end,
+            attendees=tuple(attendee['email'] for attendee in item.get('attendees', []) if attendee.get('email')),
+            location=item.get('location'),
+            updated=item.get('updated')
+        )
+
+class EventStore:
+    """One user's calendar events with an index for window queries
+
+    Events up to LONG_EVENT long sit in a list sorted by start, so a window
+    query bisects to the first event that could still be running at the
+    window start and stops at the window end. The few longer events are
+    checked one by one.
+    """
+
+    def __init__(self):
+        self.events: Dict[str, StoredEvent] = {}
+        self.sync_token: Optional[str] = None
+        self.synced_at: Optional[datetime] = None
+        self._starts: List[Tuple[datetime, str]] = []
+        self._long: Dict[str, StoredEvent] = {}
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def upsert(self, event: StoredEvent) -> bool:
+        """Add or replace an event; False if it was already stored unchanged"""
+        previous = self.events.get(event.id)
+        if previous == event:
+            return False
+        if previous is not None:
+            self._unindex(previous)
+        self.events[event.id] = event
+        if event.end - event.start > LONG_EVENT:
+            self._long[event.id] = event
+        else:
+            insort(self._starts, (event.start, event.id))
+        return True
+
+    def remove(self, event_id: str) -> Optional[StoredEvent]:
+        event = self.events.pop(event_id, None)
+        if event is not None:
+            self._unindex(event)
+        return event
+
+    def _unindex(self, event: StoredEvent):
+        if self._long.pop(event.id, None) is None:
+            del self._starts[bisect_left(self._starts, (event.start, event.id))]
+
+    def between(self, window_start: datetime, window_end: datetime) -> List[StoredEvent]:
+        """Events overlapping [window_start, window_end), by start time"""
+        first = bisect_left(self._starts, (window_start - LONG_EVENT,))
+        last = bisect_left(self._starts, (window_end,))
+        found = [
+            event
+            for event in (self.events[event_id] for _, event_id in self._starts[first:last])
+            if event.end > window_start
+        ]
+        long_events = [event for event in self._long.values() if event.start < window_end and event.end > window_start]
+        if long_events:
+            found = sorted(found + long_events, key=lambda event: (event.start, event.id))
+        return found
+
+class SyncTokenExpired(Exception):
+    """The server no longer accepts the sync token; a full sync is needed"""
+
+class CalendarPage(NamedTuple):
+    items: List[Dict[str, Any]]
+    next_page_token: Optional[str]
+    next_sync_token: Optional[str]
+
+class GoogleCalendarClient:
+    """Minimal events.list client for the Calendar API, or a local fake of it"""
+
+    INTEGRATION = "google_calendar"
+
+    def __init__(self, base_url: str = "https://www.googleapis.com/calendar/v3", client: HTTPClient = http_client, page_size: int = 250):
+        self.base_url = base_url.rstrip('/')
+        self.client = client
+        self.page_size = page_size
+
+    async def list_events(
+        self,
+        access_token: str,
+        calendar_id: str = "primary",
+        sync_token: Optional[str] = None,
+        page_token: Optional[str] = None
+    ) -> CalendarPage:
+        params = {'maxResults': self.page_size, 'singleEvents': 'true'}
+        if sync_token:
+            params['syncToken'] = sync_token
+        if page_token:
+            params['pageToken'] = page_token
+        response = await self.client.get(
+            # Calendar ids are often email addresses and may contain '#'
+            f"{self.base_url}/calendars/{quote(calendar_id, safe='')}/events",
+            integration=self.INTEGRATION,
+            params=params,
+            headers={'Authorization': f"Bearer {access_token}"}
+        )
+        if response.status_code == 410:
+            raise SyncTokenExpired(calendar_id)
+        response.raise_for_status()
+        body = response.json()
+        return CalendarPage(body.get('items', []), body.get('nextPageToken'), body.get('nextSyncToken'))
+
+class CalendarConnection(NamedTuple):
+    user_id: str
+    access_token: str
+    calendar_id: str = "primary"
+    channel_id: Optional[str] = None
+
+class SyncResult(NamedTuple):
+    user_id: str
+    full: bool
+    upserted: List[StoredEvent]
+    removed: List[str]
+    events: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'user_id': self.user_id,
+            'full_sync': self.full,
+            'upserted': len(self.upserted),
+            'removed': len(self.removed),
+            'events': self.events
+        }
+
+class CalendarSync:
+    """Per-user event stores fed by full and incremental calendar syncs
+
+    The first sync for a user lists every event and keeps the sync token
+    from the last page. Later syncs send that token and receive only the
+    events changed since, with deletions marked cancelled. When the server
+    rejects the token (410 Gone) the user gets a full sync again, and
+    whatever is missing from it is removed. Pages are collected before
+    anything is applied, so a failed sync leaves the store and token as
+    they were and can simply be retried.
+    """
+
+    def __init__(self, client: GoogleCalendarClient):
+        self.client = client
+        self.connections: Dict[str, CalendarConnection] = {}
+        self.stores: Dict[str, EventStore] = {}
+        self._channels: Dict[str, str] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._stats = {'full_syncs': 0, 'incremental_syncs': 0, 'expired_tokens': 0, 'pages': 0}
+
+    def connect(self, connection: CalendarConnection):
+        previous = self.connections.get(connection.user_id)
+        if previous is not None and previous.channel_id:
+            self._channels.pop(previous.channel_id, None)
+        if previous is None or previous.calendar_id != connection.calendar_id:
+            self.stores[connection.user_id] = EventStore()
+        self.connections[connection.user_id] = connection
+        if connection.channel_id:
+            self._channels[connection.channel_id] = connection.user_id
+
+    def user_for_channel(self, channel_id: str) -> Optional[str]:
+        return self._channels.get(channel_id)
+
+    def store(self, user_id: str) -> Optional[EventStore]:
+        return self.stores.get(user_id)
+
+    async def _fetch(self, connection: CalendarConnection, sync_token: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        items, page_token = [], None
+        while True:
+            page = await self.client.list_events(connection.access_token, connection.calendar_id, sync_token, page_token)
+            self._stats['pages'] += 1
+            items.extend(page.items)
+            if not page.next_page_token:
+                return items, page.next_sync_token
+            page_token = page.next_page_token
+
+    async def sync(self, user_id: str) -> SyncResult:
+        """Bring the user's store up to date; raises KeyError for unknown users"""
+        connection = self.connections[user_id]
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            store = self.stores[user_id]
+            full = store.sync_token is None
+            try:
+                items, sync_token = await self._fetch(connection, store.sync_token)
+            except SyncTokenExpired:
+                logging.info(f"Calendar sync token expired for {user_id}, running a full sync")
+                self._stats['expired_tokens'] += 1
+                full = True
+                items, sync_token = await self._fetch(connection, None)
+
+            upserted, removed = [], []
+            seen = set()
+            for item in items:
+                event = StoredEvent.from_google(item)
+                if event is None:
+                    if store.remove(item.get('id')) is not None:
+                        removed.append(item['id'])
+                    continue
+                seen.add(event.id)
+                if store.upsert(event):
+                    upserted.append(event)
+            if full:
+                for event_id in [event_id for event_id in store.events if event_id not in seen]:
+                    store.remove(event_id)
+                    removed.append(event_id)
+
+            store.sync_token = sync_token
+            store.synced_at = datetime.now()
+            self._stats['full_syncs' if full else 'incremental_syncs'] += 1
+            return SyncResult(user_id, full, upserted, removed, len(store))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self._stats,
+            'users': len(self.connections),
+            'events': sum(len(store) for store in self.stores.values())
+        }
@@ -0,0 +1,101 @@
+"""
+Declarative chat rules compiled into a single keyword matcher
+"""
+
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.transcript_analysis import TranscriptAnalysis
+
+class ChatRule(NamedTuple):
+    """One row of the rule table"""
+    name: str
+    keywords: Tuple[str, ...]
+    priority: int = 0
+    suggestions: Tuple[str, ...] = ()
+    actions: Tuple[Mapping[str, str], ...] = ()
+    # (context_type, context_data) recorded for the user when the rule fires
+    context: Optional[Tuple[str, Mapping[str, Any]]] = None
+
+    @classmethod
+    def from_mapping(cls, rule: Mapping[str, Any]) -> "ChatRule":
+        context = rule.get('context')
+        return cls(
+            name=rule['name'],
+            keywords=tuple(keyword.lower() for keyword in rule['keywords']),
+            priority=rule.get('priority', 0),
+            suggestions=tuple(rule.get('suggestions', ())),
+            actions=tuple(rule.get('actions', ())),
+            context=(context['type'], context['data']) if context else None
+        )
+
+class ChatRuleEngine:
+    """Evaluate a rule table against chat messages
+
+    All rule keywords share one Aho-Corasick matcher, so a message is scanned
+    once however many rules there are, and only rules whose keywords occur
+    are looked at. Matching rules are applied in priority order (highest
+    first, then table order) and evaluation stops as soon as the suggestion
+    and action limits are met. hit_counts records how often each rule fired.
+    """
+
+    def __init__(self, rules: Iterable[Union[ChatRule, Mapping[str, Any]]]):
+        rules = [rule if isinstance(rule, ChatRule) else ChatRule.from_mapping(rule) for rule in rules]
+        # Position in this list is the evaluation order
+        self.rules: List[ChatRule] = sorted(rules, key=lambda rule: -rule.priority)
+
+        self._rules_by_keyword: Dict[str, List[int]] = defaultdict(list)
+        for index, rule in enumerate(self.rules):
+            for keyword in rule.keywords:
+                self._rules_by_keyword[keyword].append(index)
+        # Rule keywords match inside words ("tasks", "scheduling"), as the
+        # original chat replies did
+        self.matcher = KeywordMatcher(self._rules_by_keyword, whole_words=False)
+
+        self.hit_counts: Counter = Counter()
+
+    def matching_rules(self, message: Union[str, TranscriptAnalysis]) -> List[ChatRule]:
+        """Rules with at least one keyword in the message, in evaluation order"""
+        hits = TranscriptAnalysis.of(message).keyword_hits(self.matcher)
+        indices = {index for keyword in hits for index in self._rules_by_keyword[keyword]}
+        return [self.rules[index] for index in sorted(indices)]
+
+    def suggest(
+        self,
+        message: Union[str, TranscriptAnalysis],
+        max_suggestions: int = 3,
+        max_actions: int = 3
+    ) -> Tuple[List[str], List[Dict[str, str]]]:
+        """Suggestions and actions from the highest-priority matching rules"""
+        suggestions: List[str] = []
+        actions: List[Dict[str, str]] = []
+
+        for rule in self.matching_rules(message):
+            if len(suggestions) >= max_suggestions and len(actions) >= max_actions:
+                break
+            if not rule.suggestions and not rule.actions:
+                continue
+
+            self.hit_counts[rule.name] += 1
+            suggestions.extend(rule.suggestions[:max_suggestions - len(suggestions)])
+            actions.extend(dict(action) for action in rule.actions[:max_actions - len(actions)])
+
+        return suggestions, actions
+
+    def context_updates(self, message: Union[str, TranscriptAnalysis]) -> Dict[str, Dict[str, Any]]:
+        """User context changes implied by the message; per context type the highest-priority rule wins"""
+        updates: Dict[str, Dict[str, Any]] = {}
+
+        for rule in self.matching_rules(message):
+            if rule.context is None or rule.context[0] in updates:
+                continue
+            self.hit_counts[rule.name] += 1
+            context_type, context_data = rule.context
+            updates[context_type] = dict(context_data)
+
+        return updates
+
+    def stats(self) -> Dict[str, int]:
+        """Hit count of every rule, including rules that never fired"""
+        return {rule.name: self.hit_counts[rule.name] for rule in self.rules}
@@ -0,0 +1,181 @@
+"""
+Fast-ack event ingestion: TTL deduplication, a bounded queue and micro-batching workers
+"""
+
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+# Called with up to max_batch events, in arrival order
+BatchHandler = Callable[[List[Any]], Awaitable[None]]
+
+class TTLSet:
+    """Recently seen keys, forgotten after ttl_seconds or when more than max_size are held
+
+    Keys are kept in insertion order, so expiry and eviction only ever pop
+    from the front.
+    """
+
+    def __init__(self, ttl_seconds: float = 600.0, max_size: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.clock = clock
+        self._expires: "OrderedDict[Hashable, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def __contains__(self, key: Hashable) -> bool:
+        expires = self._expires.get(key)
+        return expires is not None and expires > self.clock()
+
+    def add(self, key: Hashable) -> bool:
+        """Remember key; False if it was already seen within the TTL"""
+        now = self.clock()
+        while self._expires:
+            oldest, expires = next(iter(self._expires.items()))
+            if expires > now:
+                break
+            del self._expires[oldest]
+        if key in self._expires:
+            return False
+        self._expires[key] = now + self.ttl_seconds
+        if len(self._expires) > self.max_size:
+            self._expires.popitem(last=False)
+        return True
+
+    def discard(self, key: Hashable):
+        """Forget key, so it is accepted again"""
+        self._expires.pop(key, None)
+
+class EventPipeline:
+    """Accept events in constant time and process them later in small batches
+
+    submit() drops events whose id was already seen, puts the rest on a
+    bounded queue and returns, so a webhook can acknowledge immediately.
+    Workers take the first waiting event, then keep collecting for up to
+    max_wait_seconds or until max_batch events, and hand the batch to the
+    handler. Queue lag (enqueue to batch start) is kept for the most recent
+    events so the stats show how far behind the workers are.
+
+    An id only stays marked as seen once its event has been handled: when
+    the queue is full or the handler raises, the ids are forgotten again so
+    the sender's own retry is accepted instead of being taken for a
+    duplicate.
+    """
+
+    def __init__(
+        self,
+        handler: BatchHandler,
+        name: str = "events",
+        workers: int = 2,
+        max_batch: int = 32,
+        max_wait_seconds: float = 0.05,
+        max_queue: int = 10_000,
+        dedupe_ttl_seconds: float = 600.0,
+        dedupe_max_size: int = 100_000
+    ):
+        self.handler = handler
+        self.name = name
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_wait_seconds = max_wait_seconds
+        self.max_queue = max_queue
+        self.seen = TTLSet(dedupe_ttl_seconds, dedupe_max_size)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._lags: Deque[float] = deque(maxlen=1000)
+        self._stats = {'received': 0, 'duplicates': 0, 'dropped': 0, 'processed': 0, 'failed': 0, 'batches': 0}
+
+    def start(self):
+        """Start the workers on the running event loop"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(self.max_queue)
+        loop = asyncio.get_running_loop()
+        self._workers = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+    def submit(self, event: Any, event_id: Optional[Hashable] = None) -> bool:
+        """Queue an event; False if it is a duplicate or the queue is full"""
+        if not self._workers:
+            self.start()
+        self._stats['received'] += 1
+        if event_id is not None and not self.seen.add(event_id):
+            self._stats['duplicates'] += 1
+            return False
+        try:
+            self._queue.put_nowait((time.monotonic(), event, event_id))
+            return True
+        except asyncio.QueueFull:
+            if event_id is not None:
+                self.seen.discard(event_id)
+            self._stats['dropped'] += 1
+            logging.error(f"{self.name}: queue full, dropping event {event_id}")
+            return False
+
+    async def _next_batch(self) -> List[Tuple[float, Any, Optional[Hashable]]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_seconds
+        while len(batch) < self.max_batch:
+            if self._queue.empty():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            else:
+                batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _work(self):
+        while True:
+            batch = await self._next_batch()
+            started = time.monotonic()
+            self._lags.extend(started - enqueued_at for enqueued_at, _, _ in batch)
+            try:
+                await self.handler([event for _, event, _ in batch])
+                self._stats['processed'] += len(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats['failed'] += len(batch)
+                for _, _, event_id in batch:
+                    if event_id is not None:
+                        self.seen.discard(event_id)
+                logging.error(f"{self.name}: batch of {len(batch)} failed, its events will be accepted again: {e}")
+            finally:
+                self._stats['batches'] += 1
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def stop(self, timeout: Optional[float] = 10.0):
+        """Process what is queued, then stop the workers"""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logging.error(f"{self.name}: dropping {self._queue.qsize()} queued events on shutdown")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def stats(self) -> Dict[str, Any]:
+        lags = sorted(self._lags)
+        received = self._stats['received']
+        return {
+            **self._stats,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'dedupe_hit_rate': round(self._stats['duplicates'] / received, 4) if received else 0.0,
+            'dedupe_keys': len(self.seen),
+            'lag_ms_p50': round(lags[len(lags) // 2] * 1000, 2) if lags else 0.0,
+            'lag_ms_p99': round(lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000, 2) if lags else 0.0,
+            'lag_ms_max': round(lags[-1] * 1000, 2) if lags else 0.0
+        }
@@ -0,0 +1,210 @@
+"""
+Bitmap free/busy index for multi-user availability queries
+"""
+
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.scheduler import ScheduledBlock
+from utils.temporal import to_naive
+
+MINUTES_PER_DAY = 24 * 60
+
+# Event ids of scheduled task blocks, so a new plan can replace the old one
+TASK_EVENT_PREFIX = "task:"
+
+class FreeBusyIndex:
+    """Per-user busy bitmaps over a rolling window of days
+
+    Each user's window is a row of bits, one per resolution step, packed
+    eight to a byte. Alongside it a row of counters records how many events
+    cover each step, so overlapping events can be added and removed
+    independently: an event only touches the counters and packed bytes in
+    its own span. A common-availability query ORs the rows of the requested
+    users, so its cost is one pass over a few hundred bytes per user.
+    """
+
+    def __init__(
+        self,
+        start: datetime,
+        days: int = 14,
+        resolution_minutes: int = 15,
+        work_start: time = time(9, 0),
+        work_end: time = time(17, 0),
+        workdays: Iterable[int] = (0, 1, 2, 3, 4)
+    ):
+        if MINUTES_PER_DAY % resolution_minutes:
+            raise ValueError("Resolution must divide a day evenly")
+        self.resolution = resolution_minutes
+        self.days = days
+        self.size = days * MINUTES_PER_DAY // resolution_minutes
+        self.work_start = work_start
+        self.work_end = work_end
+        self.workdays = tuple(workdays)
+
+        self._rows: Dict[str, int] = {}
+        self._counts = np.zeros((0, self.size), dtype=np.uint16)
+        self._bits = np.zeros((0, (self.size + 7) // 8), dtype=np.uint8)
+        # Source of truth for rebuilding when the window moves
+        self._events: Dict[str, Dict[str, Tuple[datetime, datetime]]] = {}
+        self._reset_window(to_naive(start))
+
+    def _reset_window(self, start: datetime):
+        self.start = start.replace(second=0, microsecond=0) - timedelta(minutes=start.minute % self.resolution)
+        self.end = self.start + timedelta(days=self.days)
+
+        # Steps that lie wholly inside working hours on a working day
+        minutes = self.start.hour * 60 + self.start.minute + np.arange(self.size) * self.resolution
+        minute_of_day = minutes % MINUTES_PER_DAY
+        weekday = (self.start.weekday() + minutes // MINUTES_PER_DAY) % 7
+        self._working = (
+            np.isin(weekday, self.workdays)
+            & (minute_of_day >= self.work_start.hour * 60 + self.work_start.minute)
+            & (minute_of_day + self.resolution <= self.work_end.hour * 60 + self.work_end.minute)
+        )
+
+        self._counts[:] = 0
+        self._bits[:] = 0
+        for user_id, events in self._events.items():
+            row = self._rows[user_id]
+            for event_start, event_end in events.values():
+                self._apply(row, event_start, event_end, 1)
+
+    def advance(self, start: datetime):
+        """Move the window to begin at start, dropping events that ended before it"""
+        start = to_naive(start)
+        if start == self.start:
+            return
+        for events in self._events.values():
+            for event_id in [event_id for event_id, (_, event_end) in events.items() if event_end <= start]:
+                del events[event_id]
+        self._reset_window(start)
+
+    def _row(self, user_id: str) -> int:
+        row = self._rows.get(user_id)
+        if row is None:
+            row = len(self._rows)
+            if row == len(self._counts):
+                capacity = max(8, 2 * row)
+                self._counts = np.concatenate([self._counts, np.zeros((capacity - row, self.size), dtype=np.uint16)])
+                self._bits = np.concatenate([self._bits, np.zeros((capacity - row, self._bits.shape[1]), dtype=np.uint8)])
+            self._rows[user_id] = row
+            self._events[user_id] = {}
+        return row
+
+    def _span(self, start: datetime, end: datetime) -> Tuple[int, int]:
+        """Steps covered by [start, end), clipped to the window"""
+        first = int((start - self.start).total_seconds() // (self.resolution * 60))
+        last = int(-(-(end - self.start).total_seconds() // (self.resolution * 60)))
+        return min(max(first, 0), self.size), max(min(last, self.size), 0)
+
+    def _apply(self, row: int, start: datetime, end: datetime, delta: int):
+        first, last = self._span(start, end)
+        if first >= last:
+            return
+        if delta > 0:
+            self._counts[row, first:last] += 1
+        else:
+            self._counts[row, first:last] -= 1
+        # Repack only the bytes holding the changed steps
+        byte_first, byte_last = first // 8, (last + 7) // 8
+        self._bits[row, byte_first:byte_last] = np.packbits(self._counts[row, byte_first * 8:byte_last * 8] > 0)
+
+    def upsert_event(self, user_id: str, event_id: str, start: datetime, end: datetime):
+        """Add an event, or move it if the id is already known"""
+        row = self._row(user_id)
+        start, end = to_naive(start), to_naive(end)
+        previous = self._events[user_id].get(event_id)
+        if previous == (start, end):
+            return
+        if previous is not None:
+            self._apply(row, *previous, -1)
+        self._events[user_id][event_id] = (start, end)
+        self._apply(row, start, end, 1)
+
+    def remove_event(self, user_id: str, event_id: str) -> bool:
+        """Remove an event; False if it wasn't known"""
+        previous = self._events.get(user_id, {}).pop(event_id, None)
+        if previous is None:
+            return False
+        self._apply(self._rows[user_id], *previous, -1)
+        return True
+
+    def set_task_blocks(self, user_id: str, blocks: Iterable[ScheduledBlock]):
+        """Replace the user's scheduled task blocks with a new plan"""
+        blocks = {f"{TASK_EVENT_PREFIX}{block.task_id}": block for block in blocks}
+        stale = [event_id for event_id in self._events.get(user_id, {}) if event_id.startswith(TASK_EVENT_PREFIX) and event_id not in blocks]
+        for event_id in stale:
+            self.remove_event(user_id, event_id)
+        for event_id, block in blocks.items():
+            self.upsert_event(user_id, event_id, block.start, block.end)
+
+    def calendar_events(self, user_id: str) -> List[Dict[str, str]]:
+        """The user's known calendar events, excluding scheduled task blocks"""
+        return [
+            {'id': event_id, 'start': start.isoformat(), 'end': end.isoformat()}
+            for event_id, (start, end) in self._events.get(user_id, {}).items()
+            if not event_id.startswith(TASK_EVENT_PREFIX)
+        ]
+
+    def busy_mask(self, user_ids: Iterable[str]) -> np.ndarray:
+        """Steps where any of the users is busy; unknown users are always free"""
+        rows = [self._rows[user_id] for user_id in user_ids if user_id in self._rows]
+        if not rows:
+            return np.zeros(self.size, dtype=bool)
+        packed = np.bitwise_or.reduce(self._bits[rows], axis=0)
+        return np.unpackbits(packed, count=self.size).astype(bool)
+
+    def is_free(self, user_ids: Iterable[str], start: datetime, end: datetime) -> bool:
+        """Whether every user is free for the whole of [start, end) within the window"""
+        first, last = self._span(to_naive(start), to_naive(end))
+        return first < last and not self.busy_mask(user_ids)[first:last].any()
+
+    def common_free_slots(
+        self,
+        user_ids: Iterable[str],
+        duration_minutes: int,
+        count: int = 5,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+        working_hours_only: bool = True
+    ) -> List[Tuple[datetime, datetime]]:
+        """The first count non-overlapping slots of duration_minutes when all users are free"""
+        if after is not None and before is not None and to_naive(before) <= to_naive(after):
+            return []
+        length = max(1, -(-duration_minutes // self.resolution))
+        free = ~self.busy_mask(user_ids)
+        if working_hours_only:
+            free &= self._working
+        # Only whole steps inside [after, before) count: a step that started
+        # before after (or ends past before) is not offered
+        if after is not None:
+            free[:self._span(self.start, to_naive(after))[1]] = False
+        if before is not None:
+            free[self._span(to_naive(before), self.end)[0]:] = False
+        if length > self.size:
+            return []
+
+        # A run of length free steps starts at i when the prefix sums differ by length
+        prefix = np.concatenate(([0], np.cumsum(free, dtype=np.int32)))
+        starts = np.flatnonzero(prefix[length:] - prefix[:-length] == length)
+
+        slots = []
+        position = 0
+        while position < len(starts) and len(slots) < count:
+            step = int(starts[position])
+            slot_start = self.start + timedelta(minutes=step * self.resolution)
+            slots.append((slot_start, slot_start + timedelta(minutes=duration_minutes)))
+            position = int(np.searchsorted(starts, step + length))
+        return slots
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'users': len(self._rows),
+            'events': sum(len(events) for events in self._events.values()),
+            'resolution_minutes': self.resolution,
+            'window_days': self.days,
+            'bitmap_bytes': int(self._bits[:len(self._rows)].nbytes)
+        }
@@ -0,0 +1,191 @@
+"""
+Shared pooled async HTTP client for outbound integration calls
+"""
+
+from typing import Any, Dict, FrozenSet, NamedTuple, Optional
+import asyncio
+import logging
+import os
+import random
+
+import httpx
+
+class RetryPolicy(NamedTuple):
+    """When and how long to wait before retrying a request"""
+    attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    # Requests that are safe to send twice; others are only retried when they never reached the server
+    methods: FrozenSet[str] = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+    def delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Full-jitter exponential backoff, or the server's Retry-After when it gives one"""
+        if response is not None:
+            retry_after = response.headers.get('retry-after', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+class HTTPClient:
+    """One httpx.AsyncClient shared by every integration
+
+    httpx keeps a keep-alive connection pool per origin, so repeated calls
+    to the same API reuse warm connections instead of opening one per call.
+    Each integration can be given its own concurrency limit so one slow API
+    cannot take every pooled connection. Failed requests are retried per
+    the RetryPolicy. The client is created on first use and recreated if
+    the event loop changes, as it does between test clients; the old one is
+    closed as far as its loop still allows.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        retry: RetryPolicy = RetryPolicy(),
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.pool_limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.retry = retry
+        # Replaces the network, e.g. with httpx.MockTransport in tests
+        self.transport = transport
+
+        self._concurrency: Dict[str, int] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def limit(self, integration: str, max_concurrency: int):
+        """Cap how many requests one integration may have in flight"""
+        self._concurrency[integration] = max_concurrency
+        self._semaphores.pop(integration, None)
+
+    async def _ensure_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                await self._retire(self._client, self._loop)
+            # Connections and semaphores belong to the loop that created them
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.pool_limits, transport=self.transport)
+            self._semaphores = {}
+            self._loop = loop
+        return self._client
+
+    @staticmethod
+    async def _retire(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]):
+        """Best-effort close of a client left behind by another event loop"""
+        if loop is not None and loop.is_running():
+            # Still running on another thread: close it there
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        try:
+            await client.aclose()
+        except Exception as e:
+            # Its loop is closed, so its connections can no longer be shut down cleanly
+            logging.debug(f"Closing HTTP client from a finished event loop failed: {e!r}")
+
+    def _semaphore(self, integration: str) -> Optional[asyncio.Semaphore]:
+        if integration not in self._concurrency:
+            return None
+        semaphore = self._semaphores.get(integration)
+        if semaphore is None:
+            semaphore = self._semaphores[integration] = asyncio.Semaphore(self._concurrency[integration])
+        return semaphore
+
+    def _count(self, integration: str, key: str):
+        counters = self._stats.setdefault(integration, {'requests': 0, 'retries': 0, 'failures': 0})
+        counters[key] += 1
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        integration: str = "default",
+        retry: Optional[RetryPolicy] = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """Send a request, retrying per the policy; the last response is returned whatever its status"""
+        client = await self._ensure_client()
+        retry = retry or self.retry
+        method = method.upper()
+        semaphore = self._semaphore(integration)
+        self._count(integration, 'requests')
+
+        attempt = 0
+        while True:
+            response = None
+            try:
+                if semaphore is not None:
+                    async with semaphore:
+                        response = await client.request(method, url, **kwargs)
+                else:
+                    response = await client.request(method, url, **kwargs)
+                if response.status_code not in retry.statuses or method not in retry.methods:
+                    return response
+                failure = f"HTTP {response.status_code}"
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                # Never reached the server: safe to retry any method
+                failure = repr(e)
+                if attempt + 1 >= retry.attempts:
+                    self._count(integration, 'failures')
+                    raise
+            except httpx.TransportError as e:
+                failure = repr(e)
+                if method not in retry.methods or attempt + 1 >= retry.attempts:
+                    self._count(integration, 'failures')
+                    raise
+
+            if attempt + 1 >= retry.attempts:
+                self._count(integration, 'failures')
+                return response
+            delay = retry.delay(attempt, response)
+            logging.info(f"{integration}: {method} {url} failed ({failure}), retrying in {delay:.2f}s")
+            self._count(integration, 'retries')
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request('PUT', url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request('DELETE', url, **kwargs)
+
+    async def close(self):
+        """Close pooled connections; the next request opens a new client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'integrations': {
+                integration: {
+                    **counters,
+                    'max_concurrency': self._concurrency.get(integration)
+                }
+                for integration, counters in self._stats.items()
+            }
+        }
+
+# Shared by every router that calls out to an integration
+http_client = HTTPClient(
+    timeout=float(os.getenv("HTTP_CLIENT_TIMEOUT_SECONDS", "10")),
+    max_connections=int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "100"))
+)
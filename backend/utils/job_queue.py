@@ -0,0 +1,202 @@
+"""
+Debounced, per-key coalescing job queue with bounded workers and retries
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+import asyncio
+import logging
+import random
+
+# Called with the job key and every payload submitted for it since the last run
+JobHandler = Callable[[str, List[Any]], Awaitable[None]]
+
+class _Job:
+    __slots__ = ('key', 'payloads', 'first_at', 'due_at', 'attempts', 'timer', 'ready')
+
+    def __init__(self, key: str, now: float):
+        self.key = key
+        self.payloads: List[Any] = []
+        self.first_at = now
+        self.due_at = now
+        self.attempts = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+        # Waiting in the ready queue (or held back while the key is running)
+        self.ready = False
+
+class JobQueue:
+    """Coalesce bursts of submissions per key into one handler call
+
+    A submission for a key with no pending job starts a debounce window;
+    later submissions inside the window join the same job and push its run
+    time back, up to max_delay_seconds after the first one. When the window
+    closes the job goes to a fixed pool of workers, so at most one handler
+    call per key and ``workers`` calls overall are in flight. Submissions
+    that arrive while their key is running form the next job, which waits
+    for the current run to finish. Failed jobs are retried with exponential
+    backoff and jitter, merged with anything submitted meanwhile.
+    """
+
+    def __init__(
+        self,
+        handler: JobHandler,
+        name: str = "jobs",
+        debounce_seconds: float = 2.0,
+        max_delay_seconds: float = 10.0,
+        workers: int = 4,
+        max_attempts: int = 5,
+        retry_base_seconds: float = 1.0,
+        retry_max_seconds: float = 60.0
+    ):
+        self.handler = handler
+        self.name = name
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max(max_delay_seconds, debounce_seconds)
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+
+        self._pending: Dict[str, _Job] = {}
+        self._running: Set[str] = set()
+        self._ready: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._idle: Optional[asyncio.Event] = None
+        self._stats = {'submitted': 0, 'coalesced': 0, 'processed': 0, 'retried': 0, 'failed': 0}
+
+    def __len__(self) -> int:
+        return len(self._pending) + len(self._running)
+
+    def start(self):
+        """Start the worker pool on the running event loop"""
+        if self._workers:
+            return
+        self._ready = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._update_idle()
+        loop = asyncio.get_running_loop()
+        self._workers = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+    def submit(self, key: str, payload: Any = None):
+        """Queue work for key; returns immediately"""
+        if not self._workers:
+            self.start()
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self._stats['submitted'] += 1
+
+        job = self._pending.get(key)
+        if job is None:
+            job = self._pending[key] = _Job(key, now)
+        else:
+            self._stats['coalesced'] += 1
+        if payload is not None:
+            job.payloads.append(payload)
+        if job.ready or job.attempts:
+            # Already due, or backing off after a failure: it will pick this payload up
+            return
+
+        job.due_at = min(now + self.debounce_seconds, job.first_at + self.max_delay_seconds)
+        if job.timer is not None:
+            job.timer.cancel()
+        job.timer = loop.call_at(job.due_at, self._make_ready, key)
+        self._update_idle()
+
+    def _make_ready(self, key: str):
+        job = self._pending.get(key)
+        if job is None or job.ready:
+            return
+        job.timer = None
+        job.ready = True
+        if key not in self._running:
+            # Otherwise the worker running this key queues it when it finishes
+            self._ready.put_nowait(key)
+
+    async def _work(self):
+        while True:
+            key = await self._ready.get()
+            job = self._pending.pop(key, None)
+            if job is None:
+                continue
+            self._running.add(key)
+            try:
+                await self.handler(key, job.payloads)
+                self._stats['processed'] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._retry(job, e)
+            finally:
+                self._running.discard(key)
+                queued = self._pending.get(key)
+                if queued is not None and queued.ready:
+                    self._ready.put_nowait(key)
+                self._update_idle()
+
+    def _retry(self, job: _Job, error: Exception):
+        job.attempts += 1
+        if job.attempts >= self.max_attempts:
+            self._stats['failed'] += 1
+            logging.error(f"{self.name}: giving up on {job.key} after {job.attempts} attempts: {error}")
+            return
+        self._stats['retried'] += 1
+        delay = min(self.retry_base_seconds * 2 ** (job.attempts - 1), self.retry_max_seconds)
+        delay *= random.uniform(0.5, 1.0)
+        logging.error(f"{self.name}: {job.key} failed (attempt {job.attempts}), retrying in {delay:.1f}s: {error}")
+
+        # Anything submitted while it ran rides along with the retry
+        newer = self._pending.pop(job.key, None)
+        if newer is not None:
+            if newer.timer is not None:
+                newer.timer.cancel()
+            job.payloads.extend(newer.payloads)
+        job.ready = False
+        self._pending[job.key] = job
+        job.timer = asyncio.get_running_loop().call_later(delay, self._make_ready, job.key)
+
+    def _update_idle(self):
+        if self._idle is None:
+            return
+        if self._pending or self._running:
+            self._idle.clear()
+        else:
+            self._idle.set()
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Run every pending job now and wait for the queue to empty; False on timeout"""
+        if not self._workers:
+            return not self._pending
+        for key, job in list(self._pending.items()):
+            if job.timer is not None:
+                job.timer.cancel()
+            self._make_ready(key)
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def stop(self, timeout: Optional[float] = 10.0):
+        """Drain, then stop the workers; jobs still pending after timeout are dropped"""
+        if not self._workers:
+            return
+        if not await self.drain(timeout):
+            logging.error(f"{self.name}: dropping {len(self)} jobs on shutdown")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        for job in self._pending.values():
+            if job.timer is not None:
+                job.timer.cancel()
+        self._pending.clear()
+        self._running.clear()
+        self._workers = []
+        self._ready = None
+        self._idle = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            'pending': len(self._pending),
+            'running': len(self._running),
+            'workers': len(self._workers)
+        }
@@ -0,0 +1,53 @@
+"""
+Single-pass multi-keyword matching
+"""
+
+from typing import FrozenSet, Iterable, Set
+
+import ahocorasick
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+class KeywordMatcher:
+    """Find every keyword that occurs in a text with one Aho-Corasick scan
+
+    By default only whole-word occurrences count: a hit whose neighbouring
+    character continues a word ("call" in "recall", "gym" in "gymnastics")
+    is ignored. Keyword edges that are punctuation ("!!!") match anywhere.
+    With whole_words=False matching has the same semantics as running
+    ``keyword in text`` for each keyword. Either way the text is scanned
+    once regardless of vocabulary size. Texts are expected to be lowercased
+    by the caller.
+    """
+
+    def __init__(self, keywords: Iterable[str], whole_words: bool = True):
+        self.keywords: FrozenSet[str] = frozenset(k.lower() for k in keywords if k)
+        self.whole_words = whole_words
+
+        self._automaton = ahocorasick.Automaton()
+        for keyword in self.keywords:
+            # Whether each end of the keyword needs a word boundary next to it
+            self._automaton.add_word(keyword, (keyword, _is_word_char(keyword[0]), _is_word_char(keyword[-1])))
+        if self.keywords:
+            self._automaton.make_automaton()
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of keywords that occur in ``text``"""
+        if not self.keywords:
+            return set()
+        if not self.whole_words:
+            return {keyword for _, (keyword, _, _) in self._automaton.iter(text)}
+
+        found = set()
+        last = len(text) - 1
+        for end, (keyword, bounded_start, bounded_end) in self._automaton.iter(text):
+            if keyword in found:
+                continue
+            start = end - len(keyword) + 1
+            if bounded_start and start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if bounded_end and end < last and _is_word_char(text[end + 1]):
+                continue
+            found.add(keyword)
+        return found
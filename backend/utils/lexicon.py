@@ -0,0 +1,157 @@
+"""
+Versioned keyword lexicon bundles, compiled once and shared
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Mapping, Sequence, Tuple, TypeVar
+import json
+import logging
+import os
+import threading
+
+from utils.keyword_matcher import KeywordMatcher
+
+LEXICON_DIR = Path(os.getenv("LEXICON_DIR", str(Path(__file__).parent.parent / "lexicons")))
+
+# Used in place of configured bundles that do not exist
+DEFAULT_BUNDLE = "en"
+
+T = TypeVar("T")
+
+class LexiconError(ValueError):
+    """Raised when a lexicon bundle is missing or malformed"""
+
+class Lexicon:
+    """Keyword vocabularies merged from one or more bundles
+
+    Later bundles extend earlier ones: lists gain new entries and mappings
+    gain or override keys, so a domain or language bundle can be layered on
+    top of "en". Sections are frozen, and matchers and other compiled forms
+    are built on first use and then shared by every validator and enhancer
+    holding this lexicon.
+    """
+
+    def __init__(self, bundles: Sequence[Dict[str, Any]]):
+        if not bundles:
+            raise LexiconError("At least one lexicon bundle is required")
+
+        self.names: Tuple[str, ...] = tuple(bundle["name"] for bundle in bundles)
+        self.version = "+".join(f"{bundle['name']}@{bundle['version']}" for bundle in bundles)
+
+        merged: Dict[str, Any] = {}
+        for bundle in bundles:
+            merged = _merge(merged, bundle["lexicons"])
+        self._sections: Mapping[str, Any] = _freeze(merged)
+
+        self._compiled: Dict[Hashable, Any] = {}
+        # Reentrant: compiled values may be built from other compiled values
+        self._lock = threading.RLock()
+
+    def __repr__(self) -> str:
+        return f"Lexicon({self.version})"
+
+    def __contains__(self, section: str) -> bool:
+        return section in self._sections
+
+    def __getitem__(self, section: str) -> Any:
+        try:
+            return self._sections[section]
+        except KeyError:
+            raise LexiconError(f"Lexicon {self.version} has no section '{section}'") from None
+
+    def keywords(self, *sections: str) -> FrozenSet[str]:
+        """Every keyword in the given sections
+
+        Keywords are list entries, mapping keys (e.g. urgency weights) or,
+        for mappings of lists (e.g. category keywords), the list entries.
+        """
+        keywords = set()
+        for section in sections:
+            keywords.update(_section_keywords(self[section]))
+        return frozenset(keywords)
+
+    def matcher(self, *sections: str, extra: Iterable[str] = ()) -> KeywordMatcher:
+        """Shared KeywordMatcher over the given sections plus any extra keywords"""
+        extra = tuple(sorted(extra))
+        return self.compiled(("matcher", sections, extra), lambda: KeywordMatcher(self.keywords(*sections) | set(extra)))
+
+    def compiled(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Build a value derived from this lexicon once and share it"""
+        value = self._compiled.get(key)
+        if value is None:
+            with self._lock:
+                value = self._compiled.get(key)
+                if value is None:
+                    value = build()
+                    self._compiled[key] = value
+        return value
+
+def load_lexicon(*names: str) -> Lexicon:
+    """Load and merge bundles by name, e.g. load_lexicon("en", "en-medical")
+
+    Without names, the comma-separated LEXICON_BUNDLES setting is used
+    (default "en"); a configured bundle that does not exist falls back to
+    its base language, then to "en", so a bad setting cannot stop the app
+    from starting. Bundles named explicitly must exist. Each combination
+    is loaded once per process.
+    """
+    if not names:
+        configured = [name.strip() for name in os.getenv("LEXICON_BUNDLES", DEFAULT_BUNDLE).split(",") if name.strip()]
+        names = tuple(dict.fromkeys(_available_bundle(name) for name in configured)) or (DEFAULT_BUNDLE,)
+    return _load_lexicon(tuple(names))
+
+def _available_bundle(name: str) -> str:
+    """The configured bundle, its base language ("fr" for "fr-CA") or the default, whichever exists first"""
+    for candidate in (name, name.split("-")[0]):
+        if (LEXICON_DIR / f"{candidate}.json").exists():
+            if candidate != name:
+                logging.warning(f"Lexicon bundle '{name}' not found, using '{candidate}'")
+            return candidate
+    logging.warning(f"Lexicon bundle '{name}' not found, using '{DEFAULT_BUNDLE}'")
+    return DEFAULT_BUNDLE
+
+@lru_cache(maxsize=None)
+def _load_lexicon(names: Tuple[str, ...]) -> Lexicon:
+    return Lexicon([read_bundle(name) for name in names])
+
+def read_bundle(name: str) -> Dict[str, Any]:
+    """Read and check one bundle from LEXICON_DIR"""
+    path = LEXICON_DIR / f"{name}.json"
+    try:
+        with open(path, encoding="utf-8") as bundle_file:
+            bundle = json.load(bundle_file)
+    except FileNotFoundError:
+        raise LexiconError(f"Lexicon bundle '{name}' not found in {LEXICON_DIR}") from None
+    except json.JSONDecodeError as e:
+        raise LexiconError(f"Lexicon bundle '{name}' is not valid JSON: {e}") from None
+
+    if not isinstance(bundle.get("version"), int) or not isinstance(bundle.get("lexicons"), dict):
+        raise LexiconError(f"Lexicon bundle '{name}' needs an integer 'version' and a 'lexicons' object")
+    bundle.setdefault("name", name)
+    return bundle
+
+def _merge(base: Any, extra: Any) -> Any:
+    if isinstance(base, dict) and isinstance(extra, dict):
+        merged = dict(base)
+        for key, value in extra.items():
+            merged[key] = _merge(base[key], value) if key in base else value
+        return merged
+    if isinstance(base, list) and isinstance(extra, list):
+        return base + [item for item in extra if item not in base]
+    return extra
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _section_keywords(section: Any) -> List[str]:
+    if isinstance(section, Mapping):
+        if all(isinstance(value, tuple) for value in section.values()):
+            return [keyword for keywords in section.values() for keyword in keywords]
+        return list(section)
+    return list(section)
@@ -0,0 +1,152 @@
+"""
+Lightweight stage timing: spans, histograms and Prometheus text output
+"""
+
+from bisect import bisect_left
+from functools import wraps
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+import asyncio
+import os
+import time
+
+# Upper bounds in seconds, from a fast in-process check up to a slow LLM call
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Histogram:
+    """Cumulative-bucket latency histogram, as Prometheus exposes it"""
+    __slots__ = ('buckets', 'counts', 'sum', 'count', 'errors')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # One slot per bucket plus +Inf; made cumulative only when rendered
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, seconds: float, error: bool = False):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        if error:
+            self.errors += 1
+
+class _Span:
+    __slots__ = ('histogram', 'started')
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.histogram.observe(time.perf_counter() - self.started, exc_type is not None)
+        return False
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+
+class Metrics:
+    """Stage latency histograms keyed by stage name
+
+    span(stage) times a block and records whether it raised; timed(stage)
+    does the same for a whole function, sync or async. When disabled both
+    cost one attribute check: span hands back a shared no-op context and
+    timed calls straight through, so instrumentation can stay in place.
+    """
+
+    def __init__(self, enabled: bool = True, namespace: str = "jipange", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[str, Histogram] = {}
+        self.started_at = time.time()
+
+    def histogram(self, stage: str) -> Histogram:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            histogram = self._histograms[stage] = Histogram(self.buckets)
+        return histogram
+
+    def span(self, stage: str):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self.histogram(stage))
+
+    def observe(self, stage: str, seconds: float, error: bool = False):
+        if self.enabled:
+            self.histogram(stage).observe(seconds, error)
+
+    def timed(self, stage: str) -> Callable[[Callable], Callable]:
+        """Decorator timing every call of a function under stage"""
+        def decorate(function: Callable) -> Callable:
+            if asyncio.iscoroutinefunction(function):
+                @wraps(function)
+                async def async_wrapper(*args: Any, **kwargs: Any):
+                    if not self.enabled:
+                        return await function(*args, **kwargs)
+                    with _Span(self.histogram(stage)):
+                        return await function(*args, **kwargs)
+                return async_wrapper
+
+            @wraps(function)
+            def wrapper(*args: Any, **kwargs: Any):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with _Span(self.histogram(stage)):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def reset(self):
+        self._histograms.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        name = f"{self.namespace}_stage_duration_seconds"
+        errors_name = f"{self.namespace}_stage_errors_total"
+        stages: List[Tuple[str, Histogram]] = sorted(self._histograms.items())
+
+        lines = [
+            f"# HELP {name} Time spent in each instrumented stage.",
+            f"# TYPE {name} histogram"
+        ]
+        for stage, histogram in stages:
+            label = f'stage="{_escape(stage)}"'
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{label},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{label},le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{{label}}} {histogram.sum:.6f}')
+            lines.append(f'{name}_count{{{label}}} {histogram.count}')
+
+        lines += [
+            f"# HELP {errors_name} Instrumented stages that raised.",
+            f"# TYPE {errors_name} counter"
+        ]
+        for stage, histogram in stages:
+            lines.append(f'{errors_name}{{stage="{_escape(stage)}"}} {histogram.errors}')
+
+        lines += [
+            f"# HELP {self.namespace}_process_start_time_seconds Start time of the process since unix epoch.",
+            f"# TYPE {self.namespace}_process_start_time_seconds gauge",
+            f"{self.namespace}_process_start_time_seconds {self.started_at:.3f}"
+        ]
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+# Process-wide registry; METRICS_ENABLED=0 turns every span into a no-op
+metrics = Metrics(enabled=os.getenv("METRICS_ENABLED", "1").lower() not in ("0", "false", "no"))
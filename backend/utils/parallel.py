@@ -0,0 +1,156 @@
+"""
+Process-pool execution for large task validation and enhancement batches
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import threading
+
+from utils.task_validation import SmartTaskEnhancer, TaskValidator, ValidationResult
+from utils.transcript_analysis import TranscriptAnalysis
+
+Batch = Sequence[Tuple[Dict[str, Any], Union[str, TranscriptAnalysis]]]
+# (task_data, transcript text): the only thing that crosses the process boundary
+Payload = List[Tuple[Dict[str, Any], str]]
+
+# Per-worker instances, built once by _init_worker so every chunk reuses
+# the compiled matchers and keyword matrices
+_worker_validator: Optional[TaskValidator] = None
+_worker_enhancer: Optional[SmartTaskEnhancer] = None
+
+def _init_worker():
+    global _worker_validator, _worker_enhancer
+    _worker_validator = TaskValidator()
+    _worker_enhancer = SmartTaskEnhancer()
+
+def _validate_chunk(chunk: Payload) -> List[Tuple[float, bool, list, list, list]]:
+    results = _worker_validator.validate_tasks(chunk)
+    return [
+        (task_data.get('confidence_score'), result.is_valid, result.issues, result.suggestions, result.confidence_adjustments)
+        for (task_data, _), result in zip(chunk, results)
+    ]
+
+def _enhance_chunk(chunk: Payload, context: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [_worker_enhancer.enhance_task(task_data, transcript, context) for task_data, transcript in chunk]
+
+def _to_payload(batch: Batch) -> Payload:
+    return [(task_data, TranscriptAnalysis.of(transcript).text) for task_data, transcript in batch]
+
+def _to_validation_result(row: Tuple[float, bool, list, list, list]) -> ValidationResult:
+    result = ValidationResult()
+    _, result.is_valid, result.issues, result.suggestions, result.confidence_adjustments = row
+    return result
+
+class ParallelTaskProcessor:
+    """Validate and enhance task batches across a process pool
+
+    Batches smaller than ``min_batch_size`` run inline on the local validator
+    and enhancer, so interactive requests never pay for pickling. Larger ones
+    are split into ordered chunks and sharded across worker processes, each of
+    which keeps a warm TaskValidator and SmartTaskEnhancer. Results come back
+    in input order and match the inline path, including the confidence_score
+    written back to each task.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        min_batch_size: int = 2000,
+        chunks_per_worker: int = 4,
+        validator: Optional[TaskValidator] = None,
+        enhancer: Optional[SmartTaskEnhancer] = None
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_batch_size = min_batch_size
+        self.chunks_per_worker = chunks_per_worker
+        self.validator = validator or TaskValidator()
+        self.enhancer = enhancer or SmartTaskEnhancer()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def should_parallelize(self, size: int) -> bool:
+        return self.max_workers > 1 and size >= self.min_batch_size
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # Spawn rather than fork: the server process runs an event
+                    # loop and client threads that must not be copied
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker
+                    )
+                    logging.info(f"Started task processing pool with {self.max_workers} workers")
+        return self._pool
+
+    def _chunks(self, payload: Payload) -> List[Payload]:
+        chunk_size = math.ceil(len(payload) / (self.max_workers * self.chunks_per_worker))
+        return [payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size)]
+
+    def _apply_validation(self, batch: Batch, rows: List[Tuple[float, bool, list, list, list]]) -> List[ValidationResult]:
+        for (task_data, _), row in zip(batch, rows):
+            task_data['confidence_score'] = row[0]
+        return [_to_validation_result(row) for row in rows]
+
+    def _apply_enhancement(self, batch: Batch, enhanced: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Workers enhance copies; update the caller's dicts as the inline path does
+        for (task_data, _), result in zip(batch, enhanced):
+            task_data.update(result)
+        return [task_data for task_data, _ in batch]
+
+    def validate(self, batch: Batch) -> List[ValidationResult]:
+        """Validate (task_data, transcript) pairs, in parallel when the batch is large"""
+        if not self.should_parallelize(len(batch)):
+            return self.validator.validate_tasks(batch)
+
+        pool = self._get_pool()
+        rows = [row for chunk in pool.map(_validate_chunk, self._chunks(_to_payload(batch))) for row in chunk]
+        return self._apply_validation(batch, rows)
+
+    def enhance(self, batch: Batch, context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Enhance (task_data, transcript) pairs, in parallel when the batch is large"""
+        if not self.should_parallelize(len(batch)):
+            return [self.enhancer.enhance_task(task_data, transcript, context) for task_data, transcript in batch]
+
+        pool = self._get_pool()
+        chunks = self._chunks(_to_payload(batch))
+        enhanced = [task for chunk in pool.map(_enhance_chunk, chunks, [context] * len(chunks)) for task in chunk]
+        return self._apply_enhancement(batch, enhanced)
+
+    async def validate_async(self, batch: Batch) -> List[ValidationResult]:
+        """Like validate, but never blocks the event loop on a large batch"""
+        if not self.should_parallelize(len(batch)):
+            return self.validator.validate_tasks(batch)
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(pool, _validate_chunk, chunk) for chunk in self._chunks(_to_payload(batch))
+        ))
+        return self._apply_validation(batch, [row for chunk in chunks for row in chunk])
+
+    async def enhance_async(self, batch: Batch, context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Like enhance, but never blocks the event loop on a large batch"""
+        if not self.should_parallelize(len(batch)):
+            return [self.enhancer.enhance_task(task_data, transcript, context) for task_data, transcript in batch]
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(pool, _enhance_chunk, chunk, context) for chunk in self._chunks(_to_payload(batch))
+        ))
+        return self._apply_enhancement(batch, [task for chunk in chunks for task in chunk])
+
+    def shutdown(self):
+        """Stop the worker processes, if any were started"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
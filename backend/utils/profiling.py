@@ -0,0 +1,201 @@
+"""
+Opt-in request profiling: an async-aware sampling profiler writing collapsed stacks
+"""
+
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import hmac
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+
+PROFILE_HEADER = b"x-profile"
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def _await_chain(coro) -> List[Any]:
+    """Frames of a suspended coroutine and everything it awaits, outermost first"""
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, 'cr_frame', None) or getattr(coro, 'gi_frame', None) or getattr(coro, 'ag_frame', None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, 'cr_await', None) or getattr(coro, 'gi_yieldfrom', None) or getattr(coro, 'ag_await', None)
+    return frames
+
+class TaskSampler:
+    """Samples one asyncio task's stack from a background thread
+
+    Each tick looks at whether the task is the one the event loop is running.
+    If it is, the loop thread's real stack is recorded, from the task's
+    outermost coroutine (or the anchor frame) down, so blocking calls made
+    on the loop show up where they happen. If it is not, the task is
+    suspended and the chain of coroutines it is awaiting is recorded under
+    an [await] leaf, which is where the wall-clock time of I/O and of
+    waiting behind other requests goes. Samples from other requests are
+    never mixed in.
+    """
+
+    def __init__(self, task: asyncio.Task, loop: asyncio.AbstractEventLoop, interval_seconds: float = 0.001, anchor=None):
+        self.task = task
+        self.loop = loop
+        # Stacks start at this frame when it is on them, leaving out the server's own
+        self.anchor = anchor
+        self.interval_seconds = interval_seconds
+        self.stacks: Counter = Counter()
+        self.running_samples = 0
+        self.waiting_samples = 0
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            self._sample()
+
+    def _sample(self):
+        chain = _await_chain(self.task.get_coro())
+        if not chain:
+            return
+        if asyncio.current_task(self.loop) is self.task:
+            # A running coroutine awaits nothing, so the chain can't tell where the anchor is
+            frame = sys._current_frames().get(self._thread_id)
+            frames = []
+            while frame is not None and frame is not self.anchor and frame is not chain[0]:
+                frames.append(frame)
+                frame = frame.f_back
+            if frame is None:
+                # Between steps of the task; nothing of it is on the stack
+                return
+            frames.append(frame)
+            stack = tuple(_frame_label(frame.f_code) for frame in reversed(frames))
+            self.running_samples += 1
+        else:
+            if self.anchor in chain:
+                chain = chain[chain.index(self.anchor):]
+            stack = tuple(_frame_label(frame.f_code) for frame in chain) + ("[await]",)
+            self.waiting_samples += 1
+        self.stacks[stack] += 1
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded format, one "frame;frame;frame count" per line"""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling the requests it is asked to
+
+    A request is profiled when it sends the profile header with the
+    configured token, or when it falls within the sampling rate. Each
+    profile is written to the output directory as a .collapsed file, ready
+    for flamegraph.pl or speedscope, and its name is returned in the
+    response's profile header. Requests that are not profiled only pay for
+    the header lookup and one random draw; with no token and a zero rate
+    the middleware should simply not be installed (see install_profiling).
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        output_dir: str = "profiles",
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        interval_seconds: float = 0.001,
+        max_concurrent: int = 2
+    ):
+        self.app = app
+        self.output_dir = Path(output_dir)
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self.interval_seconds = interval_seconds
+        self.max_concurrent = max_concurrent
+        self._active = 0
+        self._stats = {'profiled': 0, 'skipped_busy': 0, 'write_failures': 0}
+
+    def _requested(self, scope: Dict[str, Any]) -> bool:
+        if self.token is not None:
+            for name, value in scope['headers']:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope['type'] != 'http' or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if self._active >= self.max_concurrent:
+            self._stats['skipped_busy'] += 1
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{datetime.now():%Y%m%d-%H%M%S}-{scope['method']}-{_slug(scope['path'])}-{uuid.uuid4().hex[:8]}"
+
+        async def send_with_id(message: Dict[str, Any]):
+            if message['type'] == 'http.response.start':
+                message = {**message, 'headers': [*message.get('headers', []), (PROFILE_HEADER, profile_id.encode())]}
+            await send(message)
+
+        self._active += 1
+        sampler = TaskSampler(asyncio.current_task(), asyncio.get_running_loop(), self.interval_seconds, sys._getframe())
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            self._active -= 1
+            wall_ms = (time.perf_counter() - started) * 1000
+            self._stats['profiled'] += 1
+            try:
+                await asyncio.to_thread(self._write, profile_id, sampler)
+                logging.info(
+                    f"Profiled {scope['method']} {scope['path']} in {wall_ms:.1f} ms: "
+                    f"{sampler.running_samples} running / {sampler.waiting_samples} awaiting samples -> {profile_id}.collapsed"
+                )
+            except OSError as e:
+                self._stats['write_failures'] += 1
+                logging.error(f"Writing profile {profile_id} failed: {str(e)}")
+
+    def _write(self, profile_id: str, sampler: TaskSampler):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        (self.output_dir / f"{profile_id}.collapsed").write_text(sampler.collapsed(), encoding="utf-8")
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, 'active': self._active, 'sample_rate': self.sample_rate}
+
+def _slug(path: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in path.strip("/"))[:60] or "root"
+
+def install_profiling(app) -> bool:
+    """Add ProfilingMiddleware to app when PROFILE_TOKEN or PROFILE_SAMPLE_RATE asks for it
+
+    Nothing is installed otherwise, so an unconfigured deployment pays nothing.
+    """
+    token = os.getenv("PROFILE_TOKEN") or None
+    sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    if token is None and sample_rate <= 0:
+        return False
+    app.add_middleware(
+        ProfilingMiddleware,
+        output_dir=os.getenv("PROFILE_DIR", "profiles"),
+        token=token,
+        sample_rate=sample_rate,
+        interval_seconds=float(os.getenv("PROFILE_INTERVAL_MS", "1")) / 1000,
+        max_concurrent=int(os.getenv("PROFILE_MAX_CONCURRENT", "2"))
+    )
+    return True
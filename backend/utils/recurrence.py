@@ -0,0 +1,243 @@
+"""
+Recurring task rules expanded lazily into occurrences
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Set, Tuple
+import heapq
+
+from utils.temporal import add_months, parse_datetime
+
+FREQUENCIES = ('daily', 'weekly', 'monthly', 'weekdays', 'weekends')
+
+WEEKDAY_SETS = {'weekdays': frozenset(range(5)), 'weekends': frozenset((5, 6))}
+
+# How far ahead next_occurrence looks before deciding a series has ended
+NEXT_OCCURRENCE_LOOKAHEAD = timedelta(days=5 * 366)
+
+class RecurrenceRule(NamedTuple):
+    """When a task repeats
+
+    start is the first occurrence and fixes the time of day, the weekday
+    (weekly) and the day of the month (monthly, clamped in short months).
+    interval applies to daily, weekly and monthly rules. A rule without a
+    frequency occurs once, so one-off tasks can share the same index.
+    """
+    start: datetime
+    frequency: Optional[str] = None
+    interval: int = 1
+    until: Optional[datetime] = None
+
+    def occurrences(self, window_start: datetime, window_end: datetime) -> Iterator[datetime]:
+        """Occurrence times in [window_start, window_end), in order, generated lazily"""
+        window_end = min(window_end, self.until + timedelta(microseconds=1)) if self.until else window_end
+        window_start = max(window_start, self.start)
+        if window_start >= window_end:
+            return
+
+        if self.frequency is None:
+            if window_start <= self.start < window_end:
+                yield self.start
+            return
+
+        if self.frequency in ('daily', 'weekly'):
+            step = timedelta(days=self.interval * (7 if self.frequency == 'weekly' else 1))
+            # Jump straight to the first step inside the window
+            moment = self.start + step * -((self.start - window_start) // step)
+            while moment < window_end:
+                yield moment
+                moment += step
+            return
+
+        if self.frequency == 'monthly':
+            months = (window_start.year - self.start.year) * 12 + window_start.month - self.start.month
+            index = max(0, months - 1) // self.interval * self.interval
+            while True:
+                moment = datetime.combine(add_months(self.start.date(), index), self.start.time())
+                if moment >= window_end:
+                    return
+                if moment >= window_start:
+                    yield moment
+                index += self.interval
+
+        weekdays = WEEKDAY_SETS[self.frequency]
+        day = window_start.date()
+        while True:
+            moment = datetime.combine(day, self.start.time())
+            if moment >= window_end:
+                return
+            if moment >= window_start and day.weekday() in weekdays:
+                yield moment
+            day += timedelta(days=1)
+
+class Occurrence(NamedTuple):
+    """One instance of a task's series"""
+    task_id: str
+    start: datetime
+    # Where the rule placed it; differs from start when the occurrence was moved
+    original: datetime
+
+    @property
+    def moved(self) -> bool:
+        return self.start != self.original
+
+class RecurringSeries:
+    """A rule plus the occurrences skipped or moved away from it"""
+    __slots__ = ('task_id', 'rule', 'exceptions', 'overrides')
+
+    def __init__(self, task_id: str, rule: RecurrenceRule):
+        self.task_id = task_id
+        self.rule = rule
+        self.exceptions: Set[datetime] = set()
+        self.overrides: Dict[datetime, datetime] = {}
+
+    def occurrences(self, window_start: datetime, window_end: datetime) -> Iterator[Occurrence]:
+        regular = (
+            Occurrence(self.task_id, moment, moment)
+            for moment in self.rule.occurrences(window_start, window_end)
+            if moment not in self.exceptions and moment not in self.overrides
+        )
+        # Moved occurrences count in the window they were moved into
+        moved = sorted(
+            Occurrence(self.task_id, new_start, original)
+            for original, new_start in self.overrides.items()
+            if window_start <= new_start < window_end and original not in self.exceptions
+        )
+        return heapq.merge(regular, moved, key=lambda occurrence: occurrence.start) if moved else regular
+
+    def next_occurrence(self, after: datetime) -> Optional[Occurrence]:
+        return next(self.occurrences(after, max(after, self.rule.start) + NEXT_OCCURRENCE_LOOKAHEAD), None)
+
+class RecurrenceIndex:
+    """Recurrence rules for a set of tasks, with a heap of each task's next occurrence
+
+    Only rules, exceptions and overrides are stored; occurrences are
+    generated on demand for the window asked for. The heap holds one live
+    entry per task, keyed by its next occurrence at or after the index's
+    cursor, so due-soon queries touch only the tasks that are actually due.
+    Changed or removed tasks leave stale heap entries behind that are
+    skipped by version and compacted away.
+    """
+
+    def __init__(self):
+        self._series: Dict[str, RecurringSeries] = {}
+        # (start, task_id, version, original)
+        self._heap: List[Tuple[datetime, str, int, datetime]] = []
+        self._versions: Dict[str, int] = {}
+        # Occurrences before the cursor have already passed
+        self._cursor = datetime.min
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._series
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def set_rule(self, task_id: str, rule: RecurrenceRule):
+        """Add or replace a task's rule; its exceptions and overrides are kept"""
+        series = self._series.get(task_id)
+        if series is None:
+            series = self._series[task_id] = RecurringSeries(task_id, rule)
+        elif series.rule == rule:
+            return
+        else:
+            series.rule = rule
+        self._reindex(series)
+
+    def remove(self, task_id: str) -> bool:
+        if self._series.pop(task_id, None) is None:
+            return False
+        self._versions.pop(task_id, None)
+        return True
+
+    def _series_with(self, task_id: str, occurrence: datetime) -> RecurringSeries:
+        series = self._series[task_id]
+        if next(series.rule.occurrences(occurrence, occurrence + timedelta(microseconds=1)), None) is None:
+            raise ValueError(f"{occurrence.isoformat()} is not an occurrence of task {task_id}")
+        return series
+
+    def skip(self, task_id: str, occurrence: datetime):
+        """Drop one occurrence from the series"""
+        series = self._series_with(task_id, occurrence)
+        series.exceptions.add(occurrence)
+        self._reindex(series)
+
+    def move(self, task_id: str, occurrence: datetime, new_start: datetime):
+        """Move one occurrence, leaving the rest of the series alone"""
+        series = self._series_with(task_id, occurrence)
+        series.exceptions.discard(occurrence)
+        if new_start == occurrence:
+            series.overrides.pop(occurrence, None)
+        else:
+            series.overrides[occurrence] = new_start
+        self._reindex(series)
+
+    def occurrences(self, task_id: str, window_start: datetime, window_end: datetime) -> Iterator[Occurrence]:
+        return self._series[task_id].occurrences(window_start, window_end)
+
+    def expand(self, task_ids: Iterable[str], window_start: datetime, window_end: datetime) -> Iterator[Occurrence]:
+        """Occurrences of several tasks in [window_start, window_end), merged in start order"""
+        return heapq.merge(*(
+            self._series[task_id].occurrences(window_start, window_end)
+            for task_id in task_ids if task_id in self._series
+        ), key=lambda occurrence: occurrence.start)
+
+    def next_occurrence(self, task_id: str, after: Optional[datetime] = None) -> Optional[Occurrence]:
+        series = self._series.get(task_id)
+        return series.next_occurrence(after or self._cursor) if series else None
+
+    def due_soon(self, now: datetime, within: timedelta) -> List[Occurrence]:
+        """Next occurrences falling in [now, now + within), soonest first"""
+        self._advance(now)
+        limit = now + within
+        due, live = [], []
+        while self._heap and self._heap[0][0] < limit:
+            entry = heapq.heappop(self._heap)
+            if self._versions.get(entry[1]) != entry[2]:
+                continue
+            live.append(entry)
+            due.append(Occurrence(entry[1], entry[0], entry[3]))
+        for entry in live:
+            heapq.heappush(self._heap, entry)
+        return due
+
+    def _advance(self, now: datetime):
+        """Move the cursor forward, re-keying tasks whose next occurrence has passed"""
+        if now <= self._cursor:
+            return
+        self._cursor = now
+        while self._heap and self._heap[0][0] < now:
+            _, task_id, version, _ = heapq.heappop(self._heap)
+            if self._versions.get(task_id) == version:
+                self._push(self._series[task_id])
+        if len(self._heap) > 2 * len(self._versions) + 64:
+            self._heap = [entry for entry in self._heap if self._versions.get(entry[1]) == entry[2]]
+            heapq.heapify(self._heap)
+
+    def _reindex(self, series: RecurringSeries):
+        self._versions[series.task_id] = self._versions.get(series.task_id, 0) + 1
+        self._push(series)
+
+    def _push(self, series: RecurringSeries):
+        upcoming = series.next_occurrence(self._cursor)
+        if upcoming is None:
+            # Series is over; no live entry until the rule changes
+            self._versions[series.task_id] = self._versions.get(series.task_id, 0) + 1
+            return
+        heapq.heappush(self._heap, (upcoming.start, series.task_id, self._versions[series.task_id], upcoming.original))
+
+def rule_from_task(task: Mapping[str, Any]) -> Optional[RecurrenceRule]:
+    """Rule for a task dict: its recurring frequency anchored at the due date
+
+    Recurring tasks without a due date start from their creation time.
+    Non-recurring tasks with a due date get a one-off rule; others None.
+    """
+    frequency = task.get('recurring')
+    if frequency not in FREQUENCIES:
+        frequency = None
+    anchor = parse_datetime(task.get('due_date'))
+    if anchor is None and frequency:
+        anchor = parse_datetime(task.get('created_at'))
+    if anchor is None:
+        return None
+    return RecurrenceRule(start=anchor.replace(second=0, microsecond=0), frequency=frequency)
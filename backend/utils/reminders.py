@@ -0,0 +1,279 @@
+"""
+Heap-based reminder dispatcher with batched firing and a persisted queue
+"""
+
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+import asyncio
+import heapq
+import json
+import logging
+import math
+import os
+import threading
+
+class Reminder(NamedTuple):
+    """A pending reminder; each task has at most one"""
+    task_id: str
+    user_id: str
+    title: str
+    fire_at: datetime
+    due_at: datetime
+    attempts: int = 0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'task_id': self.task_id,
+            'user_id': self.user_id,
+            'title': self.title,
+            'fire_at': self.fire_at.isoformat(),
+            'due_at': self.due_at.isoformat(),
+            'attempts': self.attempts
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "Reminder":
+        return cls(
+            task_id=data['task_id'],
+            user_id=data['user_id'],
+            title=data['title'],
+            fire_at=datetime.fromisoformat(data['fire_at']),
+            due_at=datetime.fromisoformat(data['due_at']),
+            attempts=data.get('attempts', 0)
+        )
+
+# Receives every reminder that fired in one tick
+ReminderSink = Callable[[List[Reminder]], Awaitable[None]]
+
+async def log_reminders(reminders: List[Reminder]):
+    """Default sink: log reminders until a notification channel is wired in"""
+    for reminder in reminders:
+        logging.info(f"Reminder for task {reminder.task_id} ({reminder.title}) due {reminder.due_at.isoformat()}")
+
+class MemoryReminderSink:
+    """Sink that keeps delivered batches, for tests and local runs"""
+
+    def __init__(self):
+        self.batches: List[List[Reminder]] = []
+
+    async def __call__(self, reminders: List[Reminder]):
+        self.batches.append(list(reminders))
+
+    @property
+    def delivered(self) -> List[Reminder]:
+        return [reminder for batch in self.batches for reminder in batch]
+
+class ReminderScheduler:
+    """Fire reminders at their time from a min-heap keyed by fire time
+
+    Scheduling, moving and cancelling a reminder are O(log n): a change
+    pushes a new heap entry and bumps the task's sequence number, and
+    entries whose sequence no longer matches are dropped when they surface.
+    The dispatch loop sleeps until the tick containing the next fire time
+    (or until an earlier reminder is scheduled) and hands everything due in
+    that tick to the sink as one batch. Failed batches are retried a few
+    times. When store_path is set, the live queue is written there as JSON
+    at most once per tick when it changed, and read back on start, so
+    reminders survive a restart and any that came due meanwhile fire on the
+    first tick. Each save serializes the whole queue, O(n) per changed tick;
+    the file is written from a worker thread so the loop only pays for the
+    snapshot.
+    """
+
+    def __init__(
+        self,
+        sink: ReminderSink = log_reminders,
+        store_path: Optional[str] = None,
+        tick_seconds: float = 1.0,
+        max_attempts: int = 3,
+        retry_delay: timedelta = timedelta(seconds=30),
+        clock: Callable[[], datetime] = datetime.now
+    ):
+        self.sink = sink
+        self.store_path = store_path
+        self.tick_seconds = tick_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.clock = clock
+        self.fired = 0
+
+        self._pending: Dict[str, Tuple[Reminder, int]] = {}
+        # (fire_at, sequence, task_id)
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._sequence = 0
+        self._dirty = False
+        # Snapshots are numbered so a slow write never replaces a newer one
+        self._save_version = 0
+        self._written_version = 0
+        self._write_lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._pending
+
+    def schedule(self, reminder: Reminder):
+        """Add a reminder, replacing any pending one for the same task"""
+        self._sequence += 1
+        self._pending[reminder.task_id] = (reminder, self._sequence)
+        heapq.heappush(self._heap, (reminder.fire_at, self._sequence, reminder.task_id))
+        self._dirty = True
+        if self._wakeup is not None and self._heap[0][1] == self._sequence:
+            # New earliest reminder: the loop may be sleeping past it
+            self._wakeup.set()
+
+    def cancel(self, task_id: str) -> bool:
+        if self._pending.pop(task_id, None) is None:
+            return False
+        self._dirty = True
+        if len(self._heap) > 2 * len(self._pending) + 64:
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+        return True
+
+    def get(self, task_id: str) -> Optional[Reminder]:
+        pending = self._pending.get(task_id)
+        return pending[0] if pending else None
+
+    def _is_live(self, entry: Tuple[datetime, int, str]) -> bool:
+        pending = self._pending.get(entry[2])
+        return pending is not None and pending[1] == entry[1]
+
+    def next_fire_at(self) -> Optional[datetime]:
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> List[Reminder]:
+        """Remove and return every reminder due at or before now, in fire order"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if self._is_live(entry):
+                due.append(self._pending.pop(entry[2])[0])
+        if due:
+            self._dirty = True
+        return due
+
+    async def dispatch_due(self) -> int:
+        """Deliver everything due now as one batch; returns how many fired"""
+        batch = self.pop_due(self.clock())
+        if not batch:
+            return 0
+        try:
+            await self.sink(batch)
+            self.fired += len(batch)
+            return len(batch)
+        except Exception as e:
+            logging.error(f"Reminder delivery failed for {len(batch)} reminders: {e}")
+            retry_at = self.clock() + self.retry_delay
+            for reminder in batch:
+                if reminder.attempts + 1 < self.max_attempts and reminder.task_id not in self._pending:
+                    self.schedule(reminder._replace(fire_at=retry_at, attempts=reminder.attempts + 1))
+            return 0
+
+    def _seconds_until_next_tick(self) -> float:
+        next_fire = self.next_fire_at()
+        if next_fire is None:
+            return self.tick_seconds * 60
+        # Wake at the end of the tick holding the next reminder, so everything due in that tick fires together
+        tick_end = math.ceil(next_fire.timestamp() / self.tick_seconds) * self.tick_seconds
+        return max(tick_end - self.clock().timestamp(), 0)
+
+    async def run(self):
+        """Dispatch loop; runs until cancelled"""
+        self._wakeup = asyncio.Event()
+        while True:
+            await self.dispatch_due()
+            if self._dirty:
+                await self.save_async()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._seconds_until_next_tick())
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Load the persisted queue and start the dispatch loop on the running event loop"""
+        if self._task is None:
+            self.load()
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        """Stop the dispatch loop and persist what is still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        self.save()
+
+    def _snapshot(self) -> Tuple[int, str]:
+        reminders = sorted((reminder for reminder, _ in self._pending.values()), key=lambda reminder: reminder.fire_at)
+        self._save_version += 1
+        self._dirty = False
+        return self._save_version, json.dumps({'version': 1, 'reminders': [reminder.to_dict() for reminder in reminders]})
+
+    def _write(self, version: int, payload: str):
+        with self._write_lock:
+            if version <= self._written_version:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.store_path) or ".", exist_ok=True)
+                temp_path = f"{self.store_path}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as store_file:
+                    store_file.write(payload)
+                os.replace(temp_path, self.store_path)
+                self._written_version = version
+            except OSError as e:
+                self._dirty = True
+                logging.error(f"Failed to persist reminders to {self.store_path}: {e}")
+
+    def save(self):
+        """Persist the queue now, blocking until it is written"""
+        if not self.store_path:
+            self._dirty = False
+            return
+        self._write(*self._snapshot())
+
+    async def save_async(self):
+        """Persist the queue, writing the file off the event loop"""
+        if not self.store_path:
+            self._dirty = False
+            return
+        await asyncio.to_thread(self._write, *self._snapshot())
+
+    def load(self) -> int:
+        """Restore persisted reminders; pending ones for the same task are kept"""
+        if not self.store_path or not os.path.exists(self.store_path):
+            return 0
+        try:
+            with open(self.store_path, encoding="utf-8") as store_file:
+                stored = json.load(store_file)
+            reminders = [Reminder.from_dict(data) for data in stored.get('reminders', [])]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.error(f"Failed to load reminders from {self.store_path}: {e}")
+            return 0
+
+        restored = 0
+        for reminder in reminders:
+            if reminder.task_id not in self._pending:
+                self.schedule(reminder)
+                restored += 1
+        logging.info(f"Restored {restored} reminders from {self.store_path}")
+        return restored
+
+    def stats(self) -> Dict[str, object]:
+        next_fire = self.next_fire_at()
+        return {
+            'pending': len(self._pending),
+            'fired': self.fired,
+            'heap_entries': len(self._heap),
+            'next_fire_at': next_fire.isoformat() if next_fire else None
+        }
@@ -0,0 +1,602 @@
+"""
+Deterministic task scheduling around calendar events
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+import sys
+
+from utils.temporal import parse_datetime, to_naive
+
+PRIORITY_WEIGHTS = {'urgent': 4, 'high': 3, 'medium': 2, 'low': 1}
+DEFAULT_DURATION = 30  # minutes, for tasks without an estimate
+MINUTES_PER_DAY = 24 * 60
+
+# Due offset of undated tasks; sorts after every real deadline and is never late
+NO_DUE = sys.maxsize
+
+class ScheduledBlock(NamedTuple):
+    """A task placed into a time block"""
+    task_id: str
+    title: str
+    start: datetime
+    end: datetime
+    priority: str
+    due: Optional[datetime] = None
+
+    @property
+    def late(self) -> bool:
+        return self.due is not None and self.end > self.due
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'task_id': self.task_id,
+            'title': self.title,
+            'start': self.start.isoformat(),
+            'end': self.end.isoformat(),
+            'duration_minutes': int((self.end - self.start).total_seconds() // 60),
+            'priority': self.priority,
+            'due': self.due.isoformat() if self.due else None,
+            'late': self.late
+        }
+
+class Schedule(NamedTuple):
+    """Result of one scheduling run"""
+    blocks: List[ScheduledBlock]
+    unscheduled: List[str]
+    free_slots: List[Tuple[datetime, datetime]]
+    # Sum over late tasks of priority weight x minutes past due
+    weighted_lateness: int
+    improvements: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'blocks': [block.to_dict() for block in self.blocks],
+            'unscheduled': self.unscheduled,
+            'stats': {
+                'scheduled': len(self.blocks),
+                'unscheduled': len(self.unscheduled),
+                'late': sum(block.late for block in self.blocks),
+                'weighted_lateness': self.weighted_lateness,
+                'free_slots': len(self.free_slots),
+                'local_search_moves': self.improvements
+            }
+        }
+
+class _Item:
+    """A task in minute offsets from the horizon start"""
+    __slots__ = ('task_id', 'title', 'priority', 'weight', 'duration', 'due', 'key', 'slot', 'end')
+
+    def __init__(self, index: int, task_id: str, title: str, priority: str, duration: int, due: int):
+        self.task_id = task_id
+        self.title = title
+        self.priority = priority
+        self.weight = PRIORITY_WEIGHTS.get(priority, PRIORITY_WEIGHTS['medium'])
+        self.duration = duration
+        self.due = due
+        # Earliest deadline first, then priority, then shortest; input order breaks ties
+        self.key = (due, -self.weight, duration, index)
+        self.slot: Optional[_Slot] = None
+        self.end = 0
+
+    def lateness_cost(self, end: int) -> int:
+        return self.weight * (end - self.due) if end > self.due else 0
+
+class _Slot:
+    """A free interval; its tasks run back to back in key order"""
+    __slots__ = ('index', 'start', 'end', 'items', 'free')
+
+    def __init__(self, index: int, start: int, end: int, buffer: int):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.items: List[_Item] = []
+        # Every task occupies its duration plus the buffer; the last buffer may overhang
+        self.free = end - start + buffer
+
+    def cost(self, items: Sequence[_Item], buffer: int) -> int:
+        cursor, total = self.start, 0
+        for item in items:
+            cursor += item.duration
+            total += item.lateness_cost(cursor)
+            cursor += buffer
+        return total
+
+    def assign(self, items: List[_Item], buffer: int):
+        self.items = items
+        cursor = self.start
+        for item in items:
+            item.slot = self
+            cursor += item.duration
+            item.end = cursor
+            cursor += buffer
+        self.free = self.end - self.start + buffer - sum(item.duration + buffer for item in items)
+
+class PlanChange(NamedTuple):
+    """Blocks a repair created, moved or retitled, and tasks it took off the plan"""
+    blocks: List[ScheduledBlock]
+    removed: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'blocks': [block.to_dict() for block in self.blocks], 'removed': self.removed}
+
+class SchedulePlan:
+    """A schedule kept between requests and repaired in place
+
+    A task change takes the task's old blocks out of their slots and places
+    the new version first fit, so only the slots it leaves and enters are
+    repacked; tasks that did not fit before get a chance at the freed time.
+    An event change rebuilds the free slots of just the days the event
+    touches and re-places the tasks that were in them, starting from that
+    day. Work is proportional to the tasks and days touched, not to the
+    size of the plan; unlike a full run, repairs skip the local search.
+    """
+
+    def __init__(self, scheduler: "TaskScheduler", origin: datetime, horizon_end: datetime, events: Iterable[Mapping[str, Any]] = ()):
+        self.scheduler = scheduler
+        self.origin = origin
+        self.horizon_end = horizon_end
+        self.limit = _offset(horizon_end, origin)
+        self.improvements = 0
+
+        self.events: Dict[str, Tuple[int, int]] = {}
+        self._events_by_day: Dict[date, Set[str]] = defaultdict(set)
+        for event in events:
+            event_start, event_end = parse_datetime(event.get('start')), parse_datetime(event.get('end'))
+            if event_start is not None and event_end is not None and event_end > event_start:
+                self._add_event(str(event.get('id') or f"{event['start']}/{event['end']}"), event_start, event_end)
+
+        self.slots = [
+            _Slot(index, s, e, scheduler.buffer)
+            for index, (s, e) in enumerate(scheduler._free_minutes(origin, horizon_end, list(self.events.values())))
+        ]
+        self._slot_starts = [slot.start for slot in self.slots]
+
+        self.items: Dict[str, _Item] = {}
+        self.unscheduled: Dict[str, _Item] = {}
+        # Task id -> ids of its items (one, or one per occurrence of a recurring task)
+        self._instances: Dict[str, List[str]] = {}
+        self._next_index = 0
+        self._changed: Set[str] = set()
+        self._removed: Set[str] = set()
+
+    def new_item(self, task: Mapping[str, Any], index: Optional[int] = None) -> _Item:
+        if index is None:
+            index, self._next_index = self._next_index, self._next_index + 1
+        return self.scheduler._to_item(index, task, self.origin)
+
+    def register(self, items: Iterable[_Item], unscheduled: Iterable[_Item]):
+        for item in items:
+            self.items[item.task_id] = item
+            self._instances.setdefault(item.task_id.split('@', 1)[0], []).append(item.task_id)
+        self.unscheduled = {item.task_id: item for item in unscheduled}
+
+    def schedule(self) -> Schedule:
+        scheduled = [item for slot in self.slots for item in slot.items]
+        return Schedule(
+            blocks=[self._block(item) for item in scheduled],
+            unscheduled=[item.task_id for item in sorted(self.unscheduled.values(), key=lambda item: item.key)],
+            free_slots=[(self._at(slot.start), self._at(slot.end)) for slot in self.slots],
+            weighted_lateness=sum(item.lateness_cost(item.end) for item in scheduled),
+            improvements=self.improvements
+        )
+
+    def set_task_instances(self, task_id: str, instances: Iterable[Mapping[str, Any]]) -> PlanChange:
+        """Replace a task's items: the task itself, the occurrences of a recurring task, or nothing to drop it"""
+        new = {str(instance['id']): instance for instance in instances}
+        freed: Set[_Slot] = set()
+
+        for item_id in self._instances.pop(task_id, []):
+            if item_id not in new:
+                self._remove_item(item_id, freed)
+
+        for item_id, instance in new.items():
+            old = self.items.get(item_id)
+            item = self.new_item(instance, index=old.key[3] if old else None)
+            if old is not None:
+                if old.key == item.key:
+                    old.title, old.priority = item.title, item.priority
+                    if old.slot is not None:
+                        self._changed.add(item_id)
+                    continue
+                self._remove_item(item_id, freed)
+            self.items[item_id] = item
+            self._place(item)
+
+        if new:
+            self._instances[task_id] = list(new)
+        self._fill(freed)
+        return self._flush()
+
+    def upsert_event(self, event_id: str, start: datetime, end: datetime) -> PlanChange:
+        """Add or move a calendar event and repair the days it leaves and enters"""
+        days = self._remove_event(event_id)
+        start, end = to_naive(start), to_naive(end)
+        if end > start:
+            days |= self._add_event(event_id, start, end)
+        self._rebuild_days(days)
+        return self._flush()
+
+    def remove_event(self, event_id: str) -> PlanChange:
+        self._rebuild_days(self._remove_event(event_id))
+        return self._flush()
+
+    def _at(self, minutes: int) -> datetime:
+        return self.origin + timedelta(minutes=minutes)
+
+    def _block(self, item: _Item) -> ScheduledBlock:
+        return ScheduledBlock(
+            task_id=item.task_id,
+            title=item.title,
+            start=self._at(item.end - item.duration),
+            end=self._at(item.end),
+            priority=item.priority,
+            due=self._at(item.due) if item.due != NO_DUE else None
+        )
+
+    def _flush(self) -> PlanChange:
+        change = PlanChange(
+            blocks=sorted(
+                (self._block(self.items[item_id]) for item_id in self._changed if item_id in self.items and self.items[item_id].slot is not None),
+                key=lambda block: block.start
+            ),
+            removed=sorted(item_id for item_id in self._removed if item_id not in self.items or self.items[item_id].slot is None)
+        )
+        self._changed, self._removed = set(), set()
+        return change
+
+    def _reassign(self, slot: _Slot, items: List[_Item]):
+        """Repack a slot, noting every item whose block moved"""
+        previous = {item.task_id: item.end for item in items}
+        was_here = {item.task_id for item in slot.items}
+        slot.assign(items, self.scheduler.buffer)
+        for item in items:
+            if item.task_id not in was_here or item.end != previous[item.task_id]:
+                self._changed.add(item.task_id)
+
+    def _place(self, item: _Item, position: int = 0) -> bool:
+        """First fit from the slot at position on; unplaced items join unscheduled"""
+        need = item.duration + self.scheduler.buffer
+        for slot in self.slots[position:]:
+            if slot.free >= need:
+                self._reassign(slot, sorted(slot.items + [item], key=lambda other: other.key))
+                self.unscheduled.pop(item.task_id, None)
+                return True
+        item.slot = None
+        self.unscheduled[item.task_id] = item
+        self._removed.add(item.task_id)
+        return False
+
+    def _remove_item(self, item_id: str, freed: Set[_Slot]):
+        item = self.items.pop(item_id)
+        self.unscheduled.pop(item_id, None)
+        self._removed.add(item_id)
+        if item.slot is not None:
+            slot, item.slot = item.slot, None
+            self._reassign(slot, [other for other in slot.items if other is not item])
+            freed.add(slot)
+
+    def _fill(self, freed: Iterable[_Slot]):
+        """Offer freed time to tasks that did not fit, most important first"""
+        freed = sorted(freed, key=lambda slot: slot.start)
+        if not freed or not self.unscheduled:
+            return
+        waiting = sorted(self.unscheduled.values(), key=lambda item: (-item.weight, item.key))
+        for item in waiting[:self.scheduler.max_candidates]:
+            need = item.duration + self.scheduler.buffer
+            slot = next((slot for slot in freed if slot.free >= need), None)
+            if slot is not None:
+                self._reassign(slot, sorted(slot.items + [item], key=lambda other: other.key))
+                del self.unscheduled[item.task_id]
+
+    def _event_days(self, start: int, end: int) -> List[date]:
+        minute_of_day = self.origin.hour * 60 + self.origin.minute
+        first, last = (minute_of_day + start) // MINUTES_PER_DAY, (minute_of_day + max(end - 1, start)) // MINUTES_PER_DAY
+        origin_day = self.origin.date()
+        return [origin_day + timedelta(days=offset) for offset in range(first, last + 1)]
+
+    def _add_event(self, event_id: str, start: datetime, end: datetime) -> Set[date]:
+        span = (_offset(start, self.origin), _offset(end, self.origin, round_up=True))
+        self.events[event_id] = span
+        days = set(self._event_days(*span))
+        for day in days:
+            self._events_by_day[day].add(event_id)
+        return days
+
+    def _remove_event(self, event_id: str) -> Set[date]:
+        span = self.events.pop(event_id, None)
+        if span is None:
+            return set()
+        days = set(self._event_days(*span))
+        for day in days:
+            self._events_by_day[day].discard(event_id)
+        return days
+
+    def _rebuild_days(self, days: Iterable[date]):
+        scheduler = self.scheduler
+        for day in sorted(days):
+            window_start, window_end = scheduler._day_window(day, self.origin, self.limit)
+            if window_start >= window_end:
+                continue
+
+            lo = bisect_left(self._slot_starts, window_start)
+            hi = bisect_left(self._slot_starts, window_end)
+            displaced = sorted((item for slot in self.slots[lo:hi] for item in slot.items), key=lambda item: item.key)
+
+            busy = _merge_intervals(self.events[event_id] for event_id in self._events_by_day[day])
+            new_slots = [
+                _Slot(lo, s, e, scheduler.buffer)
+                for s, e in scheduler._day_free_minutes(day, self.origin, self.limit, busy)
+            ]
+            self.slots[lo:hi] = new_slots
+            self._slot_starts[lo:hi] = [slot.start for slot in new_slots]
+            for index in range(lo, len(self.slots)):
+                self.slots[index].index = index
+
+            # Displaced tasks keep their old end until placed, so unmoved blocks are not reported
+            for item in displaced:
+                item.slot = None
+                self._place(item, lo)
+            self._fill(new_slots)
+
+class TaskScheduler:
+    """Place tasks into the free time around calendar events
+
+    Working hours on working days, minus busy events, give the free slots.
+    Tasks are placed greedily, earliest deadline first with priority as the
+    tie-break, each into the first slot it fits. A bounded local search then
+    moves or swaps late tasks into earlier slots and lets higher-priority
+    tasks that did not fit displace lower-priority ones, accepting only
+    changes that reduce weighted lateness. There is no randomness or time
+    budget, so the same input always gives the same schedule.
+    """
+
+    def __init__(
+        self,
+        work_start: time = time(9, 0),
+        work_end: time = time(17, 0),
+        workdays: Iterable[int] = (0, 1, 2, 3, 4),
+        buffer_minutes: int = 0,
+        granularity_minutes: int = 15,
+        max_passes: int = 3,
+        max_candidates: int = 32
+    ):
+        if work_end <= work_start:
+            raise ValueError("Working hours must end after they start")
+        self.work_start = work_start
+        self.work_end = work_end
+        self.workdays = frozenset(workdays)
+        self.buffer = buffer_minutes
+        self.granularity = granularity_minutes
+        self.max_passes = max_passes
+        self.max_candidates = max_candidates
+
+    def plan(
+        self,
+        tasks: Iterable[Mapping[str, Any]],
+        events: Iterable[Mapping[str, Any]] = (),
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> "SchedulePlan":
+        """Schedule task dicts (id, title, priority, due_date, estimated_duration)
+
+        Events are dicts with ISO "start" and "end" and optionally an "id".
+        The horizon runs from start (default now, rounded up to the
+        granularity) to end (default a week later). Aware datetimes are
+        converted to UTC; naive ones are taken as already in the calendar's
+        time zone. The returned plan can be repaired in place as tasks and
+        events change.
+        """
+        origin = self._round_up(to_naive(start or datetime.now()))
+        horizon_end = to_naive(end) if end else origin + timedelta(days=7)
+
+        plan = SchedulePlan(self, origin, horizon_end, events)
+        items = [plan.new_item(task) for task in tasks]
+        unscheduled = self._place_greedy(items, plan.slots)
+        plan.improvements = self._local_search(items, plan.slots, unscheduled)
+        plan.register(items, unscheduled)
+        return plan
+
+    def schedule(
+        self,
+        tasks: Iterable[Mapping[str, Any]],
+        events: Iterable[Mapping[str, Any]] = (),
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Schedule:
+        """One-off schedule; see plan"""
+        return self.plan(tasks, events, start, end).schedule()
+
+    def free_intervals(
+        self,
+        start: datetime,
+        end: datetime,
+        busy: Iterable[Tuple[datetime, datetime]]
+    ) -> List[Tuple[datetime, datetime]]:
+        """Working time between start and end not covered by any busy interval"""
+        origin = to_naive(start)
+        busy_minutes = [(_offset(to_naive(b_start), origin), _offset(to_naive(b_end), origin, round_up=True)) for b_start, b_end in busy]
+        return [
+            (origin + timedelta(minutes=s), origin + timedelta(minutes=e))
+            for s, e in self._free_minutes(origin, to_naive(end), busy_minutes)
+        ]
+
+    def _round_up(self, moment: datetime) -> datetime:
+        partial_minute = moment.second or moment.microsecond
+        moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1 if partial_minute else 0)
+        overshoot = moment.minute % self.granularity
+        return moment + timedelta(minutes=self.granularity - overshoot) if overshoot else moment
+
+    def _free_minutes(self, origin: datetime, horizon_end: datetime, busy: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Free (start, end) minute offsets over every working day of the horizon"""
+        merged = _merge_intervals(busy)
+        limit = _offset(horizon_end, origin)
+        free: List[Tuple[int, int]] = []
+        day = origin.date()
+        while _offset(datetime.combine(day, self.work_start), origin) < limit:
+            free.extend(self._day_free_minutes(day, origin, limit, merged))
+            day += timedelta(days=1)
+        return free
+
+    def _day_window(self, day: date, origin: datetime, limit: int) -> Tuple[int, int]:
+        """Working hours of a day as minute offsets, clipped to the horizon; empty on days off"""
+        if day.weekday() not in self.workdays:
+            return 0, 0
+        return (
+            max(_offset(datetime.combine(day, self.work_start), origin), 0),
+            min(_offset(datetime.combine(day, self.work_end), origin), limit)
+        )
+
+    def _day_free_minutes(self, day: date, origin: datetime, limit: int, merged: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Free intervals of one working day, sweeping the merged busy intervals that reach into it"""
+        cursor, window_end = self._day_window(day, origin, limit)
+        free: List[Tuple[int, int]] = []
+        scan = bisect_right(merged, (cursor, cursor))
+        if scan and merged[scan - 1][1] > cursor:
+            scan -= 1
+        while cursor < window_end:
+            if scan < len(merged) and merged[scan][0] < window_end:
+                if merged[scan][0] > cursor:
+                    free.append((cursor, merged[scan][0]))
+                cursor = max(cursor, merged[scan][1])
+                scan += 1
+            else:
+                free.append((cursor, window_end))
+                break
+        return free
+
+    def _to_item(self, index: int, task: Mapping[str, Any], origin: datetime) -> "_Item":
+        due = NO_DUE
+        if task.get('due_date'):
+            due_at = parse_datetime(task['due_date'], default_time=self.work_end)
+            if due_at is not None:
+                due = _offset(due_at, origin)
+        duration = task.get('estimated_duration') or DEFAULT_DURATION
+        return _Item(
+            index,
+            str(task.get('id') or index),
+            task.get('title') or '',
+            task.get('priority') or 'medium',
+            max(int(duration), 1),
+            due
+        )
+
+    def _place_greedy(self, items: List["_Item"], slots: List["_Slot"]) -> List["_Item"]:
+        """First fit in key order; returns the tasks that fit nowhere"""
+        if not items:
+            return []
+        unscheduled = []
+        smallest = min(item.duration for item in items) + self.buffer
+        first_open = 0
+
+        for item in sorted(items, key=lambda item: item.key):
+            need = item.duration + self.buffer
+            while first_open < len(slots) and slots[first_open].free < smallest:
+                first_open += 1
+            index = first_open
+            while index < len(slots) and slots[index].free < need:
+                index += 1
+            if index == len(slots):
+                unscheduled.append(item)
+                continue
+            # Items arrive in key order, so appending keeps every slot sorted
+            slot = slots[index]
+            item.slot, item.end = slot, slot.end - slot.free + self.buffer + item.duration
+            slot.items.append(item)
+            slot.free -= need
+        return unscheduled
+
+    def _local_search(self, items: List["_Item"], slots: List["_Slot"], unscheduled: List["_Item"]) -> int:
+        improvements = 0
+        for _ in range(self.max_passes):
+            moved = 0
+            late = sorted((item for item in items if item.slot is not None and item.end > item.due), key=lambda item: item.key)
+            for item in late:
+                if item.end > item.due and self._improve_late(item, slots):
+                    moved += 1
+            moved += self._admit_unscheduled(items, unscheduled)
+            improvements += moved
+            if not moved:
+                break
+        return improvements
+
+    def _improve_late(self, item: "_Item", slots: List["_Slot"]) -> bool:
+        """Move or swap a late task into an earlier slot if that lowers total lateness"""
+        home = item.slot
+        need = item.duration + self.buffer
+        home_cost = home.cost(home.items, self.buffer)
+        home_without = [other for other in home.items if other is not item]
+        checked = 0
+
+        for slot in reversed(slots[:home.index]):
+            if checked >= self.max_candidates:
+                break
+            checked += 1
+            before = home_cost + slot.cost(slot.items, self.buffer)
+
+            if slot.free >= need:
+                target = sorted(slot.items + [item], key=lambda other: other.key)
+                if slot.cost(target, self.buffer) + home.cost(home_without, self.buffer) < before:
+                    slot.assign(target, self.buffer)
+                    home.assign(home_without, self.buffer)
+                    return True
+
+            for other in slot.items:
+                if other.weight >= item.weight and other.due <= item.due:
+                    continue
+                other_need = other.duration + self.buffer
+                if slot.free + other_need < need or home.free + need < other_need:
+                    continue
+                target = sorted([x for x in slot.items if x is not other] + [item], key=lambda x: x.key)
+                home_target = sorted(home_without + [other], key=lambda x: x.key)
+                if slot.cost(target, self.buffer) + home.cost(home_target, self.buffer) < before:
+                    slot.assign(target, self.buffer)
+                    home.assign(home_target, self.buffer)
+                    return True
+        return False
+
+    def _admit_unscheduled(self, items: List["_Item"], unscheduled: List["_Item"]) -> int:
+        """Let unscheduled tasks displace scheduled tasks of lower priority"""
+        if not unscheduled:
+            return 0
+        admitted = 0
+        # Cheapest to evict first: lowest priority, then latest key
+        evictable = sorted(
+            (item for item in items if item.slot is not None),
+            key=lambda item: (item.weight, tuple(-part for part in item.key))
+        )
+        for item in sorted(unscheduled, key=lambda item: (-item.weight, item.key)):
+            need = item.duration + self.buffer
+            checked = 0
+            for other in evictable:
+                if other.weight >= item.weight or checked >= self.max_candidates:
+                    break
+                if other.slot is None:
+                    continue
+                checked += 1
+                slot = other.slot
+                if slot.free + other.duration + self.buffer < need:
+                    continue
+                slot.assign(sorted([x for x in slot.items if x is not other] + [item], key=lambda x: x.key), self.buffer)
+                other.slot = None
+                unscheduled.remove(item)
+                unscheduled.append(other)
+                admitted += 1
+                break
+        return admitted
+
+def _offset(moment: datetime, origin: datetime, round_up: bool = False) -> int:
+    """Whole minutes from origin; busy ends round up so blocks never overlap an event"""
+    seconds = (moment - origin).total_seconds()
+    return int(-(-seconds // 60)) if round_up else int(seconds // 60)
+
+def _merge_intervals(intervals: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
@@ -2,17 +2,62 @@
 Enhanced task validation and processing utilities
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, FrozenSet, Mapping, NamedTuple, Optional, Sequence, Set, Tuple, Union
 from datetime import datetime, timedelta
 import re
 from enum import Enum
 import logging
 
+import numpy as np
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.lexicon import Lexicon, load_lexicon
+from utils.temporal import parse_due_date, parse_due_time
+from utils.transcript_analysis import TranscriptAnalysis
+
+PRIORITY_SCORES = {
+    'low': 0.2,
+    'medium': 0.5,
+    'high': 0.7,
+    'urgent': 0.9
+}
+
 class ValidationSeverity(str, Enum):
     INFO = "info"
     WARNING = "warning"
     ERROR = "error"
 
+# Findings shared by the single-task and batch validation paths
+TITLE_MISSING = ("title", "Title is too short or missing", ValidationSeverity.ERROR, "Extract the main action from the transcript")
+TITLE_TOO_LONG = ("title", "Title is too long", ValidationSeverity.WARNING, "Keep titles under 100 characters for better readability")
+DESCRIPTION_TOO_LONG = ("description", "Description is too long", ValidationSeverity.WARNING, "Keep descriptions under 1000 characters")
+PAST_DUE_DATE = ("due_date", "Due date is in the past", ValidationSeverity.WARNING, "Check if this date is correct")
+INVALID_DUE_DATE = ("due_date", "Invalid date format", ValidationSeverity.ERROR, "Use ISO format (YYYY-MM-DD)")
+INVALID_DUE_TIME = ("due_time", "Invalid time format", ValidationSeverity.ERROR, "Use HH:MM format (24-hour)")
+PAST_DUE_DATETIME = ("due_datetime", "Due date and time is in the past", ValidationSeverity.WARNING, "Verify the intended date and time")
+INVALID_DURATION = ("estimated_duration", "Duration must be a number of minutes", ValidationSeverity.ERROR, "Give the duration in minutes, e.g. 30")
+DURATION_TOO_SHORT = ("estimated_duration", "Duration must be at least 1 minute", ValidationSeverity.ERROR)
+DURATION_TOO_LONG = ("estimated_duration", "Duration seems very long (over 8 hours)", ValidationSeverity.WARNING, "Consider breaking this into smaller tasks")
+TOO_MANY_TAGS = ("tags", "Too many tags", ValidationSeverity.WARNING, "Limit to 10 most relevant tags")
+
+SUGGEST_ACTION_VERB = "Consider starting the title with an action verb like 'Create', 'Review', or 'Call'"
+SUGGEST_SPECIFIC_TITLE = "Make the title more specific by replacing vague terms"
+SUGGEST_DESCRIPTION = "Consider adding a description with the additional details from your voice input"
+SUGGEST_RAISE_PRIORITY = "Consider increasing priority - your language suggests this is urgent"
+SUGGEST_LOWER_PRIORITY = "Consider lowering priority - no urgency indicators detected"
+SUGGEST_CATEGORY = "Consider changing category to '{}' based on the content"
+SUGGEST_DUE_DATE = "You mentioned timing in your request - consider setting a due date"
+SUGGEST_DURATION = "Consider adding an estimated duration to help with scheduling"
+SUGGEST_REMOVE_INVALID_TAGS = "Remove empty or invalid tags"
+SUGGEST_TAGS = "Consider adding tags: {}"
+SUGGEST_DEADLINE = "High priority tasks should typically have deadlines"
+SUGGEST_PERSONAL_CATEGORY = "Double-check if this should be categorized as 'personal'"
+
+NO_ACTION_VERB = ("No action verb in title", -0.1)
+VAGUE_TITLE = ("Vague language in title", -0.2)
+PRIORITY_MISMATCH = ("Priority mismatch", -0.1)
+TIME_WITHOUT_DUE_DATE = ("Time mentioned but no due date", -0.1)
+
 class ValidationResult:
     def __init__(self):
         self.is_valid = True
@@ -37,274 +82,493 @@ class ValidationResult:
     def adjust_confidence(self, reason: str, adjustment: float):
         self.confidence_adjustments.append((reason, adjustment))
 
+NO_DATETIME = np.iinfo(np.int64).max
+
+def _datetime_micros(value: datetime) -> int:
+    """Naive datetime as integer microseconds since 0001-01-01, for exact comparisons"""
+    return (value.toordinal() * 86400 + value.hour * 3600 + value.minute * 60 + value.second) * 1000000 + value.microsecond
+
+def _duration_minutes(duration: Any) -> Optional[float]:
+    """Estimated duration as a number of minutes
+
+    Numeric strings are accepted, as the task models accept them; anything
+    else that is not a number raises TypeError.
+    """
+    if duration is None or isinstance(duration, (int, float)):
+        return duration
+    if isinstance(duration, str):
+        try:
+            return float(duration)
+        except ValueError:
+            pass
+    raise TypeError(f"estimated_duration must be a number of minutes, got {duration!r}")
+
+class ValidatorVocabulary:
+    """Keyword sets, matchers and hit-matrix layout TaskValidator derives from a lexicon
+
+    Built once per lexicon and shared by every TaskValidator using it.
+    """
+
+    def __init__(self, lexicon: Lexicon):
+        self.common_verbs = frozenset(lexicon['common_verbs'])
+        self.urgency_indicators = lexicon['urgency_indicators']
+        self.time_indicators = lexicon['time_indicators']
+        self.category_keywords = lexicon['category_keywords']
+        self.vague_words = lexicon['vague_words']
+        self.duration_indicators = lexicon['duration_indicators']
+        self.personal_indicators = lexicon['personal_indicators']
+
+        # Tag vocabularies
+        self.tech_keywords = lexicon['tech_keywords']
+        self.action_keywords = lexicon['action_keywords']
+        self.context_tags = lexicon['context_tags']
+
+        # Every transcript vocabulary is compiled into one matcher so each
+        # transcript is scanned once per validation instead of once per keyword
+        transcript_sections = (
+            'urgency_indicators', 'time_indicators', 'duration_indicators', 'personal_indicators',
+            'tech_keywords', 'action_keywords', 'context_tags', 'category_keywords'
+        )
+        self.transcript_matcher = lexicon.matcher(*transcript_sections)
+        self.title_matcher = lexicon.matcher('vague_words')
+
+        # Column layout of the keyword-hit matrix used by validate_tasks
+        self.vocabulary = sorted(lexicon.keywords(*transcript_sections))
+        self.vocabulary_index = {keyword: i for i, keyword in enumerate(self.vocabulary)}
+        self.urgency_weights = self._keyword_vector(self.urgency_indicators)
+        self.time_mask = self._keyword_vector(self.time_indicators) > 0
+        self.duration_mask = self._keyword_vector(self.duration_indicators) > 0
+        self.personal_mask = self._keyword_vector(self.personal_indicators) > 0
+        self.tag_vocabulary = frozenset(self.tech_keywords) | frozenset(self.action_keywords) | frozenset(self.context_tags)
+        self.category_names = list(self.category_keywords)
+        self.category_matrix = np.stack(
+            [self._keyword_vector(keywords) for keywords in self.category_keywords.values()], axis=1
+        ).astype(np.int32)
+
+        # Shared between validators, so never modified in place
+        for array in (self.urgency_weights, self.time_mask, self.duration_mask, self.personal_mask, self.category_matrix):
+            array.flags.writeable = False
+
+    def _keyword_vector(self, keywords) -> np.ndarray:
+        """Vocabulary-aligned vector of keyword weights (1.0 for plain lists)"""
+        vector = np.zeros(len(self.vocabulary))
+        weights = keywords if isinstance(keywords, Mapping) else dict.fromkeys(keywords, 1.0)
+        for keyword, weight in weights.items():
+            vector[self.vocabulary_index[keyword]] = weight
+        return vector
+
 class TaskValidator:
     """Comprehensive task validation with smart suggestions"""
     
-    def __init__(self):
-        self.common_verbs = {
-            'create', 'make', 'build', 'develop', 'design', 'write', 'draft',
-            'review', 'check', 'verify', 'validate', 'test', 'analyze',
-            'call', 'contact', 'reach out', 'email', 'message', 'notify',
-            'schedule', 'plan', 'organize', 'arrange', 'book', 'reserve',
-            'finish', 'complete', 'finalize', 'submit', 'deliver', 'send',
-            'research', 'study', 'learn', 'investigate', 'explore',
-            'fix', 'repair', 'solve', 'resolve', 'troubleshoot',
-            'update', 'modify', 'change', 'edit', 'revise', 'improve'
-        }
-        
-        self.urgency_indicators = {
-            'urgent': 0.9,
-            'asap': 0.9,
-            'immediately': 0.9,
-            'critical': 0.8,
-            'important': 0.7,
-            'priority': 0.7,
-            'soon': 0.6,
-            'deadline': 0.8,
-            'due': 0.6
-        }
-        
-        self.time_indicators = {
-            'today': 0.8,
-            'tomorrow': 0.7,
-            'this week': 0.6,
-            'next week': 0.5,
-            'monday': 0.7,
-            'tuesday': 0.7,
-            'wednesday': 0.7,
-            'thursday': 0.7,
-            'friday': 0.7,
-            'weekend': 0.6
-        }
-
-    def validate_task(self, task_data: Dict[str, Any], transcript: str) -> ValidationResult:
+    def __init__(self, lexicon: Optional[Lexicon] = None):
+        self.lexicon = lexicon or load_lexicon()
+        vocabulary = self.lexicon.compiled(ValidatorVocabulary, lambda: ValidatorVocabulary(self.lexicon))
+
+        self.common_verbs = vocabulary.common_verbs
+        self.urgency_indicators = vocabulary.urgency_indicators
+        self.time_indicators = vocabulary.time_indicators
+        self.category_keywords = vocabulary.category_keywords
+        self.vague_words = vocabulary.vague_words
+        self.duration_indicators = vocabulary.duration_indicators
+        self.personal_indicators = vocabulary.personal_indicators
+        self.tech_keywords = vocabulary.tech_keywords
+        self.action_keywords = vocabulary.action_keywords
+        self.context_tags = vocabulary.context_tags
+        self.transcript_matcher = vocabulary.transcript_matcher
+        self.title_matcher = vocabulary.title_matcher
+
+        self.vocabulary = vocabulary.vocabulary
+        self._vocabulary_index = vocabulary.vocabulary_index
+        self._urgency_weights = vocabulary.urgency_weights
+        self._time_mask = vocabulary.time_mask
+        self._duration_mask = vocabulary.duration_mask
+        self._personal_mask = vocabulary.personal_mask
+        self._tag_vocabulary = vocabulary.tag_vocabulary
+        self._category_names = vocabulary.category_names
+        self._category_matrix = vocabulary.category_matrix
+
+    def validate_task(self, task_data: Dict[str, Any], transcript: Union[str, TranscriptAnalysis]) -> ValidationResult:
         """Comprehensive task validation"""
         result = ValidationResult()
+
+        # Scan the transcript once; validators read the keyword hits
+        analysis = TranscriptAnalysis.of(transcript)
+        hits = analysis.keyword_hits(self.transcript_matcher)
         
         # Validate title
-        self._validate_title(task_data.get('title', ''), transcript, result)
+        self._validate_title(task_data.get('title', ''), result)
         
         # Validate description
-        self._validate_description(task_data.get('description', ''), transcript, result)
+        self._validate_description(task_data.get('description', ''), analysis, result)
         
         # Validate priority
-        self._validate_priority(task_data.get('priority', ''), transcript, result)
+        self._validate_priority(task_data.get('priority', ''), hits, result)
         
         # Validate category
-        self._validate_category(task_data.get('category', ''), transcript, result)
+        self._validate_category(task_data.get('category', ''), hits, result)
         
         # Validate dates and times
-        self._validate_temporal_data(task_data, transcript, result)
+        self._validate_temporal_data(task_data, hits, result)
         
         # Validate duration
-        self._validate_duration(task_data.get('estimated_duration'), transcript, result)
+        self._validate_duration(task_data.get('estimated_duration'), hits, result)
         
         # Validate tags
-        self._validate_tags(task_data.get('tags', []), transcript, result)
+        self._validate_tags(task_data.get('tags', []), hits, result)
         
         # Cross-field validation
-        self._validate_consistency(task_data, transcript, result)
+        self._validate_consistency(task_data, hits, result)
         
         # Calculate final confidence score
-        self._calculate_final_confidence(task_data, transcript, result)
+        self._calculate_final_confidence(task_data, result)
         
         return result
 
-    def _validate_title(self, title: str, transcript: str, result: ValidationResult):
+    def validate_tasks(self, batch: Sequence[Tuple[Dict[str, Any], Union[str, TranscriptAnalysis]]]) -> List[ValidationResult]:
+        """Validate many (task_data, transcript) pairs at once
+
+        Returns the same ValidationResult per task as validate_task, and
+        updates each task's confidence_score the same way, but works column by
+        column: keyword hits form a tasks x vocabulary matrix and the priority,
+        category, date, duration and confidence checks are NumPy array
+        operations. Confidence adjustments are not logged per task.
+        """
+        count = len(batch)
+        if count == 0:
+            return []
+
+        tasks = [task_data for task_data, _ in batch]
+        analyses = [TranscriptAnalysis.of(transcript) for _, transcript in batch]
+
+        # Keyword hits as a boolean matrix
+        hit_sets = [analysis.keyword_hits(self.transcript_matcher) for analysis in analyses]
+        hit_matrix = np.zeros((count, len(self.vocabulary)), dtype=bool)
+        for row, hits in enumerate(hit_sets):
+            if hits:
+                hit_matrix[row, [self._vocabulary_index[keyword] for keyword in hits]] = True
+
+        # Title and description columns
+        titles = [task.get('title', '') for task in tasks]
+        title_ok = np.array([bool(title) and len(title.strip()) >= 3 for title in titles])
+        titles_lower = [title.lower() if ok else '' for title, ok in zip(titles, title_ok.tolist())]
+        no_verb = title_ok & np.array([bool(words) and words[0] not in self.common_verbs for words in (t.split() for t in titles_lower)])
+        title_too_long = title_ok & np.array([len(title) > 100 if ok else False for title, ok in zip(titles, title_ok.tolist())])
+        vague_title = title_ok & np.array([bool(self.title_matcher.find(t)) if t else False for t in titles_lower])
+
+        descriptions = [task.get('description', '') for task in tasks]
+        has_description = np.array([bool(description) for description in descriptions])
+        description_too_long = has_description & np.array([len(d) > 1000 if d else False for d in descriptions])
+        # Only whether there are more than 10 words matters, so stop splitting there
+        wants_description = ~has_description & np.array([len(analysis.text.split(None, 10)) > 10 for analysis in analyses])
+
+        # Priority against urgency language
+        detected_urgency = (hit_matrix * self._urgency_weights).max(axis=1)
+        assigned_score = np.array([PRIORITY_SCORES.get(task.get('priority', ''), 0.5) for task in tasks])
+        raise_priority = (detected_urgency > 0.7) & (assigned_score < 0.6)
+        lower_priority = ~raise_priority & (detected_urgency < 0.3) & (assigned_score > 0.7)
+
+        # Best category is the first with the most keyword hits
+        category_scores = hit_matrix.astype(np.int32) @ self._category_matrix
+        best_category = category_scores.argmax(axis=1)
+        categories = [task.get('category', '') for task in tasks]
+        category_mismatch = (category_scores.max(axis=1) > 0) & np.array(
+            [self._category_names[best] != category for best, category in zip(best_category.tolist(), categories)]
+        )
+
+        # Dates and times
+        due_dates = [task.get('due_date') for task in tasks]
+        due_times = [task.get('due_time') for task in tasks]
+        has_due_date = np.array([bool(due_date) for due_date in due_dates])
+        has_due_time = np.array([bool(due_time) for due_time in due_times])
+        time_without_date = hit_matrix[:, self._time_mask].any(axis=1) & ~has_due_date
+
+        now = datetime.now()
+        date_ordinals, date_invalid = self._parse_due_dates(due_dates)
+        past_due_date = has_due_date & ~date_invalid & (date_ordinals < now.date().toordinal())
+        invalid_due_time = has_due_time & np.array([parse_due_time(t) is None if t else False for t in due_times])
+        due_micros = self._due_datetime_micros(due_dates, due_times, has_due_date & has_due_time)
+        past_due_datetime = due_micros < _datetime_micros(now)
+
+        # Duration bounds
+        durations = []
+        duration_invalid = np.zeros(count, dtype=bool)
+        for row, task in enumerate(tasks):
+            try:
+                durations.append(_duration_minutes(task.get('estimated_duration')))
+            except TypeError:
+                # Reported on this task alone; NaN fails both bounds checks
+                durations.append(np.nan)
+                duration_invalid[row] = True
+        duration_missing = np.array([duration is None for duration in durations])
+        duration_values = np.array([np.nan if duration is None else duration for duration in durations], dtype=float)
+        duration_too_short = duration_values < 1
+        duration_too_long = duration_values > 480
+        wants_duration = duration_missing & hit_matrix[:, self._duration_mask].any(axis=1)
+
+        # Cross-field consistency
+        wants_deadline = np.array([task.get('priority', 'medium') in ['urgent', 'high'] for task in tasks]) & ~has_due_date
+        maybe_personal = np.array([task.get('category', 'work') == 'work' for task in tasks]) & hit_matrix[:, self._personal_mask].any(axis=1)
+
+        # Confidence: adjustments are applied in the same order as validate_task
+        confidence = np.array([task.get('confidence_score', 0.5) for task in tasks], dtype=float)
+        for flags, (_, adjustment) in (
+            (no_verb, NO_ACTION_VERB),
+            (vague_title, VAGUE_TITLE),
+            (raise_priority | lower_priority, PRIORITY_MISMATCH),
+            (time_without_date, TIME_WITHOUT_DUE_DATE),
+        ):
+            confidence = confidence + np.where(flags, adjustment, 0.0)
+
+        completeness_bonus = np.zeros(count)
+        for field, bonus in (('title', 0.1), ('description', 0.05), ('due_date', 0.05), ('estimated_duration', 0.05), ('tags', 0.05)):
+            completeness_bonus = completeness_bonus + np.where([bool(task.get(field)) for task in tasks], bonus, 0.0)
+        final_confidence = np.minimum(1.0, np.maximum(0.0, confidence + completeness_bonus)).tolist()
+
+        # Assemble results in validate_task's order
+        columns = zip(
+            title_ok.tolist(), no_verb.tolist(), title_too_long.tolist(), vague_title.tolist(),
+            description_too_long.tolist(), wants_description.tolist(),
+            raise_priority.tolist(), lower_priority.tolist(), category_mismatch.tolist(), best_category.tolist(),
+            time_without_date.tolist(), has_due_date.tolist(), date_invalid.tolist(), past_due_date.tolist(),
+            invalid_due_time.tolist(), past_due_datetime.tolist(),
+            duration_invalid.tolist(), duration_too_short.tolist(), duration_too_long.tolist(), wants_duration.tolist(),
+            wants_deadline.tolist(), maybe_personal.tolist()
+        )
+        results = []
+        tag_results: Dict[Tuple[Tuple, FrozenSet[str]], ValidationResult] = {}
+        for task, hits, final, row in zip(tasks, hit_sets, final_confidence, columns):
+            (ok, verb, too_long, vague, long_description, add_description,
+             raise_p, lower_p, mismatch, best, time_no_date, has_date, bad_date, past_date,
+             bad_time, past_datetime, bad_duration, short, long_duration, add_duration, deadline, personal) = row
+
+            result = ValidationResult()
+            if not ok:
+                result.add_issue(*TITLE_MISSING)
+            else:
+                if verb:
+                    result.add_suggestion(SUGGEST_ACTION_VERB)
+                    result.adjust_confidence(*NO_ACTION_VERB)
+                if too_long:
+                    result.add_issue(*TITLE_TOO_LONG)
+                if vague:
+                    result.add_suggestion(SUGGEST_SPECIFIC_TITLE)
+                    result.adjust_confidence(*VAGUE_TITLE)
+
+            if long_description:
+                result.add_issue(*DESCRIPTION_TOO_LONG)
+            if add_description:
+                result.add_suggestion(SUGGEST_DESCRIPTION)
+
+            if raise_p:
+                result.add_suggestion(SUGGEST_RAISE_PRIORITY)
+                result.adjust_confidence(*PRIORITY_MISMATCH)
+            elif lower_p:
+                result.add_suggestion(SUGGEST_LOWER_PRIORITY)
+                result.adjust_confidence(*PRIORITY_MISMATCH)
+
+            if mismatch:
+                result.add_suggestion(SUGGEST_CATEGORY.format(self._category_names[best]))
+
+            if time_no_date:
+                result.add_suggestion(SUGGEST_DUE_DATE)
+                result.adjust_confidence(*TIME_WITHOUT_DUE_DATE)
+            if has_date and bad_date:
+                result.add_issue(*INVALID_DUE_DATE)
+            elif past_date:
+                result.add_issue(*PAST_DUE_DATE)
+            if bad_time:
+                result.add_issue(*INVALID_DUE_TIME)
+            if past_datetime:
+                result.add_issue(*PAST_DUE_DATETIME)
+
+            if bad_duration:
+                result.add_issue(*INVALID_DURATION)
+            elif short:
+                result.add_issue(*DURATION_TOO_SHORT)
+            elif long_duration:
+                result.add_issue(*DURATION_TOO_LONG)
+            if add_duration:
+                result.add_suggestion(SUGGEST_DURATION)
+
+            # Tag findings depend only on the tags and the tag keywords hit,
+            # which repeat heavily across an import, so reuse them
+            tags = task.get('tags', [])
+            try:
+                tags_key = (tuple(tags), frozenset(hits & self._tag_vocabulary))
+                tag_result = tag_results.get(tags_key)
+            except TypeError:
+                tags_key = tag_result = None
+            if tag_result is None:
+                tag_result = ValidationResult()
+                self._validate_tags(tags, hits, tag_result)
+                if tags_key is not None:
+                    tag_results[tags_key] = tag_result
+            result.issues.extend(dict(issue) for issue in tag_result.issues)
+            result.suggestions.extend(tag_result.suggestions)
+
+            if deadline:
+                result.add_suggestion(SUGGEST_DEADLINE)
+            if personal:
+                result.add_suggestion(SUGGEST_PERSONAL_CATEGORY)
+
+            task['confidence_score'] = final
+            results.append(result)
+
+        return results
+
+    def _parse_due_dates(self, due_dates: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Date ordinals and invalid-format flags, parsing each distinct value once"""
+        parsed: Dict[str, Tuple[int, bool]] = {}
+        ordinals = np.zeros(len(due_dates), dtype=np.int64)
+        invalid = np.zeros(len(due_dates), dtype=bool)
+
+        for i, due_date in enumerate(due_dates):
+            if not due_date:
+                continue
+            if due_date not in parsed:
+                parsed_date = parse_due_date(due_date)
+                parsed[due_date] = (0, True) if parsed_date is None else (parsed_date.toordinal(), False)
+            ordinals[i], invalid[i] = parsed[due_date]
+
+        return ordinals, invalid
+
+    def _due_datetime_micros(self, due_dates: List[Any], due_times: List[Any], mask: np.ndarray) -> np.ndarray:
+        """Due date and time as microseconds since 0001-01-01, NO_DATETIME where unavailable"""
+        parsed: Dict[Tuple[Any, Any], int] = {}
+        micros = np.full(len(due_dates), NO_DATETIME, dtype=np.int64)
+
+        for i in np.flatnonzero(mask).tolist():
+            key = (due_dates[i], due_times[i])
+            if key not in parsed:
+                parsed_date, parsed_time = parse_due_date(due_dates[i]), parse_due_time(due_times[i])
+                if parsed_date is None or parsed_time is None:
+                    parsed[key] = NO_DATETIME
+                else:
+                    parsed[key] = _datetime_micros(datetime.combine(parsed_date, parsed_time))
+            micros[i] = parsed[key]
+
+        return micros
+
+    def _validate_title(self, title: str, result: ValidationResult):
         """Validate and suggest improvements for task title"""
         if not title or len(title.strip()) < 3:
-            result.add_issue(
-                "title", 
-                "Title is too short or missing", 
-                ValidationSeverity.ERROR,
-                "Extract the main action from the transcript"
-            )
+            result.add_issue(*TITLE_MISSING)
             return
 
         # Check if title starts with action verb
-        title_words = title.lower().split()
+        title_lower = title.lower()
+        title_words = title_lower.split()
         if title_words and title_words[0] not in self.common_verbs:
-            result.add_suggestion(f"Consider starting the title with an action verb like 'Create', 'Review', or 'Call'")
-            result.adjust_confidence("No action verb in title", -0.1)
+            result.add_suggestion(SUGGEST_ACTION_VERB)
+            result.adjust_confidence(*NO_ACTION_VERB)
 
         # Check title length
         if len(title) > 100:
-            result.add_issue(
-                "title",
-                "Title is too long",
-                ValidationSeverity.WARNING,
-                "Keep titles under 100 characters for better readability"
-            )
+            result.add_issue(*TITLE_TOO_LONG)
 
         # Check for vague language
-        vague_words = ['something', 'stuff', 'things', 'it', 'that']
-        if any(word in title.lower() for word in vague_words):
-            result.add_suggestion("Make the title more specific by replacing vague terms")
-            result.adjust_confidence("Vague language in title", -0.2)
+        if self.title_matcher.find(title_lower):
+            result.add_suggestion(SUGGEST_SPECIFIC_TITLE)
+            result.adjust_confidence(*VAGUE_TITLE)
 
-    def _validate_description(self, description: str, transcript: str, result: ValidationResult):
+    def _validate_description(self, description: str, analysis: TranscriptAnalysis, result: ValidationResult):
         """Validate task description"""
         if description and len(description) > 1000:
-            result.add_issue(
-                "description",
-                "Description is too long",
-                ValidationSeverity.WARNING,
-                "Keep descriptions under 1000 characters"
-            )
+            result.add_issue(*DESCRIPTION_TOO_LONG)
 
         # Suggest adding description if transcript has details but description is empty
-        if not description and len(transcript.split()) > 10:
-            result.add_suggestion("Consider adding a description with the additional details from your voice input")
+        if not description and analysis.word_count > 10:
+            result.add_suggestion(SUGGEST_DESCRIPTION)
 
-    def _validate_priority(self, priority: str, transcript: str, result: ValidationResult):
+    def _validate_priority(self, priority: str, hits: Set[str], result: ValidationResult):
         """Validate priority assignment"""
-        transcript_lower = transcript.lower()
-        
         # Check if priority matches urgency indicators in transcript
         detected_urgency = 0.0
         for indicator, weight in self.urgency_indicators.items():
-            if indicator in transcript_lower:
+            if indicator in hits:
                 detected_urgency = max(detected_urgency, weight)
 
-        priority_scores = {
-            'low': 0.2,
-            'medium': 0.5,
-            'high': 0.7,
-            'urgent': 0.9
-        }
-
-        assigned_score = priority_scores.get(priority, 0.5)
+        assigned_score = PRIORITY_SCORES.get(priority, 0.5)
         
         # Check for mismatched priority
         if detected_urgency > 0.7 and assigned_score < 0.6:
-            result.add_suggestion("Consider increasing priority - your language suggests this is urgent")
-            result.adjust_confidence("Priority mismatch", -0.1)
+            result.add_suggestion(SUGGEST_RAISE_PRIORITY)
+            result.adjust_confidence(*PRIORITY_MISMATCH)
         elif detected_urgency < 0.3 and assigned_score > 0.7:
-            result.add_suggestion("Consider lowering priority - no urgency indicators detected")
-            result.adjust_confidence("Priority mismatch", -0.1)
+            result.add_suggestion(SUGGEST_LOWER_PRIORITY)
+            result.adjust_confidence(*PRIORITY_MISMATCH)
 
-    def _validate_category(self, category: str, transcript: str, result: ValidationResult):
+    def _validate_category(self, category: str, hits: Set[str], result: ValidationResult):
         """Validate category classification"""
-        transcript_lower = transcript.lower()
-        
-        # Category indicators
-        category_keywords = {
-            'work': ['meeting', 'project', 'client', 'presentation', 'report', 'email', 'colleague', 'boss', 'office'],
-            'personal': ['family', 'friend', 'personal', 'home', 'myself', 'self'],
-            'health': ['doctor', 'exercise', 'gym', 'medication', 'appointment', 'health', 'workout'],
-            'learning': ['study', 'learn', 'course', 'read', 'research', 'tutorial', 'book', 'education'],
-            'finance': ['budget', 'pay', 'bill', 'bank', 'money', 'investment', 'financial'],
-            'social': ['party', 'dinner', 'call', 'visit', 'social', 'event', 'friends'],
-            'household': ['clean', 'repair', 'maintenance', 'grocery', 'shopping', 'house', 'home'],
-            'creative': ['write', 'design', 'create', 'art', 'music', 'photo', 'creative']
-        }
-
         # Find best matching category
         best_match = None
         best_score = 0
         
-        for cat, keywords in category_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in transcript_lower)
+        for cat, keywords in self.category_keywords.items():
+            score = sum(1 for keyword in keywords if keyword in hits)
             if score > best_score:
                 best_score = score
                 best_match = cat
 
         # Suggest category change if mismatch
         if best_match and best_match != category and best_score > 0:
-            result.add_suggestion(f"Consider changing category to '{best_match}' based on the content")
+            result.add_suggestion(SUGGEST_CATEGORY.format(best_match))
 
-    def _validate_temporal_data(self, task_data: Dict[str, Any], transcript: str, result: ValidationResult):
+    def _validate_temporal_data(self, task_data: Dict[str, Any], hits: Set[str], result: ValidationResult):
         """Validate dates, times, and temporal consistency"""
         due_date = task_data.get('due_date')
         due_time = task_data.get('due_time')
-        transcript_lower = transcript.lower()
 
         # Check for time indicators in transcript
-        time_mentioned = any(indicator in transcript_lower for indicator in self.time_indicators.keys())
+        time_mentioned = any(indicator in hits for indicator in self.time_indicators)
         
         if time_mentioned and not due_date:
-            result.add_suggestion("You mentioned timing in your request - consider setting a due date")
-            result.adjust_confidence("Time mentioned but no due date", -0.1)
+            result.add_suggestion(SUGGEST_DUE_DATE)
+            result.adjust_confidence(*TIME_WITHOUT_DUE_DATE)
+
+        # Each value is parsed once and shared by the checks below
+        parsed_date = parse_due_date(due_date) if due_date else None
+        parsed_time = parse_due_time(due_time) if due_time else None
+        now = datetime.now()
 
         # Validate due date format and logic
         if due_date:
-            try:
-                parsed_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                if parsed_date.date() < datetime.now().date():
-                    result.add_issue(
-                        "due_date",
-                        "Due date is in the past",
-                        ValidationSeverity.WARNING,
-                        "Check if this date is correct"
-                    )
-            except ValueError:
-                result.add_issue(
-                    "due_date",
-                    "Invalid date format",
-                    ValidationSeverity.ERROR,
-                    "Use ISO format (YYYY-MM-DD)"
-                )
+            if parsed_date is None:
+                result.add_issue(*INVALID_DUE_DATE)
+            elif parsed_date < now.date():
+                result.add_issue(*PAST_DUE_DATE)
 
         # Validate due time
-        if due_time:
-            time_pattern = r'^([01]?[0-9]|2[0-3]):[0-5][0-9]$'
-            if not re.match(time_pattern, due_time):
-                result.add_issue(
-                    "due_time",
-                    "Invalid time format",
-                    ValidationSeverity.ERROR,
-                    "Use HH:MM format (24-hour)"
-                )
+        if due_time and parsed_time is None:
+            result.add_issue(*INVALID_DUE_TIME)
 
         # Check for time conflicts
-        if due_date and due_time:
-            try:
-                due_datetime = datetime.combine(
-                    datetime.fromisoformat(due_date).date(),
-                    datetime.strptime(due_time, "%H:%M").time()
-                )
-                if due_datetime < datetime.now():
-                    result.add_issue(
-                        "due_datetime",
-                        "Due date and time is in the past",
-                        ValidationSeverity.WARNING,
-                        "Verify the intended date and time"
-                    )
-            except:
-                pass
-
-    def _validate_duration(self, duration: Optional[int], transcript: str, result: ValidationResult):
+        if parsed_date and parsed_time and datetime.combine(parsed_date, parsed_time) < now:
+            result.add_issue(*PAST_DUE_DATETIME)
+
+    def _validate_duration(self, duration: Any, hits: Set[str], result: ValidationResult):
         """Validate estimated duration"""
+        try:
+            duration = _duration_minutes(duration)
+        except TypeError:
+            result.add_issue(*INVALID_DURATION)
+            return
+
         if duration is not None:
             if duration < 1:
-                result.add_issue(
-                    "estimated_duration",
-                    "Duration must be at least 1 minute",
-                    ValidationSeverity.ERROR
-                )
+                result.add_issue(*DURATION_TOO_SHORT)
             elif duration > 480:  # 8 hours
-                result.add_issue(
-                    "estimated_duration",
-                    "Duration seems very long (over 8 hours)",
-                    ValidationSeverity.WARNING,
-                    "Consider breaking this into smaller tasks"
-                )
+                result.add_issue(*DURATION_TOO_LONG)
 
         # Suggest duration if not provided
         if duration is None:
-            duration_indicators = ['quick', 'brief', 'long', 'detailed', 'thorough']
-            if any(indicator in transcript.lower() for indicator in duration_indicators):
-                result.add_suggestion("Consider adding an estimated duration to help with scheduling")
+            if any(indicator in hits for indicator in self.duration_indicators):
+                result.add_suggestion(SUGGEST_DURATION)
 
-    def _validate_tags(self, tags: List[str], transcript: str, result: ValidationResult):
+    def _validate_tags(self, tags: List[str], hits: Set[str], result: ValidationResult):
         """Validate and suggest tags"""
         if len(tags) > 10:
-            result.add_issue(
-                "tags",
-                "Too many tags",
-                ValidationSeverity.WARNING,
-                "Limit to 10 most relevant tags"
-            )
+            result.add_issue(*TOO_MANY_TAGS)
 
         # Check for empty or invalid tags
         valid_tags = []
@@ -313,16 +577,16 @@ class TaskValidator:
                 valid_tags.append(tag.strip().lower())
 
         if len(valid_tags) != len(tags):
-            result.add_suggestion("Remove empty or invalid tags")
+            result.add_suggestion(SUGGEST_REMOVE_INVALID_TAGS)
 
         # Suggest additional tags based on transcript
-        suggested_tags = self._extract_potential_tags(transcript)
+        suggested_tags = self._extract_potential_tags(hits)
         missing_tags = [tag for tag in suggested_tags if tag not in valid_tags]
         
         if missing_tags:
-            result.add_suggestion(f"Consider adding tags: {', '.join(missing_tags[:3])}")
+            result.add_suggestion(SUGGEST_TAGS.format(', '.join(missing_tags[:3])))
 
-    def _validate_consistency(self, task_data: Dict[str, Any], transcript: str, result: ValidationResult):
+    def _validate_consistency(self, task_data: Dict[str, Any], hits: Set[str], result: ValidationResult):
         """Validate consistency across fields"""
         priority = task_data.get('priority', 'medium')
         category = task_data.get('category', 'work')
@@ -330,13 +594,13 @@ class TaskValidator:
         
         # Check priority-deadline consistency
         if priority in ['urgent', 'high'] and not due_date:
-            result.add_suggestion("High priority tasks should typically have deadlines")
+            result.add_suggestion(SUGGEST_DEADLINE)
         
         # Check category-content consistency
-        if category == 'work' and any(word in transcript.lower() for word in ['personal', 'family', 'home']):
-            result.add_suggestion("Double-check if this should be categorized as 'personal'")
+        if category == 'work' and any(word in hits for word in self.personal_indicators):
+            result.add_suggestion(SUGGEST_PERSONAL_CATEGORY)
 
-    def _calculate_final_confidence(self, task_data: Dict[str, Any], transcript: str, result: ValidationResult):
+    def _calculate_final_confidence(self, task_data: Dict[str, Any], result: ValidationResult):
         """Calculate final confidence score with adjustments"""
         base_confidence = task_data.get('confidence_score', 0.5)
         
@@ -358,75 +622,124 @@ class TaskValidator:
         # Update task data
         task_data['confidence_score'] = final_confidence
 
-    def _extract_potential_tags(self, transcript: str) -> List[str]:
-        """Extract potential tags from transcript"""
+    def _extract_potential_tags(self, hits: Set[str]) -> List[str]:
+        """Extract potential tags from transcript keyword hits"""
         tags = []
-        transcript_lower = transcript.lower()
         
         # Technology tags
-        tech_keywords = ['api', 'database', 'frontend', 'backend', 'mobile', 'web', 'app']
-        tags.extend([keyword for keyword in tech_keywords if keyword in transcript_lower])
+        tags.extend([keyword for keyword in self.tech_keywords if keyword in hits])
         
         # Action tags
-        action_keywords = ['urgent', 'follow-up', 'research', 'planning', 'review']
-        tags.extend([keyword for keyword in action_keywords if keyword in transcript_lower])
+        tags.extend([keyword for keyword in self.action_keywords if keyword in hits])
         
         # Context tags
-        if 'meeting' in transcript_lower: tags.append('meeting')
-        if 'email' in transcript_lower: tags.append('communication')
-        if 'presentation' in transcript_lower: tags.append('presentation')
-        
-        return list(set(tags))[:5]  # Return unique tags, max 5
+        tags.extend([tag for keyword, tag in self.context_tags.items() if keyword in hits])
+        
+        return list(dict.fromkeys(tags))[:5]  # Return unique tags in keyword order, max 5
+
+# Checked in order; the first rule that matches wins. Each rule only runs
+# when the keyword scan found its trigger word
+DURATION_RULES = [
+    ('min', re.compile(r'\b(\d+)\s*min'), lambda m: int(m.group(1))),
+    ('hour', re.compile(r'\b(\d+)\s*hour'), lambda m: int(m.group(1)) * 60),
+    ('hour', re.compile(r'\bhalf\s*hour'), lambda m: 30),
+    ('hour', re.compile(r'\bquarter\s*hour'), lambda m: 15),
+    ('day', re.compile(r'\ball\s*day'), lambda m: 480),
+]
+
+# "remind me 30 minutes before", "remind me an hour ahead"
+REMINDER_PATTERN = re.compile(
+    r'\bremind\s+me\s+(?P<count>\d+|an?|one|two|three|four|five|ten|fifteen|thirty)\s*'
+    r'(?P<unit>min|hour|day)\w*\s+(?:before|early|ahead|in\s+advance)'
+)
+REMINDER_COUNTS = {
+    'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'ten': 10, 'fifteen': 15, 'thirty': 30
+}
+REMINDER_UNIT_MINUTES = {'min': 1, 'hour': 60, 'day': 1440}
+
+class EnhancementSignals(NamedTuple):
+    """What one scan of a transcript found for the enhancer"""
+    duration: Optional[int] = None
+    location: Optional[str] = None
+    recurring: Optional[str] = None
+    reminder_minutes: Optional[int] = None
 
 class SmartTaskEnhancer:
     """Enhance tasks with smart defaults and suggestions"""
     
-    def __init__(self):
-        self.duration_patterns = {
-            r'\b(\d+)\s*min': lambda m: int(m.group(1)),
-            r'\b(\d+)\s*hour': lambda m: int(m.group(1)) * 60,
-            r'\bhalf\s*hour': lambda m: 30,
-            r'\bquarter\s*hour': lambda m: 15,
-            r'\ball\s*day': lambda m: 480,
-        }
-
-    def enhance_task(self, task_data: Dict[str, Any], transcript: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    def __init__(self, lexicon: Optional[Lexicon] = None):
+        self.lexicon = lexicon or load_lexicon()
+        self.location_keywords = self.lexicon['location_keywords']
+        self.recurring_patterns = self.lexicon['recurring_patterns']
+
+        # Location and recurrence keywords match whole words; the duration
+        # and reminder triggers are stems ("min" in "minutes") and only gate
+        # the regexes, so they match inside words
+        self.matcher = self.lexicon.matcher('location_keywords', 'recurring_patterns')
+        self.trigger_matcher = KeywordMatcher(
+            [trigger for trigger, _, _ in DURATION_RULES] + ['remind'], whole_words=False
+        )
+
+    def scan(self, transcript: Union[str, TranscriptAnalysis]) -> EnhancementSignals:
+        """Find duration, location, recurrence and reminder hints in one pass"""
+        analysis = TranscriptAnalysis.of(transcript)
+        hits = analysis.keyword_hits(self.matcher)
+        triggers = analysis.keyword_hits(self.trigger_matcher)
+
+        location = next((name for keyword, name in self.location_keywords.items() if keyword in hits), None)
+        recurring = next(
+            (pattern for pattern, keywords in self.recurring_patterns.items() if any(keyword in hits for keyword in keywords)),
+            None
+        )
+
+        text = analysis.normalized
+        reminder = None
+        if 'remind' in triggers:
+            match = REMINDER_PATTERN.search(text)
+            if match:
+                count = match.group('count')
+                count = int(count) if count.isdigit() else REMINDER_COUNTS[count]
+                reminder = count * REMINDER_UNIT_MINUTES[match.group('unit')]
+                # The lead time in "remind me 30 minutes before" is not a duration
+                text = text[:match.start()] + text[match.end():]
+
+        duration = None
+        for trigger, pattern, extract in DURATION_RULES:
+            if trigger in triggers:
+                match = pattern.search(text)
+                if match:
+                    duration = extract(match)
+                    break
+
+        return EnhancementSignals(duration=duration, location=location, recurring=recurring, reminder_minutes=reminder)
+
+    def enhance_task(self, task_data: Dict[str, Any], transcript: Union[str, TranscriptAnalysis], context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Enhance task with smart defaults and inferences"""
+        signals = self.scan(transcript)
         
         # Smart duration extraction
-        if not task_data.get('estimated_duration'):
-            duration = self._extract_duration_from_transcript(transcript)
-            if duration:
-                task_data['estimated_duration'] = duration
+        if not task_data.get('estimated_duration') and signals.duration:
+            task_data['estimated_duration'] = signals.duration
 
-        # Smart reminder setting
+        # Smart reminder setting; an explicit "remind me ... before" wins
         if not task_data.get('reminder_minutes'):
-            reminder = self._suggest_reminder(task_data)
+            reminder = signals.reminder_minutes or self._suggest_reminder(task_data)
             if reminder:
                 task_data['reminder_minutes'] = reminder
 
         # Smart location inference
         if not task_data.get('location') and context:
-            location = self._infer_location(transcript, context)
+            location = self._infer_location(signals, context)
             if location:
                 task_data['location'] = location
 
         # Smart recurring pattern detection
-        if not task_data.get('recurring'):
-            recurring = self._detect_recurring_pattern(transcript)
-            if recurring:
-                task_data['recurring'] = recurring
+        if not task_data.get('recurring') and signals.recurring:
+            task_data['recurring'] = signals.recurring
 
         return task_data
 
-    def _extract_duration_from_transcript(self, transcript: str) -> Optional[int]:
-        """Extract duration from transcript using patterns"""
-        for pattern, extractor in self.duration_patterns.items():
-            match = re.search(pattern, transcript, re.IGNORECASE)
-            if match:
-                return extractor(match)
-        return None
-
     def _suggest_reminder(self, task_data: Dict[str, Any]) -> Optional[int]:
         """Suggest appropriate reminder timing"""
         priority = task_data.get('priority', 'medium')
@@ -436,44 +749,27 @@ class SmartTaskEnhancer:
             return None
             
         # Calculate days until due
-        try:
-            due_datetime = datetime.fromisoformat(due_date)
-            days_until = (due_datetime.date() - datetime.now().date()).days
-            
-            if priority == 'urgent':
-                return 60 if days_until > 0 else 15  # 1 hour or 15 min
-            elif priority == 'high':
-                return 240 if days_until > 1 else 60  # 4 hours or 1 hour
-            elif days_until > 7:
-                return 1440  # 1 day
-            elif days_until > 1:
-                return 240  # 4 hours
-            else:
-                return 60  # 1 hour
-        except:
+        parsed_date = parse_due_date(due_date) if isinstance(due_date, str) else None
+        if parsed_date is None:
             return None
-
-    def _infer_location(self, transcript: str, context: Dict[str, Any]) -> Optional[str]:
+        days_until = (parsed_date - datetime.now().date()).days
+        
+        if priority == 'urgent':
+            return 60 if days_until > 0 else 15  # 1 hour or 15 min
+        elif priority == 'high':
+            return 240 if days_until > 1 else 60  # 4 hours or 1 hour
+        elif days_until > 7:
+            return 1440  # 1 day
+        elif days_until > 1:
+            return 240  # 4 hours
+        else:
+            return 60  # 1 hour
+
+    def _infer_location(self, signals: EnhancementSignals, context: Dict[str, Any]) -> Optional[str]:
         """Infer location from transcript and context"""
-        transcript_lower = transcript.lower()
-        
         # Explicit location mentions
-        location_keywords = {
-            'office': 'Office',
-            'home': 'Home',
-            'gym': 'Gym',
-            'store': 'Store',
-            'bank': 'Bank',
-            'doctor': "Doctor's Office",
-            'restaurant': 'Restaurant',
-            'online': 'Online',
-            'zoom': 'Video Call',
-            'phone': 'Phone Call'
-        }
-        
-        for keyword, location in location_keywords.items():
-            if keyword in transcript_lower:
-                return location
+        if signals.location:
+            return signals.location
         
         # Context-based inference
         if context and context.get('page_context'):
@@ -486,21 +782,3 @@ class SmartTaskEnhancer:
                 return 'Development Work'
         
         return None
-
-    def _detect_recurring_pattern(self, transcript: str) -> Optional[str]:
-        """Detect recurring patterns in transcript"""
-        transcript_lower = transcript.lower()
-        
-        recurring_patterns = {
-            'daily': ['daily', 'every day', 'each day'],
-            'weekly': ['weekly', 'every week', 'each week'],
-            'monthly': ['monthly', 'every month', 'each month'],
-            'weekdays': ['weekdays', 'monday to friday', 'work days'],
-            'weekends': ['weekends', 'saturday and sunday']
-        }
-        
-        for pattern, keywords in recurring_patterns.items():
-            if any(keyword in transcript_lower for keyword in keywords):
-                return pattern
-        
-        return None
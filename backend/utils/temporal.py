@@ -0,0 +1,219 @@
+"""
+Natural-language date and time resolution
+"""
+
+from calendar import monthrange
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Any, List, NamedTuple, Optional
+import re
+
+# Strict HH:MM (24-hour), the format tasks store due times in
+TIME_PATTERN = re.compile(r'^([01]?[0-9]|2[0-3]):[0-5][0-9]$')
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+NUMBER_WORDS = {
+    'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
+}
+
+RELATIVE_DAYS = {
+    'yesterday': -1,
+    'today': 0,
+    'tonight': 0,
+    'tomorrow': 1,
+    'day after tomorrow': 2
+}
+
+# Every expression the resolver understands, as one alternation so a text is
+# scanned once; the named group that matched says how to resolve it
+EXPRESSION_PATTERN = re.compile(
+    r'\b(?:'
+    r'(?P<iso>\d{4}-\d{2}-\d{2}(?:[t ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:z|[+-]\d{2}:?\d{2})?)?)'
+    r'|(?P<relative_day>yesterday|today|tonight|(?:the\s+)?day\s+after\s+tomorrow|tomorrow)'
+    r'|end\s+of\s+(?:the\s+)?(?P<end_of>day|week|month|year)'
+    r'|(?P<modifier>this|next)\s+(?P<period>weekend|week|month|year)'
+    r'|(?:(?P<weekday_modifier>this|next|coming)\s+)?(?P<weekday>' + '|'.join(WEEKDAYS) + r')'
+    r'|in\s+(?P<count>\d+|' + '|'.join(NUMBER_WORDS) + r')\s+(?P<unit>day|week|month)s?'
+    r'|(?P<hour>1[0-2]|0?[1-9])(?::(?P<minute>[0-5]\d))?\s*(?P<meridiem>[ap])\.?m'
+    r'|(?P<clock_hour>[01]?\d|2[0-3]):(?P<clock_minute>[0-5]\d)'
+    r'|(?P<named_time>noon|midday|midnight)'
+    r')\b'
+)
+
+NAMED_TIMES = {'noon': time(12, 0), 'midday': time(12, 0), 'midnight': time(0, 0)}
+
+class TemporalResolution(NamedTuple):
+    """A resolved date, with a time of day when the expression gave one"""
+    date: date
+    time: Optional[time] = None
+
+    @property
+    def datetime(self) -> datetime:
+        return datetime.combine(self.date, self.time or time(0, 0))
+
+def resolve_temporal(expression: str, reference: Optional[date] = None) -> Optional[TemporalResolution]:
+    """Resolve a date/time expression like "next friday at 3pm" or "in 3 days"
+
+    The first date and the first time found are used; a time on its own
+    resolves to the reference day. Returns None if nothing was recognised.
+    Results are memoized per (expression, reference day).
+    """
+    if not expression:
+        return None
+    reference = reference or date.today()
+    return _resolve_cached(expression.strip().lower(), reference.toordinal())
+
+@lru_cache(maxsize=4096)
+def _resolve_cached(expression: str, reference_ordinal: int) -> Optional[TemporalResolution]:
+    return resolve_text(expression, date.fromordinal(reference_ordinal))
+
+def resolve_text(text: str, reference: date) -> Optional[TemporalResolution]:
+    """Resolve the first date and time mentioned anywhere in lowercased text
+
+    Uncached, for one-off inputs such as whole transcripts.
+    """
+    resolved_date = resolved_time = None
+
+    for match in EXPRESSION_PATTERN.finditer(text):
+        if resolved_time is None:
+            resolved_time = _match_time(match)
+        if resolved_date is None:
+            resolved_date = _match_date(match, reference)
+        if resolved_date is not None and resolved_time is not None:
+            break
+
+    if resolved_date is None and resolved_time is None:
+        return None
+    return TemporalResolution(resolved_date or reference, resolved_time)
+
+def find_temporal_expressions(text: str) -> List[str]:
+    """Date and time expressions in lowercased text, in the order they appear"""
+    return [match.group(0) for match in EXPRESSION_PATTERN.finditer(text)]
+
+@lru_cache(maxsize=4096)
+def parse_due_date(value: str) -> Optional[date]:
+    """Date of an ISO date or datetime string, None if it isn't one"""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+    except ValueError:
+        return None
+
+def to_naive(moment: datetime) -> datetime:
+    """Naive datetime; aware values are converted to UTC first"""
+    if moment.tzinfo is not None:
+        return moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+def parse_datetime(value: Any, default_time: time = time(0, 0)) -> Optional[datetime]:
+    """Naive datetime of an ISO date or datetime string, None if it isn't one
+
+    A bare date gets default_time; see to_naive for aware values.
+    """
+    if isinstance(value, datetime):
+        return to_naive(value)
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if len(value) <= 10:
+        parsed = datetime.combine(parsed.date(), default_time)
+    return to_naive(parsed)
+
+@lru_cache(maxsize=1024)
+def parse_due_time(value: str) -> Optional[time]:
+    """Time of an HH:MM (24-hour) string, None if it isn't one"""
+    if not TIME_PATTERN.match(value):
+        return None
+    hour, minute = value.split(':')
+    return time(int(hour), int(minute))
+
+def _match_date(match: re.Match, reference: date) -> Optional[date]:
+    try:
+        return _resolve_date(match, reference)
+    except (OverflowError, ValueError):
+        # "in 99999999 days" and the like land outside what a date can hold
+        return None
+
+def _resolve_date(match: re.Match, reference: date) -> Optional[date]:
+    groups = match.groupdict()
+
+    if groups['iso']:
+        return parse_due_date(groups['iso'].upper())
+
+    if groups['relative_day']:
+        phrase = re.sub(r'\s+', ' ', groups['relative_day']).replace('the ', '')
+        return reference + timedelta(days=RELATIVE_DAYS[phrase])
+
+    if groups['end_of']:
+        unit = groups['end_of']
+        if unit == 'day':
+            return reference
+        if unit == 'week':
+            return _upcoming_weekday(reference, 4)
+        if unit == 'month':
+            return reference.replace(day=monthrange(reference.year, reference.month)[1])
+        return reference.replace(month=12, day=31)
+
+    if groups['period']:
+        period, is_next = groups['period'], groups['modifier'] == 'next'
+        if period == 'week':
+            return reference + timedelta(weeks=1) if is_next else _upcoming_weekday(reference, 4)
+        if period == 'weekend':
+            return _upcoming_weekday(reference, 5) + timedelta(weeks=1 if is_next else 0)
+        if period == 'month':
+            if is_next:
+                return add_months(reference, 1)
+            return reference.replace(day=monthrange(reference.year, reference.month)[1])
+        return add_months(reference, 12) if is_next else reference.replace(month=12, day=31)
+
+    if groups['weekday']:
+        upcoming = _upcoming_weekday(reference, WEEKDAYS.index(groups['weekday']))
+        # "next friday" means the friday of next week when this week's is still ahead
+        if groups['weekday_modifier'] == 'next' and upcoming.isocalendar()[:2] == reference.isocalendar()[:2]:
+            return upcoming + timedelta(weeks=1)
+        return upcoming
+
+    if groups['unit']:
+        count = groups['count']
+        count = int(count) if count.isdigit() else NUMBER_WORDS[count]
+        if groups['unit'] == 'day':
+            return reference + timedelta(days=count)
+        if groups['unit'] == 'week':
+            return reference + timedelta(weeks=count)
+        return add_months(reference, count)
+
+    return None
+
+def _match_time(match: re.Match) -> Optional[time]:
+    groups = match.groupdict()
+
+    if groups['meridiem']:
+        hour = int(groups['hour']) % 12 + (12 if groups['meridiem'] == 'p' else 0)
+        return time(hour, int(groups['minute'] or 0))
+
+    if groups['clock_hour']:
+        return time(int(groups['clock_hour']), int(groups['clock_minute']))
+
+    if groups['named_time']:
+        return NAMED_TIMES[groups['named_time']]
+
+    if groups['iso'] and len(groups['iso']) > 10:
+        try:
+            return datetime.fromisoformat(groups['iso'].upper().replace('Z', '+00:00')).time()
+        except ValueError:
+            return None
+
+    return None
+
+def _upcoming_weekday(reference: date, weekday: int) -> date:
+    return reference + timedelta(days=(weekday - reference.weekday()) % 7)
+
+def add_months(reference: date, months: int) -> date:
+    """Same day of the month, months later; clamped to the last day of shorter months"""
+    month_index = reference.month - 1 + months
+    year, month = reference.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(reference.day, monthrange(year, month)[1]))
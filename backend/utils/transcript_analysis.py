@@ -0,0 +1,79 @@
+"""
+Shared, lazily evaluated analysis of a transcript or chat message
+"""
+
+from datetime import date
+from typing import Dict, List, Optional, Set, Union
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.temporal import TemporalResolution, find_temporal_expressions, resolve_text
+
+class lazy_property:
+    """Compute an attribute on first access and store it on the instance
+
+    Like functools.cached_property, minus its per-access lock, which costs
+    more than the values cached here when analysing large batches.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.func(instance)
+        instance.__dict__[self.name] = value
+        return value
+
+class TranscriptAnalysis:
+    """Normalized text, tokens and pattern matches for one piece of text
+
+    Every property is computed on first access and cached, so validation,
+    enhancement and chat handling can share one instance per request instead
+    of each lowercasing, splitting and scanning the text again.
+    """
+
+    def __init__(self, text: str):
+        self.text = text or ""
+        self._keyword_hits: Dict[KeywordMatcher, Set[str]] = {}
+
+    @classmethod
+    def of(cls, text: Union[str, "TranscriptAnalysis"]) -> "TranscriptAnalysis":
+        """Return ``text`` if it is already analysed, otherwise analyse it"""
+        if isinstance(text, TranscriptAnalysis):
+            return text
+        return cls(text)
+
+    @lazy_property
+    def normalized(self) -> str:
+        return self.text.lower()
+
+    @lazy_property
+    def tokens(self) -> List[str]:
+        return self.text.split()
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    def keyword_hits(self, matcher: KeywordMatcher) -> Set[str]:
+        """Keywords of ``matcher`` that occur in the normalized text"""
+        hits = self._keyword_hits.get(matcher)
+        if hits is None:
+            hits = matcher.find(self.normalized)
+            self._keyword_hits[matcher] = hits
+        return hits
+
+    @lazy_property
+    def temporal_references(self) -> List[str]:
+        """Date and time expressions in the order they appear"""
+        return find_temporal_expressions(self.normalized)
+
+    @lazy_property
+    def temporal(self) -> Optional[TemporalResolution]:
+        """First date and time the text mentions, resolved against today"""
+        return resolve_text(self.normalized, date.today())
@@ -0,0 +1,134 @@
+"""
+Long-lived Whisper transcription service with a content-addressed transcript cache
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional
+import asyncio
+import hashlib
+import logging
+import threading
+
+from utils.audio_preprocessing import audio_filename, preprocess_audio
+
+class TranscriptCache:
+    """LRU cache of transcripts keyed by a hash of the audio bytes
+
+    Bounded both by entry count and by the total size of cached transcripts;
+    the least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 4 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            transcript = self._entries.get(key)
+            if transcript is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return transcript
+
+    def put(self, key: str, transcript: str):
+        size = len(transcript.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.encode("utf-8"))
+
+            self._entries[key] = transcript
+            self._size += size
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.encode("utf-8"))
+
+class TranscriptionService:
+    """Whisper transcription over one reused client
+
+    The OpenAI client (and with it the HTTP connection pool and TLS sessions)
+    is created once on first use. Identical audio is transcribed at most once:
+    repeats are answered from the cache and concurrent duplicates share the
+    in-flight request.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "whisper-1",
+        language: str = "en",
+        prompt: str = "This is a task or reminder request. Please transcribe accurately.",
+        cache: Optional[TranscriptCache] = None
+    ):
+        self.api_key = api_key
+        self.model = model
+        self.language = language
+        self.prompt = prompt
+        self.cache = cache if cache is not None else TranscriptCache()
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def audio_key(audio_bytes: bytes) -> str:
+        return hashlib.sha256(audio_bytes).hexdigest()
+
+    async def transcribe(self, audio_bytes: bytes) -> str:
+        """Transcribe audio, reusing cached or in-flight results for identical bytes"""
+        key = self.audio_key(audio_bytes)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(self._transcribe_sync, audio_bytes))
+            task.add_done_callback(lambda t: self._on_transcribed(key, t))
+            self._inflight[key] = task
+
+        # Shield so a cancelled caller doesn't abort a request others are awaiting
+        return await asyncio.shield(task)
+
+    def _on_transcribed(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self.cache.put(key, task.result())
+
+    def _get_client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    self._client = OpenAI(api_key=self.api_key)
+                    logging.info("Initialized Whisper transcription client")
+        return self._client
+
+    def _transcribe_sync(self, audio_bytes: bytes) -> str:
+        # Downmix, resample and trim silence before uploading; silent clips
+        # raise NoSpeechError here and never reach Whisper
+        audio_bytes = preprocess_audio(audio_bytes)
+
+        transcript_response = self._get_client().audio.transcriptions.create(
+            model=self.model,
+            # Input that was not PCM WAV is passed through; name it for what it is
+            file=(audio_filename(audio_bytes), audio_bytes),
+            language=self.language,
+            prompt=self.prompt,
+            temperature=0.0
+        )
+        return transcript_response.text.strip()
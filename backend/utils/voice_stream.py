@@ -0,0 +1,153 @@
+"""
+Streaming voice-to-task session that overlaps transcription and extraction
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+
+TranscribeFn = Callable[[bytes], Awaitable[str]]
+ExtractFn = Callable[[str], Awaitable[Dict[str, Any]]]
+SendFn = Callable[[Dict[str, Any]], Awaitable[None]]
+
+class VoiceStreamSession:
+    """Transcribe audio segments as they arrive and extract tasks speculatively
+
+    Segments are transcribed concurrently but merged into the transcript in
+    arrival order. Every time the transcript grows, extraction is restarted on
+    the partial transcript, so once speech ends the final task is usually
+    either ready or one extraction away.
+    """
+
+    def __init__(self, transcribe: TranscribeFn, extract: ExtractFn, send: SendFn):
+        self._transcribe = transcribe
+        self._extract = extract
+        self._send = send
+        self._send_lock = asyncio.Lock()
+
+        self._segment_tasks: List[asyncio.Task] = []
+        self._transcribed: Dict[int, str] = {}
+        self._next_index = 0
+        self._merged = 0
+        self._transcript_parts: List[str] = []
+
+        # (transcript the extraction started from, running extraction)
+        self._speculation: Optional[Tuple[str, asyncio.Task]] = None
+        # Held so pending partial reports are not garbage collected mid-send
+        self._report_tasks: Set[asyncio.Task] = set()
+        self._finishing = False
+
+    @property
+    def transcript(self) -> str:
+        return " ".join(self._transcript_parts)
+
+    def add_segment(self, audio_bytes: bytes):
+        """Queue an audio segment for transcription"""
+        index = self._next_index
+        self._next_index += 1
+        self._segment_tasks.append(asyncio.create_task(self._transcribe_segment(index, audio_bytes)))
+
+    async def finish(self) -> Tuple[str, Dict[str, Any]]:
+        """Wait for outstanding segments and return the final transcript and task"""
+        if self._segment_tasks:
+            await asyncio.gather(*self._segment_tasks)
+        self._finishing = True
+
+        transcript = self.transcript
+        if len(transcript.strip()) < 3:
+            self.cancel()
+            raise ValueError("Audio transcription failed or too short")
+
+        # Reuse the speculative extraction if it ran on the final transcript,
+        # unless it failed or was cancelled; then extract again below
+        if self._speculation and self._speculation[0] == transcript:
+            speculation = self._speculation[1]
+            await asyncio.wait({speculation})
+            if not speculation.cancelled() and speculation.exception() is None:
+                return transcript, speculation.result()
+
+        self.cancel()
+        return transcript, await self._extract(transcript)
+
+    def cancel(self):
+        """Cancel any in-flight transcription or extraction"""
+        for task in self._segment_tasks:
+            task.cancel()
+        for task in self._report_tasks:
+            task.cancel()
+        if self._speculation:
+            self._speculation[1].cancel()
+            self._speculation = None
+
+    async def _emit(self, message: Dict[str, Any]):
+        async with self._send_lock:
+            try:
+                await self._send(message)
+            except Exception as e:
+                logging.warning(f"Voice stream send failed: {e}")
+
+    async def _transcribe_segment(self, index: int, audio_bytes: bytes):
+        try:
+            text = await self._transcribe(audio_bytes)
+        except ValueError as e:
+            logging.warning(f"Skipping audio segment {index}: {e}")
+            text = ""
+
+        self._transcribed[index] = text.strip()
+        await self._merge_segments()
+
+    async def _merge_segments(self):
+        """Append contiguous transcribed segments to the transcript in order"""
+        grew = False
+        while self._merged in self._transcribed:
+            text = self._transcribed.pop(self._merged)
+            self._merged += 1
+            if text:
+                self._transcript_parts.append(text)
+                grew = True
+
+        if not grew:
+            return
+
+        transcript = self.transcript
+        await self._emit({
+            "type": "transcript",
+            "transcript": transcript,
+            "segments_transcribed": self._merged
+        })
+        self._speculate(transcript)
+
+    def _speculate(self, transcript: str):
+        """Restart extraction on the latest partial transcript"""
+        if len(transcript.strip()) < 3:
+            return
+
+        if self._speculation:
+            if self._speculation[0] == transcript:
+                return
+            self._speculation[1].cancel()
+
+        task = asyncio.create_task(self._extract(transcript))
+        task.add_done_callback(lambda t: self._on_speculation_done(transcript, t))
+        self._speculation = (transcript, task)
+
+    def _on_speculation_done(self, transcript: str, task: asyncio.Task):
+        if task.cancelled():
+            return
+        if task.exception():
+            logging.warning(f"Speculative task extraction failed: {task.exception()}")
+            return
+        report = asyncio.create_task(self._report_partial(transcript, task.result()))
+        self._report_tasks.add(report)
+        report.add_done_callback(self._report_tasks.discard)
+
+    async def _report_partial(self, transcript: str, extracted_task: Dict[str, Any]):
+        # Only report results that still match the current transcript; once
+        # finishing, the result is delivered as the final message instead
+        if transcript != self.transcript or self._finishing:
+            return
+        await self._emit({
+            "type": "partial_task",
+            "transcript": transcript,
+            "extracted_task": extracted_task
+        })